@@ -0,0 +1,144 @@
+"""Latency benchmark for the audio backends in src/core/audio_backends.py.
+
+Runs each backend headlessly on the same file and reports:
+- load-to-first-sample: from ``load`` to the first position report above zero;
+- seek latency: from ``seek`` until audio from the target is actually being
+  produced (pygame's ``get_pos`` advancing again, the sink writing its first
+  block read after the seek, Qt's position moving past the target it reports
+  right after ``setPosition``) with the reported position within
+  --tolerance-ms of the target;
+- position accuracy: the reported position against the wall clock while
+  playing (mean absolute error and drift).
+
+Backends that cannot start here, such as Qt without a multimedia plugin,
+are reported as unavailable. With --seek-table an MP3 is scanned first and
+its frame table handed to the backend, so the pygame backend's frame seeks
+can be compared against plain ``set_pos``.
+
+    SDL_AUDIODRIVER=dummy python benchmarks/audio_backends.py track.mp3 --backends pygame sink
+"""
+import sys
+import time
+import argparse
+import statistics
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from PyQt6.QtCore import QCoreApplication  # noqa: E402
+
+from src.core.audio_backends import BACKENDS, create_backend  # noqa: E402
+from src.core.mp3_seek import SeekTable  # noqa: E402
+
+
+def wait_for(app, condition, timeout: float) -> float:
+    """Seconds until ``condition()`` holds (pumping Qt events), or None on timeout."""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        app.processEvents()
+        if condition():
+            return time.perf_counter() - started
+        time.sleep(0.0005)
+    return None
+
+
+def file_duration(path: str) -> float:
+    import soundfile as sf
+
+    return sf.info(path).duration
+
+
+def output_resumed(backend):
+    """A condition that holds once output has resumed after the latest seek.
+
+    Every backend's clock jumps to the target as soon as ``seek`` returns
+    (Qt's ``position()`` reports it right after ``setPosition``), so the
+    reported position alone says nothing about when audio from there is
+    heard.
+    """
+    if backend.name == "pygame":
+        played = backend.music.get_pos()
+        return lambda: backend.music.get_pos() > played
+    if backend.name == "sink":
+        return lambda: backend.output_seek_count == backend.seek_count
+    reported = backend.player.position()
+    return lambda: backend.player.position() > reported
+
+
+def bench(app, backend, path, duration, seconds, tolerance, timeout, seek_table=None):
+    results = {}
+    backend.set_volume(1.0)  # Opens the output device, which is not part of load latency
+    started = time.perf_counter()
+    backend.load(path)
+    backend.play()
+    backend.set_seek_table(seek_table)
+    waited = wait_for(app, lambda: backend.position() > 0, timeout)
+    if waited is None:
+        raise RuntimeError("no position reported before timeout")
+    results["first_sample_ms"] = (time.perf_counter() - started) * 1000
+
+    # Position against the wall clock
+    origin_wall, origin_pos = time.perf_counter(), backend.position()
+    errors = []
+    while time.perf_counter() - origin_wall < seconds:
+        wait_for(app, lambda: False, 0.05)
+        errors.append((backend.position() - origin_pos) - (time.perf_counter() - origin_wall))
+    results["position_error_ms"] = statistics.mean(abs(e) for e in errors) * 1000
+    results["drift_ms_per_s"] = (errors[-1] - errors[0]) / seconds * 1000
+
+    # Seeks across the file, forwards and backwards
+    latencies = []
+    for fraction in (0.6, 0.2, 0.8, 0.4):
+        target = duration * fraction
+        before = time.perf_counter()
+        backend.seek(target)
+        resumed = output_resumed(backend)
+        landed = wait_for(app, lambda: resumed() and abs(backend.position() - target) * 1000 <= tolerance,
+                          timeout)
+        if landed is None:
+            latencies.append(float("inf"))
+            continue
+        latencies.append((time.perf_counter() - before) * 1000)
+        wait_for(app, lambda: backend.position() > target, timeout)  # Still playing after the seek
+    results["seek_ms"] = statistics.median(latencies)
+    results["seek_max_ms"] = max(latencies)
+    backend.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file", help="audio file to play (a few minutes long works best)")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument("--seconds", type=float, default=2.0, help="playback sampled for position accuracy")
+    parser.add_argument("--tolerance-ms", type=float, default=100.0)
+    parser.add_argument("--timeout", type=float, default=5.0)
+    parser.add_argument("--seek-table", action="store_true", help="seek an MP3 through its frame table")
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv[:1])
+    duration = file_duration(args.file)
+    seek_table = None
+    if args.seek_table:
+        started = time.perf_counter()
+        seek_table = SeekTable.build(args.file)
+        if seek_table is None:
+            parser.error(f"no MPEG audio frames found in {args.file}")
+        print(f"seek table: {len(seek_table)} entries ({seek_table.source}) "
+              f"in {(time.perf_counter() - started) * 1000:.1f} ms")
+    for name in args.backends:
+        try:
+            backend = create_backend(name)
+            r = bench(app, backend, args.file, duration, args.seconds, args.tolerance_ms, args.timeout,
+                      seek_table)
+        except Exception as e:
+            print(f"{name:<8} unavailable: {e}")
+            continue
+        print(f"{name:<8} first sample {r['first_sample_ms']:7.1f} ms   "
+              f"seek median {r['seek_ms']:7.1f} ms (max {r['seek_max_ms']:.1f})   "
+              f"position error {r['position_error_ms']:5.1f} ms, drift {r['drift_ms_per_s']:+.1f} ms/s")
+
+
+if __name__ == "__main__":
+    main()
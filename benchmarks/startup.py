@@ -0,0 +1,63 @@
+"""Cold-start benchmark for the desktop app.
+
+Launches ``main.py`` in fresh interpreters with AHOY_STARTUP_BENCHMARK=1,
+so the window quits right after its first paint and prints its per-phase
+timings (imports, services, data load, UI build, first paint). Reports the
+median of each phase and fails if the median total exceeds --max-ms.
+
+    python benchmarks/startup.py --runs 5 --max-ms 1500
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def run_once(timeout: float) -> dict:
+    env = dict(os.environ, AHOY_STARTUP_BENCHMARK="1")
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "main.py"], cwd=ROOT, env=env,
+                            capture_output=True, text=True, timeout=timeout)
+    wall_ms = (time.perf_counter() - started) * 1000
+    for line in reversed(result.stdout.splitlines()):
+        if line.startswith("{"):
+            timings = json.loads(line)
+            timings["process_ms"] = wall_ms
+            return timings
+    raise RuntimeError(f"main.py exited without reporting timings:\n{result.stderr[-2000:]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=None,
+                        help="fail if the median time to first paint exceeds this")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    runs = [run_once(args.timeout) for _ in range(args.runs)]
+    phases = list(runs[0]["phases"])
+    width = max(len(phase) for phase in phases + ["first paint total", "process"])
+    for phase in phases:
+        values = [run["phases"][phase] for run in runs]
+        print(f"{phase:<{width}}  median {statistics.median(values):8.1f} ms  max {max(values):8.1f} ms")
+    totals = [run["total_ms"] for run in runs]
+    median_total = statistics.median(totals)
+    print(f"{'first paint total':<{width}}  median {median_total:8.1f} ms  max {max(totals):8.1f} ms")
+    process = [run["process_ms"] for run in runs]
+    print(f"{'process':<{width}}  median {statistics.median(process):8.1f} ms  max {max(process):8.1f} ms")
+
+    if args.max_ms is not None and median_total > args.max_ms:
+        print(f"FAIL: median time to first paint {median_total:.0f} ms > {args.max_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
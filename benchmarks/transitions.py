@@ -0,0 +1,129 @@
+"""Track transition benchmark for the pygame playback paths.
+
+Plays the given files back to back twice. The first pass uses the reload
+path: wait for ``pygame.mixer.music`` to go idle, then ``load`` and ``play``
+the next file. The second uses ``GaplessPlayer`` (pre-decoded, queued at
+the sample boundary, or crossfaded with --crossfade-ms). The mixer is
+sampled every millisecond, and each transition reports the silence
+observed between tracks and the work done on the GUI thread at the switch.
+Short files keep it quick:
+
+    SDL_AUDIODRIVER=dummy python benchmarks/transitions.py a.mp3 b.mp3 c.mp3
+"""
+import sys
+import time
+import argparse
+import statistics
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from PyQt6.QtCore import QCoreApplication, QTimer, Qt  # noqa: E402
+
+from src.core.gapless import GaplessPlayer  # noqa: E402
+from src.core.mixer import get_mixer  # noqa: E402
+
+
+class Sampler:
+    """Calls ``busy`` every millisecond and records idle stretches between tracks."""
+
+    def __init__(self, busy, on_idle=None):
+        self.busy = busy
+        self.on_idle = on_idle
+        self.idle_since = None
+        self.gaps = []
+        self.timer = QTimer()
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.setInterval(1)
+        self.timer.timeout.connect(self.sample)
+
+    def sample(self):
+        now = time.perf_counter()
+        if self.busy():
+            if self.idle_since is not None:
+                self.gaps.append((now - self.idle_since) * 1000)
+                self.idle_since = None
+        elif self.idle_since is None:
+            self.idle_since = now
+            if self.on_idle:
+                self.on_idle()
+
+
+def run_reload(app, files):
+    music = get_mixer().music
+    queue = list(files[1:])
+    switch_ms = []
+
+    def next_file():
+        if not queue:
+            app.quit()
+            return
+        started = time.perf_counter()
+        music.load(queue.pop(0))
+        music.play()
+        switch_ms.append((time.perf_counter() - started) * 1000)
+
+    sampler = Sampler(music.get_busy, next_file)
+    music.load(files[0])
+    music.play()
+    sampler.timer.start()
+    app.exec()
+    sampler.timer.stop()
+    return sampler.gaps, switch_ms
+
+
+def run_gapless(app, files, crossfade_ms):
+    player = GaplessPlayer(crossfade_ms=crossfade_ms, poll_ms=5)
+    queue = list(files[1:])
+    channels = []
+    sampler = Sampler(lambda: any(channel.get_busy() for channel in channels))
+    player.needs_next.connect(lambda path: queue and player.preload(queue.pop(0)))
+    player.finished.connect(app.quit)
+    # Decode the first file up front so it starts on a channel rather than on mixer.music
+    player.preload(files[0])
+    while player.next and player.next["sound"] is None:
+        app.processEvents()
+        time.sleep(0.001)
+    player.play(files[0])
+    channels.extend(player._mixer_channels())
+    sampler.timer.start()
+    app.exec()
+    sampler.timer.stop()
+    player.shutdown()
+    return sampler.gaps, player.transitions
+
+
+def report(label, gaps, transitions, switch_ms=None):
+    print(f"{label}: {transitions} transition(s)")
+    # Transitions where the mixer never went idle count as zero silence
+    silent = gaps + [0.0] * (transitions - len(gaps))
+    print(f"  silence between tracks  median {statistics.median(silent):7.2f} ms  max {max(silent):7.2f} ms")
+    if switch_ms:
+        print(f"  load + play at switch   median {statistics.median(switch_ms):7.2f} ms  max {max(switch_ms):7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="+", help="two or more audio files, played in order")
+    parser.add_argument("--crossfade-ms", type=int, default=0)
+    args = parser.parse_args()
+    if len(args.files) < 2:
+        parser.error("need at least two files")
+
+    app = QCoreApplication(sys.argv[:1])
+    transitions = len(args.files) - 1
+
+    gaps, switch_ms = run_reload(app, args.files)
+    report("reload (load + play on end)", gaps, transitions, switch_ms)
+
+    gaps, records = run_gapless(app, args.files, args.crossfade_ms)
+    mode = f"crossfade {args.crossfade_ms} ms" if args.crossfade_ms else "gapless"
+    report(f"{mode} (pre-decoded)", gaps, transitions)
+    for record in records:
+        print(f"  {Path(record['to']).name}: decoded in {record['decode_ms']:.1f} ms, "
+              f"ready {record['ready_ahead_ms']:.0f} ms before the boundary")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 import sys
 import os
 import json
-import tempfile
+import time
+IMPORT_STARTED = time.perf_counter()
 import numpy as np
 import subprocess
 import uuid
@@ -12,18 +13,37 @@ from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                             QProgressBar, QMessageBox, QStackedWidget, QFrame,
                             QScrollArea, QSizePolicy, QSlider, QLineEdit,
                             QFileDialog, QListWidgetItem)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSize, QTimer, QUrl, QPoint, QPointF, QRectF
+from PyQt6.QtCore import Qt, QTimer, QUrl, QPoint, QPointF, QRectF
 from PyQt6.QtGui import QPixmap, QIcon, QPainter, QColor, QLinearGradient, QPalette, QPen, QDesktopServices, QMouseEvent, QKeyEvent
-import pygame
-from google.cloud import storage
 from dotenv import load_dotenv
-import requests
 import threading
-import librosa
-import soundfile as sf
-
-# Initialize pygame mixer
-pygame.mixer.init()
+from src.core.image_loader import ImageLoader, placeholder_pixmap
+from src.core.media_cache import MediaCache
+from src.core.streaming import StreamingPlayback
+from src.core.prefetch import Prefetcher
+from src.core.spectrum import SpectrumAnalyzer
+from src.core.track_index import TrackIndex, MetadataWorker
+from src.core.downloads import DownloadManager
+from src.core.catalog import Catalog
+from src.core.mixer import get_mixer, mixer_initialized
+from src.core.startup_profile import StartupProfile
+from src.core.search_index import SearchIndex
+from src.core.facets import FacetIndex
+from src.core.broadcast import BroadcastEngine
+from src.core.gapless import GaplessPlayer
+from src.core.audio_backends import create_backend
+from src.core.loudness import LoudnessAnalyzer, playback_gain
+from src.ui.particle_engine import ParticleEngine
+from src.ui.particle_renderer import ParticleRenderer
+from src.ui.frame_stats import FrameStats
+from src.ui.frame_scheduler import FrameScheduler
+from src.ui.library_model import TrackListModel, TrackListView
+from src.ui.facet_bar import FacetBar
+from src.ui.lazy_page import LazyPage
+
+# pygame, google.cloud.storage and requests are imported on first use
+startup_profile = StartupProfile(IMPORT_STARTED)
+startup_profile.mark("imports")
 
 class Surfer:
     def __init__(self, x, y):
@@ -72,16 +92,9 @@ class Surfer:
         if 'A' not in self.keys_pressed and 'D' not in self.keys_pressed:
             self.rotation = 0
 
-    def draw(self, painter):
-        # Draw trail
-        for i, pos in enumerate(self.trail):
-            alpha = int(255 * (i / len(self.trail)))
-            trail_color = QColor(self.color)
-            trail_color.setAlpha(alpha)
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.setBrush(trail_color)
-            size = self.size * (i / len(self.trail))
-            painter.drawEllipse(pos, size, size)
+    def draw(self, painter, renderer):
+        # Draw trail as one batch of fading sprites
+        renderer.draw_trail(painter, self.trail, self.size)
 
         # Draw surfer
         painter.save()
@@ -99,41 +112,6 @@ class Surfer:
         
         painter.restore()
 
-class Particle:
-    def __init__(self, x, y):
-        self.pos = QPointF(x, y)
-        self.vel = QPointF(0, 0)
-        self.acc = QPointF(0, 0)
-        self.size = np.random.uniform(2, 5)
-        self.color = QColor("#e94560")
-        self.color.setAlpha(150)
-        self.max_speed = 5
-        self.audio_force = 0
-
-    def apply_force(self, force):
-        self.acc += force
-
-    def update(self):
-        self.vel += self.acc
-        self.vel = self.vel * 0.95  # Damping
-        self.pos += self.vel
-        self.acc *= 0
-        self.audio_force *= 0.95  # Decay audio force
-
-    def edges(self, width, height):
-        if self.pos.x() < 0:
-            self.pos.setX(0)
-            self.vel.setX(-self.vel.x() * 0.8)
-        elif self.pos.x() > width:
-            self.pos.setX(width)
-            self.vel.setX(-self.vel.x() * 0.8)
-        if self.pos.y() < 0:
-            self.pos.setY(0)
-            self.vel.setY(-self.vel.y() * 0.8)
-        elif self.pos.y() > height:
-            self.pos.setY(height)
-            self.vel.setY(-self.vel.y() * 0.8)
-
 class GlassFrame(QFrame):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -164,48 +142,28 @@ class GlassButton(QPushButton):
             }
         """)
 
-class MusicDownloader(QThread):
-    progress = pyqtSignal(int)
-    finished = pyqtSignal(str)
-    error = pyqtSignal(str)
-
-    def __init__(self, url, local_path):
-        super().__init__()
-        self.url = url
-        self.local_path = local_path
-
-    def run(self):
-        try:
-            response = requests.get(self.url, stream=True)
-            total_size = int(response.headers.get('content-length', 0))
-            block_size = 1024
-            downloaded = 0
-
-            os.makedirs(os.path.dirname(self.local_path), exist_ok=True)
-            
-            with open(self.local_path, 'wb') as f:
-                for data in response.iter_content(block_size):
-                    downloaded += len(data)
-                    f.write(data)
-                    if total_size:
-                        progress = int((downloaded / total_size) * 100)
-                        self.progress.emit(progress)
-            
-            self.finished.emit(self.local_path)
-        except Exception as e:
-            self.error.emit(str(e))
-
 class VisualizationWidget(QWidget):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, particle_count=100):
         super().__init__(parent)
         self.setMinimumHeight(200)
-        self.particles = []
+        self.particle_count = particle_count
+        self.particles = ParticleEngine(0)
+        self.particle_color = QColor("#e94560")
+        self.particle_color.setAlpha(150)
+        self.renderer = ParticleRenderer(self.particle_color, QColor("#FFD700"))
+        # Frame timings; the overlay is toggled with F or enabled by AHOY_FRAME_STATS=1
+        self.frame_stats = FrameStats()
+        self.show_frame_stats = os.getenv("AHOY_FRAME_STATS") == "1"
         self.mouse_pos = QPointF(0, 0)
         self.mouse_pressed = False
         self.spectrum = np.zeros(50)
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_visualization)
-        self.timer.start(16)  # ~60 FPS for smooth animation
+        self.spectrum_frames = None  # SpectrumFrames for the playing track
+        self.position_source = lambda: get_mixer().music.get_pos() / 1000
+        self.playing_source = lambda: mixer_initialized() and get_mixer().music.get_busy()
+        # ~60 FPS while playing, a low idle rate when silent, stopped while hidden
+        self.scheduler = FrameScheduler(
+            self.update_visualization, active_interval_ms=16,
+            idle_interval_ms=int(os.getenv("AHOY_VISUALIZER_IDLE_MS", "100")), parent=self)
         
         # Initialize particles and surfer
         self.init_particles()
@@ -215,16 +173,16 @@ class VisualizationWidget(QWidget):
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
 
     def init_particles(self):
-        self.particles = []
-        for _ in range(100):
-            x = np.random.uniform(0, self.width())
-            y = np.random.uniform(0, self.height())
-            self.particles.append(Particle(x, y))
+        self.particles.reset(self.particle_count, self.width(), self.height())
 
     def keyPressEvent(self, event: QKeyEvent):
         key = event.text().upper()
-        if key in ['W', 'A', 'S', 'D']:
+        if key == 'F':
+            self.show_frame_stats = not self.show_frame_stats
+            self.update()
+        elif key in ['W', 'A', 'S', 'D']:
             self.surfer.keys_pressed.add(key)
+            self.scheduler.set_idle(False)
             self.update()
 
     def keyReleaseEvent(self, event: QKeyEvent):
@@ -236,6 +194,7 @@ class VisualizationWidget(QWidget):
     def mousePressEvent(self, event: QMouseEvent):
         self.mouse_pressed = True
         self.mouse_pos = QPointF(event.position())
+        self.scheduler.set_idle(False)
 
     def mouseReleaseEvent(self, event: QMouseEvent):
         self.mouse_pressed = False
@@ -243,61 +202,53 @@ class VisualizationWidget(QWidget):
     def mouseMoveEvent(self, event: QMouseEvent):
         self.mouse_pos = QPointF(event.position())
 
+    def set_spectrum_frames(self, frames):
+        """Use precomputed band energies for the playing track (None clears)"""
+        self.spectrum_frames = frames
+        if frames is None:
+            self.spectrum = np.zeros(50)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.frame_stats.reset_clock()
+        self.scheduler.start()
+
+    def hideEvent(self, event):
+        # Also delivered when the window is minimized
+        super().hideEvent(event)
+        self.scheduler.pause()
+
     def update_visualization(self):
-        if pygame.mixer.music.get_busy():
-            try:
-                array = pygame.mixer.Sound.get_raw()
-                if array:
-                    spectrum = np.abs(np.fft.rfft(array))
-                    spectrum = spectrum / np.max(spectrum)
-                    self.spectrum = np.interp(np.linspace(0, len(spectrum), 50),
-                                            np.arange(len(spectrum)), spectrum)
-            except:
-                pass
+        started = time.perf_counter()
+        if self.window().isMinimized():
+            self.scheduler.pause()
+            return
+        playing = self.playing_source()
+        # Stay at full rate while the user is steering the surfer or dragging particles
+        interacting = self.mouse_pressed or bool(self.surfer.keys_pressed)
+        self.scheduler.set_idle(not playing and not interacting)
+        self.frame_stats.budget_ms = self.scheduler.interval_ms
+
+        if self.spectrum_frames is not None and playing:
+            self.spectrum = self.spectrum_frames.frame_at(self.position_source())
 
         # Update surfer
         self.surfer.update(self.width(), self.height())
 
-        # Update particles
-        for particle in self.particles:
-            # Apply audio force
-            if pygame.mixer.music.get_busy():
-                idx = int((particle.pos.x() / self.width()) * len(self.spectrum))
-                idx = min(max(idx, 0), len(self.spectrum) - 1)
-                force = self.spectrum[idx] * 0.5
-                particle.audio_force = force
-                particle.apply_force(QPointF(0, -force * 2))  # Push up with audio
-
-            # Apply mouse force
-            if self.mouse_pressed:
-                mouse_force = QPointF(self.mouse_pos - particle.pos)
-                distance = mouse_force.manhattanLength()
-                if distance < 100:
-                    strength = (1 - distance/100) * 0.5
-                    mouse_force = mouse_force * strength
-                    particle.apply_force(mouse_force)
-
-            # Apply surfing effect
-            wave_force = QPointF(
-                np.sin(particle.pos.y() * 0.02 + self.timer.interval() * 0.001) * 0.1,
-                np.cos(particle.pos.x() * 0.02 + self.timer.interval() * 0.001) * 0.1
-            )
-            particle.apply_force(wave_force)
-
-            # Apply surfer force to nearby particles
-            surfer_force = QPointF(self.surfer.pos - particle.pos)
-            distance = surfer_force.manhattanLength()
-            if distance < 50:
-                strength = (1 - distance/50) * 0.3
-                surfer_force = surfer_force * strength
-                particle.apply_force(surfer_force)
-
-            particle.update()
-            particle.edges(self.width(), self.height())
+        # Update all particles in one batched step
+        self.particles.step(
+            self.width(), self.height(),
+            spectrum=self.spectrum if playing else None,  # Push up with audio
+            mouse=(self.mouse_pos.x(), self.mouse_pos.y()) if self.mouse_pressed else None,
+            surfer=(self.surfer.pos.x(), self.surfer.pos.y()),
+            phase=self.scheduler.active_interval_ms * 0.001,  # Surfing wave effect
+        )
 
+        self.frame_stats.record_update((time.perf_counter() - started) * 1000)
         self.update()
 
     def paintEvent(self, event):
+        started = time.perf_counter()
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
@@ -307,25 +258,23 @@ class VisualizationWidget(QWidget):
         gradient.setColorAt(1, QColor(22, 33, 62, 100))
         painter.fillRect(self.rect(), gradient)
 
-        # Draw particles
-        for particle in self.particles:
-            # Draw glow
-            glow_color = QColor(particle.color)
-            glow_color.setAlpha(50)
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.setBrush(glow_color)
-            painter.drawEllipse(particle.pos, particle.size * 2, particle.size * 2)
-
-            # Draw particle
-            painter.setBrush(particle.color)
-            painter.drawEllipse(particle.pos, particle.size, particle.size)
+        # Draw particles as pre-rendered glow sprites in a single call
+        self.renderer.draw_particles(painter, self.particles.pos, self.particles.size)
 
         # Draw surfer
-        self.surfer.draw(painter)
+        self.surfer.draw(painter, self.renderer)
+
+        if self.show_frame_stats:
+            painter.setPen(QColor("#ffffff"))
+            painter.drawText(8, 16, self.frame_stats.overlay_text())
+        painter.end()
+
+        self.frame_stats.record_paint(started, (time.perf_counter() - started) * 1000)
+        self.frame_stats.maybe_log()
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        if not self.particles:  # Only initialize if particles don't exist
+        if not self.particles.count:  # Only initialize if particles don't exist
             self.init_particles()
             self.surfer = Surfer(self.width()/2, self.height()/2)
 
@@ -436,7 +385,7 @@ class DownloadsPage(QWidget):
             QMessageBox.warning(self, "Warning", "Downloads folder not found!")
 
 class PodcastCard(GlassFrame):
-    def __init__(self, podcast, parent=None):
+    def __init__(self, podcast, image_loader, parent=None):
         super().__init__(parent)
         self.podcast = podcast
         layout = QHBoxLayout(self)
@@ -445,14 +394,8 @@ class PodcastCard(GlassFrame):
 
         # Cover Art (now clickable)
         cover_label = QLabel()
-        pixmap = QPixmap()
-        try:
-            img_data = requests.get(podcast['cover_art']).content
-            pixmap.loadFromData(img_data)
-        except:
-            pixmap = QPixmap(100, 100)
-            pixmap.fill(QColor("#333"))
-        cover_label.setPixmap(pixmap.scaled(80, 80, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
+        cover_label.setPixmap(placeholder_pixmap(80, 80))
+        image_loader.load(podcast.get('cover_art'), cover_label.setPixmap, 80, 80)
         cover_label.setFixedSize(80, 80)
         cover_label.setCursor(Qt.CursorShape.PointingHandCursor)  # Show pointer cursor on hover
         cover_label.mousePressEvent = lambda e: self.play_podcast()  # Make clickable
@@ -496,14 +439,35 @@ class PodcastCard(GlassFrame):
             # Download and play the podcast
             main_window.download_and_play(self.podcast['mp3url'])
             # Update the track list to show the podcast
-            main_window.track_list.clear()
-            main_window.track_list.addItem(f"{self.podcast['title']} - {self.podcast['host']}")
+            main_window.prefetcher.set_queue([self.podcast['mp3url']])
+            main_window.track_model.set_tracks([self.podcast])
             main_window.track_list.setCurrentRow(0)
 
+def _as_list(value):
+    if not value:
+        return []
+    return [value] if isinstance(value, str) else list(value)
+
+# Facet name -> values of a podcast or song, for FacetIndex
+PODCAST_FACETS = {
+    'category': lambda podcast: _as_list(podcast.get('category')),
+    'host': lambda podcast: _as_list(podcast.get('host')),
+    'flags': lambda podcast: [flag for flag in ('featured', 'recent') if podcast.get(flag)],
+}
+SONG_FACETS = {
+    'genre': lambda song: _as_list(song.get('genre')),
+    'mood': lambda song: _as_list(song.get('mood') or song.get('metadata', {}).get('mood')),
+    'flags': lambda song: [flag for flag in ('featured', 'new') if song.get(flag)],
+}
+
 class PodcastsPage(QWidget):
-    def __init__(self, podcasts_data, parent=None):
+    CARD_BATCH = 10  # Cards added per event-loop pass while the page fills in
+    SEARCH_RANKED = 100  # Search matches placed in rank order; the rest follow in catalog order
+
+    def __init__(self, podcasts_data, image_loader, parent=None):
         super().__init__(parent)
         self.podcasts_data = podcasts_data
+        self.image_loader = image_loader
         self.setup_ui()
 
     def setup_ui(self):
@@ -511,24 +475,30 @@ class PodcastsPage(QWidget):
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(15)
 
-        # Search bar (placeholder)
-        search_bar = QLineEdit()
-        search_bar.setPlaceholderText("Search podcasts by title, host, or tag...")
-        search_bar.setStyleSheet("background: rgba(255,255,255,0.1); color: white; border-radius: 8px; padding: 8px;")
-        layout.addWidget(search_bar)
-
-        # Category filter (placeholder)
-        filter_layout = QHBoxLayout()
-        filter_label = QLabel("Filter by category:")
-        filter_label.setStyleSheet("color: #fff;")
-        filter_layout.addWidget(filter_label)
-        for cat in self.podcasts_data.get('categories', []):
-            btn = QPushButton(cat['label'])
-            btn.setStyleSheet("background: rgba(255,255,255,0.15); color: #e94560; border-radius: 8px; padding: 4px 12px;")
-            btn.setEnabled(False)  # Placeholder for now
-            filter_layout.addWidget(btn)
-        filter_layout.addStretch()
-        layout.addLayout(filter_layout)
+        # Search bar; cards are filtered and reordered in place as the user types
+        search_layout = QHBoxLayout()
+        self.search_bar = QLineEdit()
+        self.search_bar.setPlaceholderText("Search podcasts by title, host, or tag...")
+        self.search_bar.setStyleSheet("background: rgba(255,255,255,0.1); color: white; border-radius: 8px; padding: 8px;")
+        self.search_bar.textChanged.connect(self.apply_search)
+        search_layout.addWidget(self.search_bar)
+        download_all = GlassButton("Download All")
+        download_all.clicked.connect(self.download_all)
+        search_layout.addWidget(download_all)
+        layout.addLayout(search_layout)
+
+        # Facet filters; several values can be combined and counts update as they are toggled
+        podcasts = self.podcasts_data.get('podcasts', [])
+        self.facet_index = FacetIndex()
+        self.facet_index.build(podcasts, PODCAST_FACETS, values={
+            'category': [cat['label'] for cat in self.podcasts_data.get('categories', [])]})
+        self.facet_bar = FacetBar([
+            ('category', "Filter by category:", self.facet_index.values('category')),
+            ('host', "Host:", self.facet_index.values('host')),
+            ('flags', "Show:", self.facet_index.values('flags')),
+        ], label=lambda facet, value: value.title() if facet == 'flags' else value)
+        self.facet_bar.selection_changed.connect(self._apply_filter)
+        layout.addWidget(self.facet_bar)
 
         # Featured/recent section (placeholder)
         featured_label = QLabel("Featured & Recent")
@@ -543,11 +513,6 @@ class PodcastsPage(QWidget):
         featured_content_layout = QHBoxLayout(featured_content)
         featured_content_layout.setSpacing(20)
         
-        for podcast in self.podcasts_data.get('podcasts', []):
-            if podcast.get('featured') or podcast.get('recent'):
-                card = PodcastCard(podcast)
-                featured_content_layout.addWidget(card)
-        
         featured_scroll.setWidget(featured_content)
         featured_scroll.setFixedHeight(120)
         featured_scroll.setStyleSheet("border: none;")
@@ -557,12 +522,74 @@ class PodcastsPage(QWidget):
         all_label = QLabel("All Podcasts")
         all_label.setStyleSheet("font-size: 18px; font-weight: bold; color: #fff;")
         layout.addWidget(all_label)
-        podcasts_list = QVBoxLayout()
-        for podcast in self.podcasts_data.get('podcasts', []):
-            card = PodcastCard(podcast)
-            podcasts_list.addWidget(card)
-        podcasts_list.addStretch()
-        layout.addLayout(podcasts_list)
+        self.podcasts_list = QVBoxLayout()
+        layout.addLayout(self.podcasts_list)
+
+        self.search_index = SearchIndex()
+        self.search_index.build([AhoyIndieMedia.search_document(podcast) for podcast in podcasts])
+        self._matches = None  # SearchResults for the current search, or None
+        self._visible = None  # Podcast indices to show, or None for all
+        self._rank = None  # Podcast index -> position of the top search matches, or None
+        self._cards = []  # (podcast index, card, in the "All Podcasts" list)
+        self.facet_bar.set_counts(self.facet_index.counts({}))
+
+        # Cards are added a few at a time so the page appears before all of them exist
+        self._pending_cards = [(featured_content_layout, i, podcast) for i, podcast in enumerate(podcasts)
+                               if podcast.get('featured') or podcast.get('recent')]
+        self._pending_cards += [(self.podcasts_list, i, podcast) for i, podcast in enumerate(podcasts)]
+        QTimer.singleShot(0, self._add_card_batch)
+
+    def apply_search(self, text):
+        self._matches = self.search_index.results(text, page_size=self.SEARCH_RANKED) if text.strip() else None
+        self._apply_filter()
+
+    def _apply_filter(self, *_):
+        selections = self.facet_bar.selections()
+        restrict = None if self._matches is None else self.facet_index.mask_of(self._matches.indices)
+        self.facet_bar.set_counts(self.facet_index.counts(selections, restrict))
+        if self._matches is None and not selections:
+            self._visible = self._rank = None
+        elif self._matches is None:
+            self._visible = set(self.facet_index.matches(selections).tolist())
+            self._rank = {}
+        else:
+            results = self._matches.restrict(self.facet_index.mask(selections, restrict))
+            self._visible = set(results.indices.tolist())
+            self._rank = {i: r for r, i in enumerate(results[:self.SEARCH_RANKED])}
+        self._place_cards()
+
+    def _place_cards(self):
+        """Show matching cards, with the best search matches first in the "All Podcasts" list."""
+        visible, rank = self._visible, self._rank
+        listed = []
+        for i, card, in_list in self._cards:
+            card.setVisible(visible is None or i in visible)
+            if in_list:
+                listed.append((i if rank is None else rank.get(i, len(rank) + i), card))
+        listed.sort(key=lambda entry: entry[0])
+        for position, (_, card) in enumerate(listed):
+            if self.podcasts_list.indexOf(card) != position:
+                self.podcasts_list.removeWidget(card)
+                self.podcasts_list.insertWidget(position, card)
+
+    def download_all(self):
+        main_window = self.window()
+        if isinstance(main_window, AhoyIndieMedia):
+            main_window.download_batch(self.podcasts_data.get('podcasts', []), "Podcasts")
+
+    def _add_card_batch(self):
+        batch = self._pending_cards[:self.CARD_BATCH]
+        del self._pending_cards[:self.CARD_BATCH]
+        for layout, i, podcast in batch:
+            card = PodcastCard(podcast, self.image_loader)
+            layout.addWidget(card)
+            self._cards.append((i, card, layout is self.podcasts_list))
+        if self._rank is not None:
+            self._place_cards()
+        if self._pending_cards:
+            QTimer.singleShot(0, self._add_card_batch)
+        else:
+            self.podcasts_list.addStretch()
 
 class AhoyIndieMedia(QMainWindow):
     def __init__(self):
@@ -577,13 +604,87 @@ class AhoyIndieMedia(QMainWindow):
         # Set window icon
         self.setWindowIcon(QIcon(self.create_favicon()))
         
-        # Initialize storage client
+        # The storage client is created on first use of storage_client
         load_dotenv()
-        self.storage_client = storage.Client()
+        self._storage_client = None
         self.bucket_name = "ahoy-song-collection"
         
+        # Cover art is fetched in the background and cached in memory and on disk
+        self.image_loader = ImageLoader(parent=self)
+        
+        # Played tracks and podcasts are kept on disk so repeat plays skip the network
+        self.media_cache = MediaCache(
+            max_bytes=int(os.getenv("AHOY_MEDIA_CACHE_MB", "2048")) * 1024 * 1024)
+        
+        # Uncached tracks start playing once AHOY_STREAM_START_KB has been buffered
+        # Playback of local files goes through AHOY_AUDIO_BACKEND (pygame, qt or sink)
+        self.audio = create_backend(os.getenv("AHOY_AUDIO_BACKEND", "pygame"))
+        
+        # Streaming and gapless playback feed pygame directly, so need the pygame backend
+        self.streaming_enabled = (os.getenv("AHOY_STREAMING", "1") != "0"
+                                  and self.audio.name == "pygame")
+        self.stream_player = StreamingPlayback(
+            self.media_cache,
+            start_bytes=int(os.getenv("AHOY_STREAM_START_KB", "256")) * 1024,
+            parent=self)
+        self.stream_player.buffer_health.connect(self.update_buffer_health)
+        self.stream_player.error.connect(self.stream_error)
+        
+        # AHOY_GAPLESS=1 plays local library tracks back to back, decoding the next one ahead
+        self.gapless_enabled = os.getenv("AHOY_GAPLESS") == "1" and self.audio.name == "pygame"
+        self.gapless = GaplessPlayer(crossfade_ms=int(os.getenv("AHOY_CROSSFADE_MS", "0")), parent=self)
+        self.gapless.track_started.connect(self.gapless_track_started)
+        self.gapless.needs_next.connect(self.queue_next_gapless)
+        self.gapless.finished.connect(self.gapless_finished)
+        self._gapless_rows = {}  # Preloaded path -> track list row
+        
+        # Tracks are analysed once in the background; the visualizer reads cached frames
+        self.spectrum_analyzer = SpectrumAnalyzer(parent=self)
+        self.spectrum_analyzer.ready.connect(self.spectrum_ready)
+        self.current_audio_path = None
+        
+        # Durations and tags come from a persistent index filled in the background
+        self.track_index = TrackIndex()
+        self.metadata_worker = MetadataWorker(self.track_index, parent=self)
+        self.metadata_worker.indexed.connect(self.track_metadata_ready)
+        
+        # Cached tracks are measured on all cores in the background and played back at
+        # AHOY_LOUDNESS_TARGET LUFS (AHOY_LOUDNESS=0 turns normalization off)
+        self.loudness_enabled = os.getenv("AHOY_LOUDNESS", "1") != "0"
+        self.loudness_target = float(os.getenv("AHOY_LOUDNESS_TARGET", "-16"))
+        self.loudness_analyzer = LoudnessAnalyzer(
+            self.track_index, workers=int(os.getenv("AHOY_LOUDNESS_WORKERS", "0")) or None, parent=self)
+        self.loudness_analyzer.analyzed.connect(self.track_loudness_ready)
+        self.volume = 1.0
+        self.track_gain = 1.0
+        
+        # Tracks around the current one are fetched ahead of time so skips are instant
+        self.prefetcher = Prefetcher(
+            self.media_cache,
+            ahead=int(os.getenv("AHOY_PREFETCH_AHEAD", "2")),
+            budget_bytes=int(os.getenv("AHOY_PREFETCH_MB", "512")) * 1024 * 1024,
+            parent=self)
+        
+        # Downloads share one worker pool and HTTP session; unfinished ones resume after a restart
+        self.download_manager = DownloadManager(
+            max_workers=int(os.getenv("AHOY_DOWNLOAD_WORKERS", "3")), parent=self)
+        self.download_manager.progress.connect(self.update_progress)
+        self.download_manager.finished.connect(self.download_finished)
+        self.download_manager.failed.connect(self.download_error)
+        self.download_manager.batch_progress.connect(self.update_batch_progress)
+        self.download_manager.batch_finished.connect(self.batch_download_finished)
+        startup_profile.mark("services")
+        
+        # The JSON catalogs are compiled into SQLite (re-ingesting only changed files) and queried from there
+        self.catalog = Catalog(os.getenv("AHOY_CATALOG_DB", "data/tempRefData/ahoy.db"))
+        self.catalog.refresh()
+        
+        # The vintage broadcast schedule is loaded on first use by update_on_air
+        self.broadcast = None
+        
         # Load music data
         self.load_music_data()
+        startup_profile.mark("data load")
         
         # Setup UI
         self.setup_ui()
@@ -592,13 +693,20 @@ class AhoyIndieMedia(QMainWindow):
         self.current_track = None
         self.is_playing = False
         self.downloaded_tracks = set()
-        self.temp_files = []
         self.load_downloaded_tracks()
 
         # Initialize playback timer
         self.playback_timer = QTimer()
         self.playback_timer.timeout.connect(self.update_playback_position)
         self.playback_timer.start(1000)  # Update every second
+        
+        self.download_manager.resume()
+        
+        # Index anything already on disk so later plays show their duration immediately
+        self.metadata_worker.request_many(self.media_cache.cached_files())
+        self.metadata_worker.request_many(str(p) for p in Path("downloads").glob("*.mp3"))
+        if self.loudness_enabled:
+            QTimer.singleShot(10000, self.analyze_loudness)  # Once startup has settled
 
         # Set window background
         self.setStyleSheet("""
@@ -609,16 +717,16 @@ class AhoyIndieMedia(QMainWindow):
             QLabel {
                 color: white;
             }
-            QListWidget {
+            QListView {
                 background-color: rgba(255, 255, 255, 0.1);
                 border: 1px solid rgba(255, 255, 255, 0.2);
                 border-radius: 5px;
                 color: white;
             }
-            QListWidget::item {
+            QListView::item {
                 padding: 8px;
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: rgba(255, 255, 255, 0.2);
             }
             QProgressBar {
@@ -638,6 +746,24 @@ class AhoyIndieMedia(QMainWindow):
                 padding: 5px;
             }
         """)
+        startup_profile.mark("ui build")
+
+    @property
+    def storage_client(self):
+        """Google Cloud Storage client, created on first use (requires credentials)"""
+        if self._storage_client is None:
+            from google.cloud import storage
+            self._storage_client = storage.Client()
+        return self._storage_client
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not startup_profile.finished:
+            startup_profile.finish("first paint")
+            if os.getenv("AHOY_STARTUP_BENCHMARK"):
+                # Run by benchmarks/startup.py: report and exit once the window is up
+                print(startup_profile.to_json(), flush=True)
+                QTimer.singleShot(0, QApplication.instance().quit)
 
     def create_favicon(self):
         # Create a red square favicon
@@ -646,8 +772,10 @@ class AhoyIndieMedia(QMainWindow):
         return pixmap
 
     def load_music_data(self):
-        with open('data/music_library.json', 'r') as f:
-            self.music_data = json.load(f)
+        self.music_data = {'music_library': self.catalog.items('music_library', 'song')}
+        playlists = self.catalog.items('music_library', 'playlist')
+        if playlists:
+            self.music_data['playlists'] = playlists
 
     def setup_ui(self):
         # Ensure progress bar exists first
@@ -707,29 +835,34 @@ class AhoyIndieMedia(QMainWindow):
             featured_content = QWidget()
             featured_content_layout = QHBoxLayout(featured_content)
             featured_content_layout.setSpacing(20)
-            for playlist in self.music_data['playlists']:
-                if playlist.get('featured'):
-                    playlist_widget = self.create_playlist_widget(playlist)
-                    featured_content_layout.addWidget(playlist_widget)
+            QTimer.singleShot(0, lambda: self.add_featured_playlists(featured_content_layout))
             featured_scroll.setWidget(featured_content)
             dashboard_layout.addWidget(featured_scroll)
         
+        # What the vintage broadcast channel is airing; refreshed when each airing ends
+        self.on_air_label = QLabel()
+        self.on_air_label.setStyleSheet("color: #e94560; font-size: 14px;")
+        dashboard_layout.addWidget(self.on_air_label)
+        QTimer.singleShot(0, self.update_on_air)
+        
         # Recent tracks
         recent_label = QLabel("Recent Tracks")
         recent_label.setStyleSheet("font-size: 20px; font-weight: bold;")
         dashboard_layout.addWidget(recent_label)
-        self.track_list = QListWidget()
+        self.track_model = TrackListModel(display=self.track_label, parent=self)
+        self.track_list = TrackListView(self.track_model)
+        self.track_list.currentRowChanged.connect(self.prefetcher.set_position)
         self.populate_track_list()
         dashboard_layout.addWidget(self.track_list)
         self.content_stack.addWidget(dashboard)
         
-        # Add other pages
-        self.content_stack.addWidget(QWidget())  # Library page
+        # Other pages are built the first time they are shown
+        self.downloads_page = None
+        self.podcasts_page = None
+        self.content_stack.addWidget(LazyPage(self.build_library_page))
         self.content_stack.addWidget(QWidget())  # Playlists page
-        self.downloads_page = DownloadsPage()
-        self.content_stack.addWidget(self.downloads_page)
-        self.podcasts_page = PodcastsPage(self.load_podcasts_data())
-        self.content_stack.addWidget(self.podcasts_page)
+        self.content_stack.addWidget(LazyPage(self.build_downloads_page))
+        self.content_stack.addWidget(LazyPage(self.build_podcasts_page))
         
         main_layout.addWidget(self.content_stack)
 
@@ -739,6 +872,10 @@ class AhoyIndieMedia(QMainWindow):
         
         # Visualization
         self.visualization = VisualizationWidget()
+        self.visualization.position_source = self.playback_position
+        self.visualization.playing_source = lambda: (
+            self.gapless.is_playing() or self.audio.is_playing()
+            or (self.stream_player.is_active() and get_mixer().music.get_busy()))
         player_layout.addWidget(self.visualization)
         
         # Music player card
@@ -755,6 +892,10 @@ class AhoyIndieMedia(QMainWindow):
         card_layout.setSpacing(16)
         
         # Song info
+        self.thumbnail_label = QLabel()
+        self.thumbnail_label.setFixedSize(60, 60)
+        self.thumbnail_label.setPixmap(placeholder_pixmap(60, 60))
+        card_layout.addWidget(self.thumbnail_label, alignment=Qt.AlignmentFlag.AlignCenter)
         self.track_title = QLabel("Song Name")
         self.track_title.setStyleSheet("font-size: 24px; font-weight: bold; color: white;")
         self.track_title.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -860,14 +1001,34 @@ class AhoyIndieMedia(QMainWindow):
         
         main_layout.addWidget(player_frame)
 
+    def update_on_air(self):
+        if self.broadcast is None:
+            self.broadcast = BroadcastEngine().load()
+        now = datetime.now()
+        airing = self.broadcast.now_playing(now)
+        if airing is None:
+            self.on_air_label.hide()
+            return
+        text = f"On Air · {airing['block']}: {airing['title']}"
+        upcoming = self.broadcast.up_next(now)
+        if upcoming:
+            text += f"   Up next at {upcoming[0]['start']:%H:%M}: {upcoming[0]['title']}"
+        self.on_air_label.setText(text)
+        remaining_ms = int((airing['end'] - now).total_seconds() * 1000)
+        QTimer.singleShot(max(remaining_ms, 1000), self.update_on_air)
+
+    def add_featured_playlists(self, layout):
+        for playlist in self.music_data['playlists']:
+            if playlist.get('featured'):
+                layout.addWidget(self.create_playlist_widget(playlist))
+
     def create_playlist_widget(self, playlist):
         widget = GlassFrame()
         layout = QVBoxLayout(widget)
         
         cover_label = QLabel()
-        pixmap = QPixmap()
-        pixmap.loadFromData(requests.get(playlist['coverImage']).content)
-        cover_label.setPixmap(pixmap.scaled(200, 200, Qt.AspectRatioMode.KeepAspectRatio))
+        cover_label.setPixmap(placeholder_pixmap(200, 200))
+        self.image_loader.load(playlist.get('coverImage'), cover_label.setPixmap, 200, 200)
         
         title_label = QLabel(playlist['title'])
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -882,11 +1043,26 @@ class AhoyIndieMedia(QMainWindow):
         layout.addWidget(desc_label)
         return widget
 
+    @staticmethod
+    def track_label(track):
+        if 'songTitle' in track:
+            return f"{track['songTitle']} - {track['artist']}"
+        return f"{track['title']} - {track['host']}"
+
+    @staticmethod
+    def search_document(track):
+        """Fields of a song or podcast for a SearchIndex."""
+        tags = track.get('tags') or []
+        if isinstance(tags, str):
+            tags = [tags]
+        tags = list(tags) + [track[key] for key in ('genre', 'category', 'mood') if track.get(key)]
+        return {'title': track.get('songTitle') or track.get('title'),
+                'artist': track.get('artist') or track.get('host'),
+                'tags': tags}
+
     def populate_track_list(self):
-        self.track_list.clear()
-        for song in self.music_data['music_library']:
-            item_text = f"{song['songTitle']} - {song['artist']}"
-            self.track_list.addItem(item_text)
+        self.prefetcher.set_queue([song['mp3url'] for song in self.music_data['music_library']])
+        self.track_model.set_tracks(self.music_data['music_library'])
 
     def show_dashboard(self):
         self.content_stack.setCurrentIndex(0)
@@ -894,31 +1070,68 @@ class AhoyIndieMedia(QMainWindow):
     def show_library(self):
         # Show the music library tab with thumbnails
         self.content_stack.setCurrentIndex(1)
-        # Create or update the music library widget
-        if not hasattr(self, 'music_library_widget'):
-            self.music_library_widget = QWidget()
-            layout = QVBoxLayout(self.music_library_widget)
-            label = QLabel('Music Library')
-            label.setStyleSheet('font-size: 24px; font-weight: bold; color: white;')
-            layout.addWidget(label)
-            self.library_list = QListWidget()
-            self.library_list.setIconSize(QSize(60, 60))
-            for song in self.music_data['music_library']:
-                item = QListWidgetItem()
-                item.setText(f"{song['songTitle']} - {song['artist']}")
-                if song.get('thumbnail'):
-                    pixmap = QPixmap()
-                    try:
-                        img_data = requests.get(song['thumbnail']).content
-                        pixmap.loadFromData(img_data)
-                        item.setIcon(QIcon(pixmap))
-                    except:
-                        pass
-                self.library_list.addItem(item)
-            layout.addWidget(self.library_list)
-            self.content_stack.insertWidget(1, self.music_library_widget)
-        else:
-            self.content_stack.setCurrentWidget(self.music_library_widget)
+
+    def build_library_page(self):
+        self.music_library_widget = QWidget()
+        layout = QVBoxLayout(self.music_library_widget)
+        header = QHBoxLayout()
+        label = QLabel('Music Library')
+        label.setStyleSheet('font-size: 24px; font-weight: bold; color: white;')
+        header.addWidget(label)
+        header.addStretch()
+        download_all = GlassButton("Download All")
+        download_all.clicked.connect(self.download_library)
+        header.addWidget(download_all)
+        layout.addLayout(header)
+        self.library_search = QLineEdit()
+        self.library_search.setPlaceholderText("Search library by title, artist, or tag...")
+        self.library_search.setStyleSheet("background: rgba(255,255,255,0.1); color: white; border-radius: 8px; padding: 8px;")
+        self.library_search.textChanged.connect(self.filter_library)
+        layout.addWidget(self.library_search)
+        songs = self.music_data['music_library']
+        self.library_index = SearchIndex()
+        self.library_index.build([self.search_document(song) for song in songs])
+        self.library_facets = FacetIndex()
+        self.library_facets.build(songs, SONG_FACETS)
+        self.library_facet_bar = FacetBar([
+            ('genre', "Genre:", self.library_facets.values('genre')),
+            ('mood', "Mood:", self.library_facets.values('mood')),
+            ('flags', "Show:", self.library_facets.values('flags')),
+        ], label=lambda facet, value: value.title() if facet == 'flags' else value)
+        self.library_facet_bar.set_counts(self.library_facets.counts({}))
+        self.library_facet_bar.selection_changed.connect(self.filter_library)
+        layout.addWidget(self.library_facet_bar)
+        self.library_model = TrackListModel(display=self.track_label,
+                                            thumbnail=lambda song: song.get('thumbnail'),
+                                            image_loader=self.image_loader, parent=self)
+        self.library_model.set_tracks(self.music_data['music_library'])
+        self.library_list = TrackListView(self.library_model)
+        layout.addWidget(self.library_list)
+        return self.music_library_widget
+
+    def filter_library(self, *_):
+        # The model is filtered to the matching indices; search matches are ranked a page
+        # at a time as the view fetches rows, so no rows are rebuilt or sorted up front
+        text = self.library_search.text()
+        selections = self.library_facet_bar.selections()
+        matches = None
+        if text.strip():
+            matches = self.library_index.results(text, page_size=self.library_model.page_size)
+        restrict = None if matches is None else self.library_facets.mask_of(matches.indices)
+        self.library_facet_bar.set_counts(self.library_facets.counts(selections, restrict))
+        if selections and matches is None:
+            matches = self.library_facets.matches(selections).tolist()
+        elif selections:
+            matches = matches.restrict(self.library_facets.mask(selections, restrict))
+        self.library_model.set_filter(matches)
+
+    def build_downloads_page(self):
+        self.downloads_page = DownloadsPage()
+        return self.downloads_page
+
+    def build_podcasts_page(self):
+        self.podcasts_page = PodcastsPage(self.load_podcasts_data(), self.image_loader)
+        return self.podcasts_page
 
     def show_playlists(self):
         self.content_stack.setCurrentIndex(2)
@@ -929,18 +1142,115 @@ class AhoyIndieMedia(QMainWindow):
     def show_podcasts(self):
         self.content_stack.setCurrentIndex(4)
 
+    def play_local_file(self, local_path, gapless=False):
+        """Start playing a file on disk and fetch its spectrum for the visualizer"""
+        self.stream_player.stop()
+        self.media_cache.pin(local_path)
+        if gapless and self.gapless.can_play(local_path, self.indexed_duration(local_path)):
+            self.audio.stop()
+            self.gapless.play(local_path)
+        else:
+            self.gapless.stop()
+            self.audio.load(local_path)
+            self.audio.play()
+        self.track_loaded(local_path)
+
+    def track_loaded(self, local_path):
+        self.current_audio_path = local_path
+        self.visualization.set_spectrum_frames(None)
+        self.spectrum_analyzer.request(local_path)
+        metadata = self.track_index.get(local_path)
+        self.apply_track_gain(metadata)
+        if metadata is not None:
+            self.show_track_duration(metadata)
+            self.audio.set_seek_table(self.track_index.seek_table(local_path))
+        if not self.track_index.is_current(local_path):
+            self.metadata_worker.request(local_path)
+
+    def indexed_duration(self, path):
+        metadata = self.track_index.get(path)
+        return metadata.get('duration') if metadata else None
+
+    def queue_next_gapless(self, path):
+        """Pre-decode the next track in the list if it is already on disk"""
+        row = self.track_list.currentRow() + 1
+        if row <= 0 or row >= self.track_list.count():
+            return
+        song = self.track_model.track_at(row)
+        if 'songTitle' not in song:
+            return
+        local_path = self.find_local_track(song)
+        if local_path and self.gapless.can_play(local_path, self.indexed_duration(local_path)):
+            self.media_cache.pin(local_path)
+            self._gapless_rows[local_path] = row
+            self.gapless.preload(local_path)
+
+    def gapless_track_started(self, path):
+        row = self._gapless_rows.pop(path, None)
+        if row is None or path == self.current_audio_path:
+            return
+        self.track_list.setCurrentRow(row)
+        self.track_loaded(path)
+        song = self.track_model.track_at(row)
+        self.update_track_info(song['songTitle'], song['artist'], song.get('thumbnail'))
+
+    def gapless_finished(self):
+        # The next track was not on disk; fall back to streaming it
+        if self.is_playing and self.track_list.currentRow() < self.track_list.count() - 1:
+            self.next_track()
+        else:
+            self.is_playing = False
+            self.play_button.setText("Play")
+
+    def track_metadata_ready(self, path, metadata):
+        if path == self.current_audio_path:
+            self.show_track_duration(metadata)
+            self.apply_track_gain(metadata)
+            self.audio.set_seek_table(self.track_index.seek_table(path))
+
+    def track_loudness_ready(self, path, metadata):
+        # Batch paths come from directory listings, so compare them absolute
+        if self.current_audio_path and os.path.abspath(path) == os.path.abspath(self.current_audio_path):
+            self.apply_track_gain(metadata)
+
+    def show_track_duration(self, metadata):
+        duration = metadata.get('duration')
+        if duration:
+            self.total_time_label.setText(self.format_time(duration))
+            self.time_slider.setMaximum(int(duration))
+
+    def spectrum_ready(self, path, frames):
+        if path == self.current_audio_path:
+            self.visualization.set_spectrum_frames(frames)
+
     def download_and_play(self, url):
         try:
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
-            temp_file.close()
-            response = requests.get(url, stream=True)
-            with open(temp_file.name, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-            self.temp_files.append(temp_file.name)
-            pygame.mixer.music.load(temp_file.name)
-            pygame.mixer.music.play()
+            self.stream_player.stop()
+            self.gapless.stop()
+            self.audio.set_seek_table(None)  # The stream replaces the loaded file
+            self.current_audio_path = None
+            self.apply_track_gain(None)
+            self.visualization.set_spectrum_frames(None)
+            local_path = self.media_cache.get(url)
+            if local_path is None and self.streaming_enabled:
+                # Playback starts from the buffer while the rest downloads
+                self.stream_player.start(url)
+            else:
+                if local_path is None:
+                    import requests
+
+                    writer = self.media_cache.open_writer(url)
+                    try:
+                        response = requests.get(url, stream=True)
+                        response.raise_for_status()
+                        for chunk in response.iter_content(chunk_size=8192):
+                            if chunk:
+                                writer.write(chunk)
+                    except Exception:
+                        writer.abort()
+                        raise
+                    local_path = writer.commit()
+                self.play_local_file(local_path)
             self.play_button.setText("Pause")
             self.is_playing = True
             # Update track info for podcast or song
@@ -950,7 +1260,7 @@ class AhoyIndieMedia(QMainWindow):
                     f"Host: {self.current_podcast['host']}",
                     self.current_podcast.get('cover_art')
                 )
-            elif hasattr(self, 'music_data') and self.track_list.currentItem():
+            elif hasattr(self, 'music_data') and self.track_list.currentRow() >= 0:
                 idx = self.track_list.currentRow()
                 song = self.music_data['music_library'][idx]
                 self.update_track_info(song['songTitle'], song['artist'], song.get('thumbnail'))
@@ -958,37 +1268,57 @@ class AhoyIndieMedia(QMainWindow):
             QMessageBox.critical(self, "Error", f"Error playing track: {str(e)}")
 
     def toggle_play(self):
-        if not self.track_list.currentItem():
+        if self.track_list.currentRow() < 0:
             return
 
         if self.is_playing:
-            pygame.mixer.music.pause()
+            if self.stream_player.is_active():
+                self.stream_player.pause()
+            elif self.gapless.is_active():
+                self.gapless.pause()
+            else:
+                self.audio.pause()
             self.play_button.setText("Play")
             self.is_playing = False
+        elif self.stream_player.is_active():
+            self.stream_player.resume()
+            self.play_button.setText("Pause")
+            self.is_playing = True
+        elif self.gapless.is_active():
+            self.gapless.resume()
+            self.play_button.setText("Pause")
+            self.is_playing = True
         else:
             current_index = self.track_list.currentRow()
             song = self.music_data['music_library'][current_index]
             
-            local_path = f"downloads/{song['id']}.mp3"
-            if os.path.exists(local_path):
-                pygame.mixer.music.load(local_path)
-                pygame.mixer.music.play()
+            local_path = self.find_local_track(song)
+            if local_path:
+                self.play_local_file(local_path, gapless=self.gapless_enabled)
                 self.play_button.setText("Pause")
                 self.is_playing = True
             else:
                 self.download_and_play(song['mp3url'])
 
+    def find_local_track(self, song):
+        """Return a local copy of a song (download or media cache), or None"""
+        for local_path in (f"downloads/{song['id']}.mp3",
+                           os.path.join("downloads", self.generate_download_filename(song))):
+            if os.path.exists(local_path):
+                return local_path
+        return self.media_cache.get(song['mp3url'])
+
     def generate_download_filename(self, song):
         """Generate a clean filename for downloads"""
         # Clean the artist and title names to be filesystem-friendly
-        artist = "".join(c for c in song['artist'] if c.isalnum() or c in (' ', '-', '_')).strip()
-        title = "".join(c for c in song['songTitle'] if c.isalnum() or c in (' ', '-', '_')).strip()
+        artist = "".join(c for c in song.get('artist', song.get('host', '')) if c.isalnum() or c in (' ', '-', '_')).strip()
+        title = "".join(c for c in song.get('songTitle', song.get('title', '')) if c.isalnum() or c in (' ', '-', '_')).strip()
         
-        # Format: Artist - Title.mp3
+        # Format: Artist - Title.mp3 (Host - Title.mp3 for podcast episodes)
         return f"{artist} - {title}.mp3"
 
     def download_current_track(self):
-        if not self.track_list.currentItem():
+        if self.track_list.currentRow() < 0:
             return
 
         current_index = self.track_list.currentRow()
@@ -1003,26 +1333,47 @@ class AhoyIndieMedia(QMainWindow):
                                   "This track is already downloaded!")
             return
 
-        self.progress_bar.show()
-        self.downloader = MusicDownloader(song['mp3url'], local_path)
-        self.downloader.progress.connect(self.update_progress)
-        self.downloader.finished.connect(self.download_finished)
-        self.downloader.error.connect(self.download_error)
-        self.downloader.start()
+        self.download_manager.enqueue(song['mp3url'], local_path)
 
-    def update_progress(self, value):
-        self.progress_bar.setValue(value)
+    def update_progress(self, received, expected):
+        """Show combined progress of all running downloads"""
+        if self.download_manager.batches:
+            return  # Batch stats own the progress bar while a batch runs
+        if self.download_manager.is_idle():
+            self.progress_bar.hide()
+            return
+        self.progress_bar.setFormat("Downloading %p%")
+        self.progress_bar.setValue(int(received * 100 / expected) if expected else 0)
+        self.progress_bar.show()
 
-    def download_finished(self, path):
-        self.progress_bar.hide()
+    def download_finished(self, job_id, path):
         self.downloaded_tracks.add(path)
+        if self.download_manager.jobs[job_id].get('batch_id'):
+            return  # Reported once when the batch finishes
         self.save_downloaded_tracks()
-        self.downloads_page.refresh_downloads_list()
+        if self.downloads_page is not None:
+            self.downloads_page.refresh_downloads_list()
         QMessageBox.information(self, "Download Complete", 
                               "Track has been downloaded successfully!")
 
-    def download_error(self, error):
+    def update_buffer_health(self, health):
+        """Show how much of a streaming track has been buffered"""
+        if health['complete']:
+            self.progress_bar.hide()
+            return
+        self.progress_bar.setFormat("Stalled, buffering %p%" if health['stalled'] else "Buffered %p%")
+        self.progress_bar.setValue(int(health['fraction'] * 100))
+        self.progress_bar.show()
+
+    def stream_error(self, error):
         self.progress_bar.hide()
+        self.is_playing = False
+        self.play_button.setText("Play")
+        QMessageBox.critical(self, "Error", f"Error playing track: {error}")
+
+    def download_error(self, job_id, error):
+        if self.download_manager.jobs[job_id].get('batch_id'):
+            return
         QMessageBox.critical(self, "Download Error", f"Error downloading track: {error}")
 
     def load_downloaded_tracks(self):
@@ -1038,28 +1389,61 @@ class AhoyIndieMedia(QMainWindow):
             json.dump(list(self.downloaded_tracks), f)
 
     def closeEvent(self, event):
-        for temp_file in self.temp_files:
-            try:
-                os.unlink(temp_file)
-            except:
-                pass
+        self.image_loader.shutdown()
+        self.prefetcher.shutdown()
+        self.spectrum_analyzer.shutdown()
+        self.metadata_worker.shutdown()
+        self.loudness_analyzer.shutdown()
+        self.track_index.close()
+        self.download_manager.shutdown()
+        self.catalog.close()
+        self.stream_player.stop()
+        self.gapless.shutdown()
+        self.audio.close()
+        self.media_cache.flush()
         event.accept()
 
     def update_playback_position(self):
         if self.is_playing:
             try:
-                pos = pygame.mixer.music.get_pos() / 1000  # Convert to seconds
+                pos = self.playback_position()
                 self.current_time_label.setText(self.format_time(pos))
             except:
                 pass
 
+    def playback_position(self):
+        """Seconds into the playing track"""
+        if self.gapless.is_active():
+            return self.gapless.position()
+        if self.stream_player.is_active():
+            return get_mixer().music.get_pos() / 1000  # Convert to seconds
+        return self.audio.position()
+
     def format_time(self, seconds):
         minutes = int(seconds // 60)
         seconds = int(seconds % 60)
         return f"{minutes}:{seconds:02d}"
 
     def set_volume(self, value):
-        pygame.mixer.music.set_volume(value / 100)
+        self.volume = value / 100
+        # Normalization can only boost up to full scale
+        volume = min(self.volume * self.track_gain, 1.0)
+        self.audio.set_volume(volume)
+        self.gapless.set_volume(volume)
+
+    def apply_track_gain(self, metadata):
+        """Level-match the current track from its stored loudness; unmeasured tracks play as is"""
+        gain = 1.0
+        if self.loudness_enabled and metadata:
+            gain = playback_gain(metadata.get('loudness'), metadata.get('true_peak'), self.loudness_target)
+        if gain != self.track_gain:
+            self.track_gain = gain
+            self.set_volume(self.volume * 100)
+
+    def analyze_loudness(self):
+        """Measure every cached or downloaded track that has no stored loudness"""
+        self.loudness_analyzer.analyze(
+            self.media_cache.cached_files() + [str(p) for p in Path("downloads").glob("*.mp3")])
 
     def previous_track(self):
         if self.track_list.currentRow() > 0:
@@ -1072,69 +1456,103 @@ class AhoyIndieMedia(QMainWindow):
             self.play_current_track()
 
     def play_current_track(self):
-        if self.track_list.currentItem():
+        if self.track_list.currentRow() >= 0:
             current_index = self.track_list.currentRow()
             song = self.music_data['music_library'][current_index]
-            local_path = f"downloads/{song['id']}.mp3"
-            if os.path.exists(local_path):
-                pygame.mixer.music.load(local_path)
+            local_path = self.find_local_track(song)
+            if local_path:
+                self.play_local_file(local_path, gapless=self.gapless_enabled)
             else:
                 self.download_and_play(song['mp3url'])
                 return
-            pygame.mixer.music.play()
             self.play_button.setText("Pause")
             self.is_playing = True
             # Update track info
             self.update_track_info(song['songTitle'], song['artist'], song.get('thumbnail'))
-            # Update total time
-            try:
-                duration = librosa.get_duration(path=local_path)
-                self.total_time_label.setText(self.format_time(duration))
-                self.time_slider.setMaximum(int(duration))
-            except:
-                pass
 
     def start_new_batch(self):
         """Start a new download batch with a new ID"""
         self.current_batch_id = str(uuid.uuid4())[:8]
         self.batch_start_time = datetime.now()
 
+    def download_batch(self, items, label):
+        """Download songs or podcast episodes as one batch, skipping ones already on disk"""
+        self.start_new_batch()
+        jobs = []
+        for item in items:
+            local_path = os.path.join("downloads", self.generate_download_filename(item))
+            # Tracks already played are copied out of the media cache (on a download worker)
+            jobs.append((item['mp3url'], local_path, self.media_cache.peek(item['mp3url'])))
+        self.download_manager.enqueue_batch(jobs, batch_id=self.current_batch_id, label=label)
+
+    def download_library(self):
+        self.download_batch(self.music_data['music_library'], "Library")
+
+    def update_batch_progress(self, batch_id, stats):
+        finished = stats['done'] + stats['failed']
+        eta = self.format_time(stats['eta']) if stats['eta'] is not None else "--:--"
+        text = (f"{stats['label']}: {finished}/{stats['queued']} • {stats['mb_per_s']:.2f} MB/s • "
+                f"{stats['items_per_s']:.1f} items/s • ETA {eta}")
+        if stats['failed']:
+            text += f" • {stats['failed']} failed"
+        self.progress_bar.setFormat(text)
+        self.progress_bar.setValue(int(finished * 100 / stats['queued']) if stats['queued'] else 100)
+        self.progress_bar.show()
+
+    def batch_download_finished(self, batch_id, stats):
+        if self.download_manager.is_idle():
+            self.progress_bar.hide()
+        self.save_downloaded_tracks()
+        if self.downloads_page is not None:
+            self.downloads_page.refresh_downloads_list()
+        message = (f"{stats['label']}: {stats['done']} downloaded, {stats['skipped']} already on disk, "
+                   f"{stats['failed']} failed in {self.format_time(stats['elapsed'])} "
+                   f"({stats['mb_per_s']:.2f} MB/s)")
+        if stats['failures']:
+            message += "\n\nFailed:\n" + "\n".join(f"{url}: {error}" for url, error in stats['failures'][:5])
+            QMessageBox.warning(self, "Batch Download Finished", message)
+        else:
+            QMessageBox.information(self, "Batch Download Finished", message)
+
     def load_podcasts_data(self):
-        with open('data/podcasts_library.json', 'r') as f:
-            return json.load(f)
+        podcasts_data = {'podcasts': self.catalog.items('podcasts_library', 'podcast')}
+        categories = self.catalog.items('podcasts_library', 'category')
+        if categories:
+            podcasts_data['categories'] = categories
+        return podcasts_data
 
     def seek_position(self, position):
         """Handle timeline dragging"""
-        if pygame.mixer.music.get_busy():
-            pygame.mixer.music.set_pos(position)
+        if self.gapless.is_active():
+            self.gapless.seek(position)
+            self.current_time_label.setText(self.format_time(position))
+        elif self.audio.is_playing():
+            self.audio.seek(position)
             self.current_time_label.setText(self.format_time(position))
 
     def skip_time(self, seconds):
         """Skip forward or backward by specified seconds"""
-        if pygame.mixer.music.get_busy():
-            current_pos = pygame.mixer.music.get_pos() / 1000  # Convert to seconds
-            new_pos = max(0, current_pos + seconds)
-            pygame.mixer.music.set_pos(new_pos)
+        if self.gapless.is_active():
+            new_pos = max(0, self.gapless.position() + seconds)
+            self.gapless.seek(new_pos)
+            self.current_time_label.setText(self.format_time(new_pos))
+        elif self.audio.is_playing():
+            new_pos = max(0, self.playback_position() + seconds)
+            self.audio.seek(new_pos)
             self.current_time_label.setText(self.format_time(new_pos))
 
     def update_thumbnail(self, url=None):
         """Update the thumbnail image"""
+        self.thumbnail_url = url
+        # Show the placeholder until the image arrives (or if loading fails)
+        self.thumbnail_label.setPixmap(placeholder_pixmap(60, 60))
         if url:
-            try:
-                response = requests.get(url)
-                pixmap = QPixmap()
-                pixmap.loadFromData(response.content)
-                self.thumbnail_label.setPixmap(pixmap.scaled(
-                    60, 60, 
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation
-                ))
-            except:
-                # Set default thumbnail if loading fails
-                self.thumbnail_label.setPixmap(QPixmap(60, 60))
-        else:
-            # Clear thumbnail
-            self.thumbnail_label.setPixmap(QPixmap(60, 60))
+            self.image_loader.load(url, lambda pixmap: self._set_thumbnail(url, pixmap), 60, 60)
+
+    def _set_thumbnail(self, url, pixmap):
+        # Ignore images for tracks the user has already skipped past
+        if url == self.thumbnail_url:
+            self.thumbnail_label.setPixmap(pixmap)
 
     def toggle_playback_speed(self):
         """Toggle between different playback speeds"""
@@ -1145,7 +1563,7 @@ class AhoyIndieMedia(QMainWindow):
         new_speed = speeds[next_index]
         
         self.speed_button.setText(f"{new_speed}x")
-        if pygame.mixer.music.get_busy():
+        if self.audio.is_playing():
             # Note: pygame doesn't support playback speed directly
             # This is a placeholder for when we implement a different audio backend
             pass
@@ -0,0 +1,341 @@
+import time
+import wave
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional
+
+from .mixer import get_mixer, mixer_initialized
+from .mp3_seek import FileSlice, SeekTable
+
+logger = logging.getLogger(__name__)
+
+
+class AudioBackend(ABC):
+    """One playback interface over the app's audio stacks.
+
+    Positions are seconds from the start of the loaded file, including any
+    seeks. ``position`` must keep advancing only while audio is actually
+    being produced, which is what the latency benchmark relies on.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def load(self, path: str):
+        """Open ``path``, stopping anything playing; playback starts with ``play``."""
+
+    @abstractmethod
+    def play(self):
+        """Start the loaded file from the beginning."""
+
+    @abstractmethod
+    def pause(self):
+        """Pause, keeping the position."""
+
+    @abstractmethod
+    def resume(self):
+        """Continue after ``pause``."""
+
+    @abstractmethod
+    def stop(self):
+        """Stop playback."""
+
+    @abstractmethod
+    def seek(self, seconds: float):
+        """Continue from ``seconds`` into the file."""
+
+    @abstractmethod
+    def position(self) -> float:
+        """Seconds into the loaded file."""
+
+    def set_seek_table(self, table: Optional[SeekTable]):
+        """Frame seek table for the loaded MP3, if the backend can use one."""
+
+    @abstractmethod
+    def is_playing(self) -> bool:
+        """True while audio is being produced (not paused or finished)."""
+
+    @abstractmethod
+    def set_volume(self, volume: float):
+        """Volume from 0.0 to 1.0."""
+
+    def close(self):
+        self.stop()
+
+
+class PygameBackend(AudioBackend):
+    """``pygame.mixer.music``, with a clock that survives seeks.
+
+    ``get_pos`` counts milliseconds since ``play`` and ignores seeks, so the
+    position is the last seek target plus the time played since then. Queries
+    made before anything was loaded don't open the audio device.
+
+    ``set_pos`` on an MP3 leaves the decoder to find the frame, which is slow
+    and approximate on long VBR files. With a seek table, a seek reopens the
+    file at the target frame's byte offset instead, and the clock restarts
+    from that frame's exact start time.
+    """
+
+    name = "pygame"
+
+    def __init__(self):
+        self._path = None
+        self._seek_table: Optional[SeekTable] = None
+        self._offset = 0.0
+        self._pos_at_seek = 0
+        self._paused = False
+
+    @property
+    def music(self):
+        return get_mixer().music
+
+    def load(self, path: str):
+        self.music.load(path)
+        self._path = path
+        self._seek_table = None
+        self._offset = 0.0
+        self._pos_at_seek = 0
+        self._paused = False
+
+    def play(self):
+        self.music.play()
+        self._offset = 0.0
+        self._pos_at_seek = 0
+        self._paused = False
+
+    def pause(self):
+        self.music.pause()
+        self._paused = True
+
+    def resume(self):
+        self.music.unpause()
+        self._paused = False
+
+    def stop(self):
+        if mixer_initialized():
+            self.music.stop()
+        self._paused = False
+
+    def seek(self, seconds: float):
+        if self._seek_table is None:
+            self.music.set_pos(seconds)
+            self._offset = seconds
+        else:
+            offset, self._offset = self._seek_table.locate(seconds)
+            self.music.load(FileSlice(self._path, offset), "mp3")
+            self.music.play()
+            if self._paused:
+                self.music.pause()
+        self._pos_at_seek = max(self.music.get_pos(), 0)
+
+    def set_seek_table(self, table: Optional[SeekTable]):
+        self._seek_table = table
+
+    def position(self) -> float:
+        if not mixer_initialized():
+            return 0.0
+        played = self.music.get_pos()
+        if played < 0:
+            return self._offset
+        return self._offset + (played - self._pos_at_seek) / 1000
+
+    def is_playing(self) -> bool:
+        return mixer_initialized() and self.music.get_busy() and not self._paused
+
+    def set_volume(self, volume: float):
+        self.music.set_volume(volume)
+
+
+class QtBackend(AudioBackend):
+    """``QMediaPlayer``/``QAudioOutput``; needs a running Qt event loop."""
+
+    name = "qt"
+
+    def __init__(self):
+        from PyQt6.QtMultimedia import QAudioOutput, QMediaPlayer
+
+        self._states = QMediaPlayer.PlaybackState
+        self.player = QMediaPlayer()
+        self.audio_output = QAudioOutput()
+        self.player.setAudioOutput(self.audio_output)
+
+    def load(self, path: str):
+        from PyQt6.QtCore import QUrl
+
+        self.player.setSource(QUrl.fromLocalFile(path))
+
+    def play(self):
+        self.player.play()
+
+    def pause(self):
+        self.player.pause()
+
+    def resume(self):
+        self.player.play()
+
+    def stop(self):
+        self.player.stop()
+
+    def seek(self, seconds: float):
+        self.player.setPosition(int(seconds * 1000))
+
+    def position(self) -> float:
+        return self.player.position() / 1000
+
+    def is_playing(self) -> bool:
+        return self.player.playbackState() == self._states.PlayingState
+
+    def set_volume(self, volume: float):
+        self.audio_output.setVolume(volume)
+
+    def close(self):
+        from PyQt6.QtCore import QUrl
+
+        self.player.stop()
+        self.player.setSource(QUrl())
+
+
+class SinkBackend(AudioBackend):
+    """Decodes in real time into a WAV file, or into nothing, with no audio device.
+
+    For headless machines and tests: a thread decodes ``block_frames`` at a
+    time with soundfile and paces itself against the wall clock, so position
+    and seek behave like a real output. ``sink_path=None`` discards the
+    samples (a null sink).
+    """
+
+    name = "sink"
+
+    def __init__(self, sink_path: Optional[str] = None, block_frames: int = 1024):
+        self.sink_path = sink_path
+        self.block_frames = block_frames
+        self.volume = 1.0
+        self._file = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._playing = False
+        self._stopping = False
+        self._frames_out = 0  # Frames of the file consumed, including seeks
+        self.seek_count = 0
+        self.output_seek_count = 0  # seek_count as of the last block written out
+
+    def load(self, path: str):
+        import soundfile as sf
+
+        self.stop()
+        self._file = sf.SoundFile(path)
+        self._frames_out = 0
+
+    def play(self):
+        if self._file is None:
+            return
+        with self._lock:
+            self._file.seek(0)
+            self._frames_out = 0
+        self._playing = True
+        self._start_thread()
+
+    def _start_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="audio-sink", daemon=True)
+            self._thread.start()
+        self._wake.set()
+
+    def _run(self):
+        import numpy as np
+
+        rate = self._file.samplerate
+        sink = None
+        if self.sink_path:
+            sink = wave.open(self.sink_path, "wb")
+            sink.setnchannels(self._file.channels)
+            sink.setsampwidth(2)
+            sink.setframerate(rate)
+        try:
+            clock = time.perf_counter()
+            while not self._stopping:
+                if not self._playing:
+                    self._wake.wait(0.05)
+                    self._wake.clear()
+                    clock = time.perf_counter()
+                    continue
+                with self._lock:
+                    block = self._file.read(self.block_frames, dtype="int16")
+                    if not len(block):
+                        self._playing = False
+                        continue
+                    self._frames_out = self._file.tell()
+                    seek_count = self.seek_count
+                if sink is not None:
+                    samples = (block * self.volume).astype(np.int16) if self.volume != 1.0 else block
+                    sink.writeframes(samples.tobytes())
+                self.output_seek_count = seek_count
+                # Pace output like a sound card would
+                clock += len(block) / rate
+                delay = clock - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+        finally:
+            if sink is not None:
+                sink.close()
+
+    def pause(self):
+        self._playing = False
+
+    def resume(self):
+        if self._file is not None:
+            self._playing = True
+            self._start_thread()
+
+    def stop(self):
+        self._stopping = True
+        self._playing = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def seek(self, seconds: float):
+        if self._file is None:
+            return
+        with self._lock:
+            frame = min(int(seconds * self._file.samplerate), self._file.frames)
+            self._file.seek(frame)
+            self._frames_out = frame
+            self.seek_count += 1
+
+    def position(self) -> float:
+        if self._file is None:
+            return 0.0
+        return self._frames_out / self._file.samplerate
+
+    def is_playing(self) -> bool:
+        return self._playing
+
+    def set_volume(self, volume: float):
+        self.volume = volume
+
+    def close(self):
+        self.stop()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+BACKENDS: Dict[str, Callable[[], AudioBackend]] = {
+    "pygame": PygameBackend,
+    "qt": QtBackend,
+    "sink": SinkBackend,
+}
+
+
+def create_backend(name: str) -> AudioBackend:
+    """Instantiate a backend by name ("pygame", "qt" or "sink")."""
+    try:
+        factory = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown audio backend {name!r}; expected one of {', '.join(BACKENDS)}")
+    return factory()
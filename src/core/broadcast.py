@@ -0,0 +1,228 @@
+import os
+import json
+import bisect
+import logging
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ITEM_SECONDS = 600  # Airtime assumed for media without a duration
+
+
+def parse_duration(value) -> Optional[int]:
+    """Seconds in an "HH:MM:SS" / "MM:SS" duration, or None."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        seconds = 0
+        for part in str(value).split(":"):
+            seconds = seconds * 60 + int(part)
+        return seconds or None
+    except ValueError:
+        return None
+
+
+def parse_clock(value: str) -> time:
+    """A schedule time such as "06:00" or "6:00 PM"."""
+    for fmt in ("%H:%M", "%I:%M %p"):
+        try:
+            return datetime.strptime(value.strip(), fmt).time()
+        except ValueError:
+            pass
+    raise ValueError(f"Unrecognised schedule time: {value!r}")
+
+
+class BroadcastEngine:
+    """Resolves what the vintage broadcast channel airs at any moment.
+
+    All schedule, block, special-event, playlist and tape-ID files are read
+    once by ``load``. A broadcast day runs from the first block's start time
+    to the same time the next day; it is laid out on first use as a sorted
+    list of airings (each block's media looped to fill its slot, special
+    events replacing the rest of the slot they start in) and cached, so
+    ``at``, ``now_playing`` and ``up_next`` are a binary search.
+    """
+
+    def __init__(self, data_dir: str = "data/tempRefData",
+                 broadcast_dir: str = "temp/ogJson/vintage-broadcast",
+                 item_seconds: int = DEFAULT_ITEM_SECONDS, cached_days: int = 4):
+        self.data_dir = Path(data_dir)
+        self.root = self.data_dir / broadcast_dir
+        self.item_seconds = item_seconds
+        self.cached_days = cached_days
+        self.blocks: List[Dict] = []
+        self.events: Dict[date, List[Dict]] = {}
+        self.tapes: Dict[str, Dict] = {}
+        self.programming: Dict[time, Dict] = {}
+        self.current: Optional[Dict] = None
+        self._days: "OrderedDict[date, tuple]" = OrderedDict()
+
+    def _read(self, path: Path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Could not read broadcast file %s: %s", path, e)
+            return None
+
+    def _playlist(self, files) -> List[Dict]:
+        """Media of one or more playlist files, in order, with tape IDs resolved."""
+        media = []
+        for name in [files] if isinstance(files, str) else files or []:
+            data = self._read(self.root / name) or {}
+            items = sorted(data.get("media", []), key=lambda item: item.get("order", 0))
+            for item in items:
+                entry = dict(item)
+                tape = self.tapes.get(item.get("tape_id"))
+                if tape:
+                    entry.update(tape)
+                entry["seconds"] = parse_duration(item.get("duration")) or self.item_seconds
+                media.append(entry)
+        return media
+
+    def load(self):
+        self.tapes = self._read(self.root / "tape_id_mapping.json") or {}
+
+        schedule = self._read(self.root / "schedule.json") or {}
+        self.blocks = sorted(({"start": parse_clock(block["time"]),
+                               "title": block.get("title"),
+                               "description": block.get("description"),
+                               "media": self._playlist(block.get("block_files"))}
+                              for block in schedule.get("blocks", [])),
+                             key=lambda block: block["start"])
+
+        self.events = {}
+        for event in (self._read(self.root / "special_events.json") or {}).get("events", []):
+            try:
+                day = date.fromisoformat(event["date"])
+                start = parse_clock(event["time"])
+            except (KeyError, ValueError) as e:
+                logger.warning("Skipping special event %r: %s", event.get("title"), e)
+                continue
+            files = event.get("playlist_file") or event.get("block_files")
+            self.events.setdefault(day, []).append({
+                "start": datetime.combine(day, start), "title": event.get("title"),
+                "description": event.get("description"), "media": self._playlist(files)})
+
+        # Programming notes per slot, keyed by the slot's start time
+        self.programming = {}
+        for slot in (self._read(self.data_dir / "broadcast_schedule.json") or {}).values():
+            try:
+                self.programming[parse_clock(slot["time_slot"].split("-")[0])] = slot
+            except (KeyError, ValueError):
+                continue
+        self.current = self._read(self.data_dir / "current_broadcast.json")
+        self._days.clear()
+        return self
+
+    def broadcast_day(self, when: datetime) -> date:
+        """The broadcast day ``when`` falls in (early hours belong to the previous day)."""
+        if self.blocks and when.time() < self.blocks[0]["start"]:
+            return when.date() - timedelta(days=1)
+        return when.date()
+
+    def _slots(self, day: date) -> List[tuple]:
+        """(start, end, block) slots of a broadcast day, with special events cut in."""
+        starts = [datetime.combine(day, block["start"]) for block in self.blocks]
+        ends = starts[1:] + [starts[0] + timedelta(days=1)]
+        slots = []
+        events = sorted(self.events.get(day, []) + self.events.get(day + timedelta(days=1), []),
+                        key=lambda event: event["start"])
+        for start, end, block in zip(starts, ends, self.blocks):
+            cut = [event for event in events if start <= event["start"] < end]
+            if cut:
+                if cut[0]["start"] > start:
+                    slots.append((start, cut[0]["start"], block))
+                bounds = [event["start"] for event in cut[1:]] + [end]
+                slots += [(event["start"], bound, dict(event, special=True))
+                          for event, bound in zip(cut, bounds)]
+            else:
+                slots.append((start, end, block))
+        return slots
+
+    def _day(self, day: date) -> tuple:
+        """Sorted airing start times and airings of a broadcast day (cached)."""
+        cached = self._days.get(day)
+        if cached is not None:
+            self._days.move_to_end(day)
+            return cached
+        airings = []
+        for slot_start, slot_end, block in self._slots(day):
+            media = block["media"] or [{"title": block["title"],
+                                         "seconds": (slot_end - slot_start).total_seconds()}]
+            programming = self.programming.get(slot_start.time()) if not block.get("special") else None
+            start, i = slot_start, 0
+            while start < slot_end:
+                item = media[i % len(media)]
+                end = min(start + timedelta(seconds=max(item["seconds"], 1)), slot_end)
+                airings.append({
+                    "start": start, "end": end, "title": item.get("title"),
+                    "file": item.get("file"), "thumbnail": item.get("thumbnail"),
+                    "tape_id": item.get("tape_id"), "block": block["title"],
+                    "description": block.get("description"),
+                    "special": bool(block.get("special")), "programming": programming})
+                start, i = end, i + 1
+        cached = ([airing["start"] for airing in airings], airings)
+        self._days[day] = cached
+        while len(self._days) > self.cached_days:
+            self._days.popitem(last=False)
+        return cached
+
+    def schedule(self, day: date) -> List[Dict]:
+        """Every airing of broadcast day ``day``, in order."""
+        return list(self._day(day)[1]) if self.blocks else []
+
+    def at(self, when: datetime) -> Optional[Dict]:
+        """The airing on at ``when``."""
+        if not self.blocks:
+            return None
+        starts, airings = self._day(self.broadcast_day(when))
+        i = bisect.bisect_right(starts, when) - 1
+        return airings[i] if i >= 0 else None
+
+    def now_playing(self, now: Optional[datetime] = None) -> Optional[Dict]:
+        return self.at(now or datetime.now())
+
+    def up_next(self, now: Optional[datetime] = None, count: int = 1) -> List[Dict]:
+        """The next ``count`` airings after the one on at ``now``."""
+        if not self.blocks:
+            return []
+        now = now or datetime.now()
+        day = self.broadcast_day(now)
+        starts, airings = self._day(day)
+        i = bisect.bisect_right(starts, now)
+        upcoming = airings[i:i + count]
+        while len(upcoming) < count:
+            day += timedelta(days=1)
+            upcoming += self._day(day)[1][:count - len(upcoming)]
+        return upcoming
+
+    def publish_current(self, path: Optional[str] = None, now: Optional[datetime] = None) -> bool:
+        """Write the programming of the current slot to current_broadcast.json if it changed."""
+        airing = self.now_playing(now)
+        programming = airing and airing["programming"]
+        if not programming or programming == self.current:
+            return False
+        path = path or str(self.data_dir / "current_broadcast.json")
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(programming, f)
+        os.replace(tmp, path)
+        self.current = programming
+        return True
+
+
+if __name__ == "__main__":
+    import sys
+    logging.basicConfig(level=logging.INFO)
+    engine = BroadcastEngine().load()
+    now = datetime.now()
+    if "--publish" in sys.argv and engine.publish_current(now=now):
+        print("Updated current_broadcast.json")
+    for label, airing in [("Now", engine.now_playing(now))] + [("Next", a) for a in engine.up_next(now, 3)]:
+        if airing:
+            print(f"{label:5} {airing['start']:%a %H:%M}-{airing['end']:%H:%M}  "
+                  f"[{airing['block']}] {airing['title']}")
@@ -0,0 +1,325 @@
+import os
+import json
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _item(kind, item_id, data, title=None, artist=None, genre=None, description=None,
+          media_url=None, image=None) -> Dict:
+    return {"kind": kind, "item_id": str(item_id), "title": title, "artist": artist,
+            "genre": genre, "description": description, "media_url": media_url,
+            "image": image, "data": data}
+
+
+def _id(entry: Dict, index: int):
+    """An entry's ``id``, or its position in its list for entries without one."""
+    item_id = entry.get("id")
+    return f"#{index}" if item_id is None else item_id
+
+
+def _music_library(data) -> Iterator[Dict]:
+    for i, song in enumerate(data.get("music_library", [])):
+        yield _item("song", _id(song, i), song, song.get("songTitle"), song.get("artist"),
+                    media_url=song.get("mp3url"), image=song.get("thumbnail") or song.get("coverArt"))
+    for i, playlist in enumerate(data.get("playlists", [])):
+        yield _item("playlist", _id(playlist, i), playlist, playlist.get("title"),
+                    description=playlist.get("description"), image=playlist.get("coverImage"))
+
+
+def _podcasts_library(data) -> Iterator[Dict]:
+    for i, podcast in enumerate(data.get("podcasts", [])):
+        yield _item("podcast", _id(podcast, i), podcast, podcast.get("title"), podcast.get("host"),
+                    media_url=podcast.get("mp3url"), image=podcast.get("cover_art"))
+    for i, category in enumerate(data.get("categories", [])):
+        yield _item("category", _id(category, i), category, category.get("label"))
+
+
+def _ref_music(data) -> Iterator[Dict]:
+    for i, artist in enumerate(data.get("artists", [])):
+        yield _item("artist", _id(artist, i), artist, artist.get("name"), artist.get("name"),
+                    " ".join(artist.get("genres", [])), artist.get("bio"), image=artist.get("image"))
+    for i, album in enumerate(data.get("albums", [])):
+        yield _item("album", _id(album, i), album, album.get("title"), album.get("artist"),
+                    album.get("genre"), image=album.get("coverArt"))
+        for j, track in enumerate(album.get("tracks", [])):
+            yield _item("album_track", f"{_id(album, i)}:{_id(track, j)}", track, track.get("title"),
+                        album.get("artist"), album.get("genre"), media_url=track.get("mp3url"),
+                        image=album.get("coverArt"))
+    for i, song in enumerate(data.get("songs", [])):
+        yield _item("song", _id(song, i), song, song.get("title"), song.get("artist"),
+                    song.get("genre"), media_url=song.get("mp3url"), image=song.get("coverArt"))
+    for i, playlist in enumerate(data.get("playlists", [])):
+        yield _item("playlist", _id(playlist, i), playlist, playlist.get("title"), playlist.get("curator"),
+                    description=playlist.get("description"), image=playlist.get("coverImage"))
+    for key, kind in (("categories", "category"), ("genres", "genre")):
+        for i, entry in enumerate(data.get(key, [])):
+            yield _item(kind, _id(entry, i), entry, entry.get("name"),
+                        description=entry.get("description"), image=entry.get("image"))
+
+
+def _artists(data) -> Iterator[Dict]:
+    for i, artist in enumerate(data.get("artists", [])):
+        works = [work.get("title", "") for work in artist.get("discography", [])]
+        yield _item("artist", _id(artist, i), artist, artist.get("name"), artist.get("name"),
+                    artist.get("genre"), " ".join([artist.get("bio") or ""] + works),
+                    image=artist.get("image_url"))
+
+
+def _tv_channels(data) -> Iterator[Dict]:
+    for i, channel in enumerate(data.get("channels", [])):
+        yield _item("channel", _id(channel, i), channel, channel.get("name"),
+                    description=channel.get("description"), image=channel.get("thumbnail"))
+        for j, video in enumerate(channel.get("content", [])):
+            yield _item("video", f"{_id(channel, i)}:{_id(video, j)}", video, video.get("title"),
+                        channel.get("name"), media_url=video.get("src"), image=video.get("thumbnail"))
+
+
+def _radio_play(data) -> Iterator[Dict]:
+    for i, song in enumerate(data.get("songs", [])):
+        yield _item("song", _id(song, i), song, song.get("songTitle"), song.get("artist"),
+                    media_url=song.get("mp3url"), image=song.get("thumbnail") or song.get("coverArt"))
+
+
+def _media_collection(data) -> Iterator[Dict]:
+    for i, video in enumerate(data):
+        yield _item("video", _id(video, i), video, video.get("display_title"), video.get("artist"),
+                    media_url=video.get("mp4_link"), image=video.get("thumbnail_link"))
+
+
+def _podcast_collection(data) -> Iterator[Dict]:
+    for i, episode in enumerate(data.get("podcasts", [])):
+        yield _item("podcast", _id(episode, i), episode, episode.get("title"),
+                    description=episode.get("description"), media_url=episode.get("mp3url"),
+                    image=episode.get("thumbnail"))
+
+
+# Source name -> (path relative to the data directory, extractor)
+SOURCES: Dict[str, tuple] = {
+    "music_library": ("music_library.json", _music_library),
+    "podcasts_library": ("podcasts_library.json", _podcasts_library),
+    "ref_music": ("tempRefData/music.json", _ref_music),
+    "artists": ("tempRefData/artists.json", _artists),
+    "tv_channels": ("tempRefData/tv_channels.json", _tv_channels),
+    "radio_play": ("tempRefData/temp/ogJson/radioPlay.json", _radio_play),
+    "media_collection": ("tempRefData/temp/ogJson/mediaCollection.json", _media_collection),
+    "podcast_collection": ("tempRefData/temp/ogJson/podcastCollection.json", _podcast_collection),
+}
+
+ITEM_COLUMNS = ("kind", "item_id", "title", "artist", "genre", "description", "media_url", "image")
+
+
+class Catalog:
+    """The JSON catalogs compiled into indexed SQLite tables with an FTS5 index.
+
+    ``refresh`` re-ingests only sources whose size or mtime changed since
+    the last run, one transaction per source. Items keep their original
+    JSON in ``data`` and their order in ``position``, so callers get back
+    exactly what the file held without parsing the whole file.
+    """
+
+    def __init__(self, db_path: str = "data/tempRefData/ahoy.db", data_dir: str = "data",
+                 sources: Optional[Dict[str, tuple]] = None):
+        self.data_dir = Path(data_dir)
+        self.sources = sources if sources is not None else SOURCES
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._create_tables()
+
+    def _create_tables(self):
+        row = self._conn.execute("SELECT sql FROM sqlite_master WHERE name = 'catalog_items'").fetchone()
+        if row is not None and "UNIQUE(source, kind, item_id)" in row["sql"]:
+            # Older databases dropped entries that share an id; the tables only
+            # mirror the JSON, so rebuild them and let refresh() re-ingest
+            with self._conn:
+                self._conn.executescript("""
+                    DROP TABLE IF EXISTS catalog_fts;
+                    DROP TABLE catalog_items;
+                    DELETE FROM catalog_sources;
+                """)
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS catalog_sources (
+                    source TEXT PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    item_count INTEGER NOT NULL,
+                    ingested_at TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS catalog_items (
+                    id INTEGER PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    item_id TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    title TEXT,
+                    artist TEXT,
+                    genre TEXT,
+                    description TEXT,
+                    media_url TEXT,
+                    image TEXT,
+                    data TEXT NOT NULL,
+                    UNIQUE(source, position)
+                );
+                CREATE INDEX IF NOT EXISTS idx_catalog_items_source ON catalog_items(source, kind, position);
+                CREATE INDEX IF NOT EXISTS idx_catalog_items_item ON catalog_items(source, kind, item_id);
+                CREATE INDEX IF NOT EXISTS idx_catalog_items_kind ON catalog_items(kind);
+                CREATE INDEX IF NOT EXISTS idx_catalog_items_artist ON catalog_items(artist);
+                CREATE INDEX IF NOT EXISTS idx_catalog_items_media_url ON catalog_items(media_url);
+            """)
+        try:
+            with self._conn:
+                self._conn.executescript("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS catalog_fts USING fts5(
+                        title, artist, genre, description,
+                        content='catalog_items', content_rowid='id',
+                        tokenize='unicode61 remove_diacritics 2'
+                    );
+                    CREATE TRIGGER IF NOT EXISTS catalog_items_ai AFTER INSERT ON catalog_items BEGIN
+                        INSERT INTO catalog_fts(rowid, title, artist, genre, description)
+                        VALUES (new.id, new.title, new.artist, new.genre, new.description);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS catalog_items_ad AFTER DELETE ON catalog_items BEGIN
+                        INSERT INTO catalog_fts(catalog_fts, rowid, title, artist, genre, description)
+                        VALUES ('delete', old.id, old.title, old.artist, old.genre, old.description);
+                    END;
+                """)
+            self.fts_enabled = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: search falls back to LIKE
+            logger.warning("FTS5 unavailable; catalog search will use LIKE")
+            self.fts_enabled = False
+
+    def refresh(self) -> List[str]:
+        """Re-ingest sources whose files changed; returns the names of those sources."""
+        refreshed = []
+        for source, (relative_path, extractor) in self.sources.items():
+            path = self.data_dir / relative_path
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            with self._lock:
+                row = self._conn.execute("SELECT size, mtime_ns FROM catalog_sources WHERE source = ?",
+                                         (source,)).fetchone()
+            if row is not None and row["size"] == stat.st_size and row["mtime_ns"] == stat.st_mtime_ns:
+                continue
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning("Skipping catalog source %s: %s", path, e)
+                continue
+            try:
+                count = self._ingest(source, str(relative_path), stat, extractor(data))
+            except (AttributeError, KeyError, TypeError) as e:
+                # Malformed entries; the source's previous rows stay until the file is fixed
+                logger.warning("Skipping catalog source %s: unexpected entry (%r)", path, e)
+                continue
+            logger.info("Catalog: ingested %d items from %s", count, relative_path)
+            refreshed.append(source)
+        return refreshed
+
+    def _ingest(self, source: str, relative_path: str, stat, items: Iterable[Dict]) -> int:
+        count = 0
+        seen = set()
+        duplicates = 0
+        columns = ("source", "position") + ITEM_COLUMNS + ("data",)
+        sql = (f"INSERT INTO catalog_items ({', '.join(columns)}) "
+               f"VALUES ({', '.join('?' for _ in columns)})")
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM catalog_items WHERE source = ?", (source,))
+            for position, item in enumerate(items):
+                key = (item["kind"], item["item_id"])
+                if key in seen:
+                    duplicates += 1
+                seen.add(key)
+                self._conn.execute(sql, (source, position) + tuple(item[c] for c in ITEM_COLUMNS)
+                                   + (json.dumps(item["data"]),))
+                count += 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO catalog_sources (source, path, size, mtime_ns, item_count, ingested_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (source, relative_path, stat.st_size, stat.st_mtime_ns, count, datetime.now().isoformat()))
+        if duplicates:
+            logger.warning("Catalog source %s: %d entries reuse an id; get() returns the first of each",
+                           relative_path, duplicates)
+        return count
+
+    def _query(self, sql: str, params=()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def items(self, source: str, kind: Optional[str] = None) -> List[Dict]:
+        """The original JSON objects of a source, in file order."""
+        if kind is None:
+            rows = self._query("SELECT data FROM catalog_items WHERE source = ? ORDER BY kind, position",
+                               (source,))
+        else:
+            rows = self._query("SELECT data FROM catalog_items WHERE source = ? AND kind = ? "
+                               "ORDER BY position", (source, kind))
+        return [json.loads(row["data"]) for row in rows]
+
+    def get(self, source: str, kind: str, item_id) -> Optional[Dict]:
+        rows = self._query("SELECT data FROM catalog_items WHERE source = ? AND kind = ? AND item_id = ? "
+                           "ORDER BY position LIMIT 1", (source, kind, str(item_id)))
+        return json.loads(rows[0]["data"]) if rows else None
+
+    def find_by_media_url(self, url: str) -> List[Dict]:
+        """Every catalog entry (any source) that plays ``url``."""
+        rows = self._query("SELECT source, kind, item_id, data FROM catalog_items WHERE media_url = ?",
+                           (url,))
+        return [self._row_result(row) for row in rows]
+
+    def search(self, query: str, kinds: Optional[Iterable[str]] = None, limit: int = 50) -> List[Dict]:
+        """Full-text search over titles, artists, genres and descriptions, best matches first.
+
+        Every word must match; the last one also matches as a prefix, so
+        results can be shown while the user is still typing.
+        """
+        words = query.split()
+        if not words:
+            return []
+        kinds = list(kinds) if kinds else []
+        kind_filter = f" AND i.kind IN ({', '.join('?' for _ in kinds)})" if kinds else ""
+        if self.fts_enabled:
+            terms = ['"' + word.replace('"', '""') + '"' for word in words]
+            terms[-1] += "*"
+            rows = self._query(
+                "SELECT i.source, i.kind, i.item_id, i.data FROM catalog_fts f "
+                "JOIN catalog_items i ON i.id = f.rowid "
+                f"WHERE catalog_fts MATCH ?{kind_filter} ORDER BY bm25(catalog_fts, 10.0, 5.0, 2.0, 1.0) "
+                "LIMIT ?", [" ".join(terms)] + kinds + [limit])
+        else:
+            conditions = " AND ".join(
+                "(i.title LIKE ? OR i.artist LIKE ? OR i.genre LIKE ? OR i.description LIKE ?)"
+                for _ in words)
+            params = [f"%{word}%" for word in words for _ in range(4)]
+            rows = self._query(
+                f"SELECT i.source, i.kind, i.item_id, i.data FROM catalog_items i "
+                f"WHERE {conditions}{kind_filter} LIMIT ?", params + kinds + [limit])
+        return [self._row_result(row) for row in rows]
+
+    @staticmethod
+    def _row_result(row) -> Dict:
+        return {"source": row["source"], "kind": row["kind"], "item_id": row["item_id"],
+                "data": json.loads(row["data"])}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    catalog = Catalog(os.getenv("AHOY_CATALOG_DB", "data/tempRefData/ahoy.db"))
+    refreshed = catalog.refresh()
+    print(f"Refreshed {len(refreshed)} source(s): {', '.join(refreshed) or 'none'}")
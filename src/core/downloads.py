@@ -0,0 +1,445 @@
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024  # Network reads; writes are batched through WRITE_BUFFER
+WRITE_BUFFER = 1024 * 1024
+PROGRESS_INTERVAL = 0.1  # Seconds between progress signals per job
+BATCH_STATS_INTERVAL = 0.5  # Seconds between stats signals per batch
+SAVE_INTERVAL = 2.0  # Seconds between queue file writes while jobs finish
+
+# Job states; queued and active jobs are resumed after a restart
+QUEUED, ACTIVE, DONE, FAILED, CANCELLED = "queued", "active", "done", "failed", "cancelled"
+
+
+class DownloadCancelled(Exception):
+    pass
+
+
+class DownloadBatch:
+    """A group of jobs downloaded together, e.g. a whole playlist or the library.
+
+    At most ``max_parallel`` of its jobs are handed to the worker pool at a
+    time; the rest wait here, so a huge batch doesn't flood the pool's queue.
+    """
+
+    def __init__(self, batch_id: str, label: str = "", max_parallel: int = 3, skipped: int = 0):
+        self.id = batch_id
+        self.label = label
+        self.max_parallel = max_parallel
+        self.job_ids: List[str] = []
+        self.waiting = deque()
+        self.running = set()
+        self.done = 0
+        self.skipped = skipped
+        self.failures: List[Tuple[str, str]] = []  # (url, error)
+        self.started = time.monotonic()
+        self.last_emit = 0.0
+
+    @property
+    def complete(self) -> bool:
+        return not self.waiting and not self.running
+
+    def stats(self, jobs: Dict[str, Dict]) -> Dict:
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        received = sum(jobs[job_id]["received"] for job_id in self.job_ids)
+        expected = sum(jobs[job_id]["expected"] for job_id in self.job_ids)
+        finished = self.done + len(self.failures)
+        remaining = len(self.job_ids) - finished
+        bytes_per_s = received / elapsed
+        items_per_s = finished / elapsed
+        if remaining == 0:
+            eta = 0.0
+        elif items_per_s > 0:
+            eta = remaining / items_per_s
+        elif bytes_per_s > 0 and expected > received:
+            eta = (expected - received) / bytes_per_s
+        else:
+            eta = None
+        return {
+            "batch_id": self.id, "label": self.label,
+            "total": len(self.job_ids) + self.skipped, "queued": len(self.job_ids),
+            "done": self.done, "failed": len(self.failures), "skipped": self.skipped,
+            "failures": list(self.failures), "bytes": received, "elapsed": elapsed,
+            "mb_per_s": bytes_per_s / (1024 * 1024), "items_per_s": items_per_s,
+            "eta": eta, "complete": self.complete,
+        }
+
+
+class DownloadManager(QObject):
+    """Downloads files on a bounded worker pool over one pooled HTTP session.
+
+    Each job writes to ``<path>.part`` through a large buffer and resumes
+    from it with an HTTP Range request after a failure or restart; the file
+    only gets its final name once its size matches Content-Length. A job
+    with a ``source`` file (e.g. in the media cache) copies it on the worker
+    instead, falling back to the URL if the file has gone. Jobs are kept in
+    ``queue_file`` so unfinished ones carry on after a restart.
+    """
+
+    job_progress = pyqtSignal(str, 'qint64', 'qint64')  # Job id, bytes received, bytes expected (0 if unknown)
+    progress = pyqtSignal('qint64', 'qint64')  # Bytes received, bytes expected over the current run
+    finished = pyqtSignal(str, str)  # Job id, local path
+    failed = pyqtSignal(str, str)  # Job id, error message
+    batch_progress = pyqtSignal(str, dict)  # Batch id, DownloadBatch.stats()
+    batch_finished = pyqtSignal(str, dict)
+
+    def __init__(self, queue_file: str = "downloads/queue.json", max_workers: int = 3,
+                 retries: int = 3, parent=None):
+        super().__init__(parent)
+        self.queue_file = Path(queue_file)
+        self.max_workers = max_workers
+        self.retries = retries
+        self._lock = threading.RLock()
+        self._stopping = threading.Event()
+        self._session = None
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="download")
+        self.jobs: Dict[str, Dict] = self._load_queue()
+        # Jobs counted in aggregate progress; reset whenever the queue drains
+        self._run_ids = set()
+        self.batches: Dict[str, DownloadBatch] = {}
+        self._last_save = 0.0
+
+    @property
+    def session(self):
+        """Shared ``requests.Session`` whose connection pool fits every worker."""
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                self._session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.max_workers,
+                                      pool_maxsize=self.max_workers)
+                self._session.mount("http://", adapter)
+                self._session.mount("https://", adapter)
+            return self._session
+
+    def _load_queue(self) -> Dict[str, Dict]:
+        if not self.queue_file.exists():
+            return {}
+        try:
+            with open(self.queue_file, 'r') as f:
+                jobs = json.load(f)
+        except json.JSONDecodeError:
+            return {}
+        for job in jobs.values():
+            if job["status"] == ACTIVE:
+                job["status"] = QUEUED
+        return jobs
+
+    def _save_queue(self, force: bool = True):
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_save < SAVE_INTERVAL:
+                return
+            self._last_save = now
+            pending = {job_id: job for job_id, job in self.jobs.items()
+                       if job["status"] in (QUEUED, ACTIVE, FAILED)}
+            self.queue_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.queue_file.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(pending, f)
+            os.replace(tmp_file, self.queue_file)
+
+    def resume(self):
+        """Restart jobs left queued or active by a previous session."""
+        with self._lock:
+            queued = [job for job in self.jobs.values() if job["status"] == QUEUED]
+            for job in queued:
+                batch_id = job.get("batch_id")
+                if batch_id and batch_id not in self.batches:
+                    self.batches[batch_id] = DownloadBatch(batch_id, job.get("batch_label", ""),
+                                                           max_parallel=self.max_workers)
+                if batch_id:
+                    self.batches[batch_id].job_ids.append(job["id"])
+                    self.batches[batch_id].waiting.append(job["id"])
+            batches = list(self.batches.values())
+        for job in queued:
+            if not job.get("batch_id"):
+                self._submit(job["id"])
+        for batch in batches:
+            self._fill_batch(batch)
+
+    def _submit(self, job_id: str):
+        with self._lock:
+            self._run_ids.add(job_id)
+        self._executor.submit(self._run, job_id)
+
+    def enqueue(self, url: str, path: str, batch_id: Optional[str] = None) -> str:
+        """Queue ``url`` for download to ``path``; returns the job id.
+
+        A path that is already queued or downloading returns the existing job.
+        """
+        with self._lock:
+            for job in self.jobs.values():
+                if job["path"] == path and job["status"] in (QUEUED, ACTIVE):
+                    return job["id"]
+            job_id = uuid.uuid4().hex[:12]
+            self.jobs[job_id] = {
+                "id": job_id, "url": url, "path": path, "batch_id": batch_id,
+                "status": QUEUED, "received": 0, "expected": 0, "error": None,
+            }
+            self._save_queue()
+        self._submit(job_id)
+        return job_id
+
+    def enqueue_batch(self, items: Iterable[Tuple], batch_id: Optional[str] = None,
+                      label: str = "", max_parallel: Optional[int] = None) -> str:
+        """Queue (url, path) or (url, path, source) items as one batch; returns the batch id.
+
+        Items whose path already exists, or that are already queued, are
+        counted as skipped rather than downloaded again. Items with a local
+        ``source`` file are copied from it rather than downloaded.
+        """
+        batch_id = batch_id or uuid.uuid4().hex[:8]
+        batch = DownloadBatch(batch_id, label, max_parallel or self.max_workers)
+        with self._lock:
+            queued_paths = {job["path"] for job in self.jobs.values()
+                            if job["status"] in (QUEUED, ACTIVE)}
+            for url, path, *source in items:
+                if path in queued_paths or os.path.exists(path):
+                    batch.skipped += 1
+                    continue
+                queued_paths.add(path)
+                job_id = uuid.uuid4().hex[:12]
+                self.jobs[job_id] = {
+                    "id": job_id, "url": url, "path": path, "batch_id": batch_id,
+                    "batch_label": label, "source": source[0] if source else None,
+                    "status": QUEUED, "received": 0, "expected": 0, "error": None,
+                }
+                batch.job_ids.append(job_id)
+                batch.waiting.append(job_id)
+            self.batches[batch_id] = batch
+            self._save_queue()
+        if batch.complete:
+            self._end_batch(batch)
+        else:
+            self._fill_batch(batch)
+            self._emit_batch(batch, force=True)
+        return batch_id
+
+    def batch_stats(self, batch_id: str) -> Optional[Dict]:
+        with self._lock:
+            batch = self.batches.get(batch_id)
+            return batch.stats(self.jobs) if batch else None
+
+    def _fill_batch(self, batch: DownloadBatch):
+        with self._lock:
+            ready = []
+            while batch.waiting and len(batch.running) < batch.max_parallel:
+                job_id = batch.waiting.popleft()
+                batch.running.add(job_id)
+                ready.append(job_id)
+        for job_id in ready:
+            self._submit(job_id)
+
+    def _job_ended(self, job: Dict):
+        """Update the job's batch, start its next job, and report on it."""
+        batch = self.batches.get(job.get("batch_id"))
+        if batch is None:
+            return
+        with self._lock:
+            batch.running.discard(job["id"])
+            if job["status"] == DONE:
+                batch.done += 1
+            elif job["status"] == FAILED:
+                batch.failures.append((job["url"], job["error"]))
+        if batch.complete:
+            self._end_batch(batch)
+        else:
+            self._fill_batch(batch)
+            self._emit_batch(batch, force=True)
+
+    def _end_batch(self, batch: DownloadBatch):
+        with self._lock:
+            if self.batches.pop(batch.id, None) is None:
+                return
+            stats = batch.stats(self.jobs)
+            self._save_queue()
+        logger.info("Batch %s (%s): %d downloaded, %d skipped, %d failed in %.1fs (%.2f MB/s)",
+                    batch.id, batch.label, stats["done"], stats["skipped"], stats["failed"],
+                    stats["elapsed"], stats["mb_per_s"])
+        self.batch_finished.emit(batch.id, stats)
+
+    def _emit_batch(self, batch: DownloadBatch, force: bool = False):
+        now = time.monotonic()
+        if not force and now - batch.last_emit < BATCH_STATS_INTERVAL:
+            return
+        batch.last_emit = now
+        with self._lock:
+            stats = batch.stats(self.jobs)
+        self.batch_progress.emit(batch.id, stats)
+
+    def cancel(self, job_id: str):
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is not None and job["status"] in (QUEUED, ACTIVE):
+                job["status"] = CANCELLED
+                self._save_queue()
+
+    def retry_failed(self):
+        with self._lock:
+            failed = [job for job in self.jobs.values() if job["status"] == FAILED]
+            for job in failed:
+                job["status"], job["error"] = QUEUED, None
+            self._save_queue()
+        for job in failed:
+            self._submit(job["id"])
+
+    def pending_jobs(self) -> List[Dict]:
+        with self._lock:
+            return [dict(job) for job in self.jobs.values() if job["status"] in (QUEUED, ACTIVE)]
+
+    def is_idle(self) -> bool:
+        return not self.pending_jobs()
+
+    def totals(self):
+        """(bytes received, bytes expected) over the jobs started since the queue was last empty."""
+        with self._lock:
+            jobs = [self.jobs[job_id] for job_id in self._run_ids]
+            return sum(job["received"] for job in jobs), sum(job["expected"] for job in jobs)
+
+    def shutdown(self):
+        """Stop workers after their current chunk; partial files are kept for resuming."""
+        self._stopping.set()
+        self._executor.shutdown(wait=False)
+        self._save_queue()
+
+    def _run(self, job_id: str):
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or self._stopping.is_set():
+                return
+            if job["status"] != QUEUED:
+                if job["status"] == CANCELLED:
+                    self._job_ended(job)
+                return
+            job["status"] = ACTIVE
+        for attempt in range(self.retries + 1):
+            try:
+                self._download(job)
+            except DownloadCancelled:
+                if self._stopping.is_set():
+                    return
+                if os.path.exists(job["path"] + ".part"):
+                    os.remove(job["path"] + ".part")
+                self._job_ended(job)
+                self._finish_run()
+                return
+            except Exception as e:
+                if self._stopping.is_set():
+                    return
+                if attempt < self.retries:
+                    logger.info("Download of %s failed (%s), resuming", job["url"], e)
+                    time.sleep(min(2 ** attempt, 10))
+                    continue
+                with self._lock:
+                    job["status"], job["error"] = FAILED, str(e)
+                    self._save_queue(force=False)
+                self.failed.emit(job_id, str(e))
+                self._job_ended(job)
+                self._finish_run()
+                return
+            with self._lock:
+                job["status"] = DONE
+                self._save_queue(force=False)
+            self.finished.emit(job_id, job["path"])
+            self._job_ended(job)
+            self._finish_run()
+            return
+
+    def _check_running(self, job: Dict):
+        if self._stopping.is_set() or job["status"] == CANCELLED:
+            raise DownloadCancelled()
+
+    def _download(self, job: Dict):
+        self._check_running(job)
+        path = job["path"]
+        part_path = path + ".part"
+        if os.path.exists(path) and not os.path.exists(part_path):
+            return  # Finished before the queue file last caught up
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        source = job.get("source")
+        if source and os.path.exists(source):
+            self._copy(job, source, part_path)
+            os.replace(part_path, path)
+            return
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+        with self.session.get(job["url"], stream=True, timeout=(10, 30), headers=headers) as response:
+            if response.status_code == 416 and offset and offset == job["expected"]:
+                # The part file is already complete
+                os.replace(part_path, path)
+                return
+            response.raise_for_status()
+            if offset and response.status_code != 206:
+                offset = 0  # Server ignored the Range header: start over
+            length = response.headers.get("content-length")
+            expected = offset + int(length) if length is not None else 0
+            with self._lock:
+                job["received"], job["expected"] = offset, expected
+
+            received = offset
+            last_emit = 0.0
+            with open(part_path, 'ab' if offset else 'wb', buffering=WRITE_BUFFER) as f:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    self._check_running(job)
+                    f.write(chunk)
+                    received += len(chunk)
+                    job["received"] = received
+                    now = time.monotonic()
+                    if now - last_emit >= PROGRESS_INTERVAL:
+                        last_emit = now
+                        self.job_progress.emit(job["id"], received, expected)
+                        self._emit_totals()
+                        batch = self.batches.get(job.get("batch_id"))
+                        if batch is not None:
+                            self._emit_batch(batch)
+
+        if expected and received != expected:
+            raise IOError(f"Incomplete download: {received} of {expected} bytes")
+        os.replace(part_path, path)
+        self.job_progress.emit(job["id"], received, received)
+
+    def _copy(self, job: Dict, source: str, part_path: str):
+        """Copy a local file into ``part_path``, reporting progress like a download."""
+        expected = os.path.getsize(source)
+        with self._lock:
+            job["received"], job["expected"] = 0, expected
+        received = 0
+        with open(source, 'rb') as src, open(part_path, 'wb') as dst:
+            while True:
+                self._check_running(job)
+                chunk = src.read(WRITE_BUFFER)
+                if not chunk:
+                    break
+                dst.write(chunk)
+                received += len(chunk)
+                job["received"] = received
+        self.job_progress.emit(job["id"], received, expected)
+
+    def _emit_totals(self):
+        self.progress.emit(*self.totals())
+
+    def _finish_run(self):
+        """Report progress after a job ends, and start a new run once nothing is left."""
+        with self._lock:
+            if not self._run_ids:
+                return  # Another worker already closed this run
+            totals = self.totals()
+            if not any(self.jobs[job_id]["status"] in (QUEUED, ACTIVE) for job_id in self._run_ids):
+                self._run_ids.clear()
+        self.progress.emit(*totals)
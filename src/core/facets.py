@@ -0,0 +1,98 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# Set bits per byte, for numpy versions without np.bitwise_count
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+Selections = Dict[str, Iterable[str]]
+
+
+def popcount(mask: np.ndarray) -> int:
+    """Number of set bits in a packed bitmap."""
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(mask).sum())
+    return int(_POPCOUNT[mask].sum())
+
+
+class FacetIndex:
+    """Facet filtering over a fixed list of documents.
+
+    Each facet value keeps a packed bitmap of the documents carrying it
+    (one bit per document), built once. A selection ORs the chosen values
+    within a facet and ANDs across facets, so evaluating any combination is
+    a handful of bitwise operations over ``n / 8`` bytes. Counts follow the
+    usual multi-select rule: a facet's counts ignore that facet's own
+    selection, so the other values stay clickable.
+    """
+
+    def __init__(self):
+        self.facets: Dict[str, Dict[str, np.ndarray]] = {}
+        self._count = 0
+        self._all = np.zeros(0, dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def build(self, docs: Sequence[Any], facets: Dict[str, Callable[[Any], Iterable[str]]],
+              values: Optional[Dict[str, Iterable[str]]] = None):
+        """Index ``docs``; ``facets`` maps a facet name to a function giving a document's values.
+
+        ``values`` optionally lists values to keep per facet even when no
+        document carries them (e.g. declared categories), in display order.
+        """
+        self._count = len(docs)
+        self._all = np.packbits(np.ones(self._count, dtype=bool))
+        self.facets = {}
+        for name, extract in facets.items():
+            postings: Dict[str, List[int]] = {value: [] for value in (values or {}).get(name, ())}
+            for doc_id, doc in enumerate(docs):
+                for value in set(extract(doc) or ()):
+                    postings.setdefault(value, []).append(doc_id)
+            bitmaps = {}
+            for value, doc_ids in postings.items():
+                bits = np.zeros(self._count, dtype=bool)
+                bits[doc_ids] = True
+                bitmaps[value] = np.packbits(bits)
+            self.facets[name] = bitmaps
+
+    def values(self, facet: str) -> List[str]:
+        return list(self.facets.get(facet, {}))
+
+    def mask_of(self, indices: Iterable[int]) -> np.ndarray:
+        """Packed bitmap of the given document indices (e.g. search results)."""
+        bits = np.zeros(self._count, dtype=bool)
+        if not isinstance(indices, np.ndarray):
+            indices = np.fromiter(indices, dtype=np.int64)
+        bits[indices] = True
+        return np.packbits(bits)
+
+    def mask(self, selections: Selections, restrict: Optional[np.ndarray] = None,
+             skip: Optional[str] = None) -> np.ndarray:
+        """Bitmap of documents matching ``selections`` (and ``restrict``), ignoring facet ``skip``."""
+        result = self._all.copy() if restrict is None else restrict.copy()
+        for facet, chosen in selections.items():
+            chosen = list(chosen)
+            if facet == skip or not chosen:
+                continue
+            bitmaps = self.facets.get(facet, {})
+            union = np.zeros_like(result)
+            for value in chosen:
+                if value in bitmaps:
+                    union |= bitmaps[value]
+            result &= union
+        return result
+
+    def matches(self, selections: Selections, restrict: Optional[np.ndarray] = None) -> np.ndarray:
+        """Indices of matching documents, in document order."""
+        bits = np.unpackbits(self.mask(selections, restrict), count=self._count)
+        return np.flatnonzero(bits)
+
+    def counts(self, selections: Selections,
+               restrict: Optional[np.ndarray] = None) -> Dict[str, Dict[str, int]]:
+        """Matching documents per facet value, given the selections on the other facets."""
+        counts = {}
+        for facet, bitmaps in self.facets.items():
+            base = self.mask(selections, restrict, skip=facet)
+            counts[facet] = {value: popcount(base & bitmap) for value, bitmap in bitmaps.items()}
+        return counts
@@ -0,0 +1,334 @@
+import os
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from .mixer import get_mixer
+
+logger = logging.getLogger(__name__)
+
+# Longer files are not pre-decoded (a minute of 44.1 kHz stereo PCM is ~10 MB);
+# the limit is on decoded PCM, not on the compressed file
+MAX_DECODE_BYTES = 64 * 1024 * 1024
+
+
+def file_duration(path: str) -> Optional[float]:
+    """Length in seconds from the file's headers (no decoding), or None."""
+    import mutagen
+
+    try:
+        audio = mutagen.File(path)
+    except Exception:
+        return None
+    return getattr(getattr(audio, "info", None), "length", None)
+
+
+class GaplessPlayer(QObject):
+    """Plays local files back to back with no gap between them.
+
+    The next file is decoded to PCM in the background while the current one
+    plays, then queued on the current mixer channel so SDL switches to it at
+    the sample boundary. With ``crossfade_ms`` set, the next file starts on
+    the second channel that long before the end while the current one fades
+    out. Nothing is opened or decoded at the transition itself. A file that
+    wasn't preloaded starts at once on ``mixer.music`` and moves onto a
+    channel, at the same position, when its decode finishes.
+
+    Every transition is recorded in ``transitions`` (and emitted): how long
+    the decode took, how far ahead of the boundary the next file was ready,
+    and how late the switch was observed.
+    """
+
+    track_started = pyqtSignal(str)  # Path now playing
+    needs_next = pyqtSignal(str)  # Path just started; answer with preload()
+    finished = pyqtSignal()  # The last queued file ended
+    transition = pyqtSignal(dict)
+    _decoded = pyqtSignal(str, object, float)  # Path, Sound or None, decode seconds
+
+    def __init__(self, crossfade_ms: int = 0, max_decode_bytes: int = MAX_DECODE_BYTES,
+                 poll_ms: int = 20, parent=None):
+        super().__init__(parent)
+        self.crossfade_ms = crossfade_ms
+        self.max_decode_bytes = max_decode_bytes
+        self.volume = 1.0
+        self.transitions: List[Dict] = []
+        self.current: Optional[Dict] = None
+        self.next: Optional[Dict] = None
+        self._channels = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gapless-decode")
+        self._decoded.connect(self._on_decoded)
+        self._timer = QTimer(self)
+        self._timer.setInterval(poll_ms)
+        self._timer.timeout.connect(self._poll)
+
+    def can_play(self, path: str, duration: Optional[float] = None) -> bool:
+        """True if ``path`` decodes to at most ``max_decode_bytes`` of PCM.
+
+        Pass ``duration`` (seconds) when it is known, e.g. from the track
+        index, to skip reading the file's headers.
+        """
+        if not os.path.exists(path):
+            return False
+        if duration is None:
+            duration = file_duration(path)
+        if not duration:
+            return False
+        frequency, size, channels = get_mixer().get_init()
+        return duration * frequency * (abs(size) // 8) * channels <= self.max_decode_bytes
+
+    def is_active(self) -> bool:
+        return self.current is not None
+
+    def is_playing(self) -> bool:
+        return self.current is not None and self.current["paused_at"] is None
+
+    def _mixer_channels(self):
+        if self._channels is None:
+            mixer = get_mixer()
+            # Keep two channels away from Sound.play() so nothing else steals them
+            mixer.set_reserved(2)
+            self._channels = (mixer.Channel(0), mixer.Channel(1))
+        return self._channels
+
+    def _decode(self, path: str):
+        started = time.perf_counter()
+        try:
+            sound = get_mixer().Sound(path)
+        except Exception as e:
+            logger.warning("Could not decode %s: %s", path, e)
+            sound = None
+        self._decoded.emit(path, sound, time.perf_counter() - started)
+
+    def play(self, path: str):
+        """Play ``path`` now, replacing anything playing or queued."""
+        sound = None
+        if self.next and self.next["path"] == path and self.next["sound"] is not None:
+            sound = self.next["sound"]
+        self.stop()
+        if sound is not None:
+            self._start(path, sound, self._mixer_channels()[0])
+            return
+        # Decoding takes ~70 ms per minute of audio; stream it meanwhile instead of blocking
+        music = get_mixer().music
+        music.load(path)
+        music.set_volume(self.volume)
+        music.play()
+        self.current = {"path": path, "sound": None, "source": None, "length": file_duration(path) or 0.0,
+                        "channel": None, "offset": 0.0, "started": time.perf_counter(), "paused_at": None}
+        self._executor.submit(self._decode, path)
+        self._timer.start()
+        self.track_started.emit(path)
+
+    def _start(self, path: str, sound, channel, offset: float = 0.0, fade_ms: int = 0):
+        sound.set_volume(self.volume)
+        channel.play(sound, fade_ms=fade_ms)
+        self.current = {"path": path, "sound": sound, "source": sound, "length": sound.get_length(),
+                        "channel": channel, "offset": offset, "started": time.perf_counter(),
+                        "paused_at": None}
+        self._timer.start()
+        self.track_started.emit(path)
+        self.needs_next.emit(path)
+
+    def _take_over(self, sound):
+        """Move the current file from ``mixer.music`` onto a channel, where it can be queued after."""
+        current = self.current
+        get_mixer().music.stop()
+        current.update(sound=sound, source=sound, length=sound.get_length(),
+                       channel=self._mixer_channels()[0])
+        self._seek_current(min(self.position(), current["length"]))
+        self.needs_next.emit(current["path"])
+
+    def preload(self, path: str):
+        """Decode ``path`` in the background and queue it after the current file."""
+        if self.next and self.next["path"] == path:
+            return
+        self._unqueue()
+        self.next = {"path": path, "sound": None, "requested": time.perf_counter(),
+                     "decode_s": None, "scheduled": False}
+        self._executor.submit(self._decode, path)
+
+    def _on_decoded(self, path: str, sound, decode_s: float):
+        current = self.current
+        if current and current["sound"] is None and current["path"] == path:
+            if sound is not None:
+                self._take_over(sound)
+            return
+        if not self.next or self.next["path"] != path or self.next["sound"] is not None:
+            return
+        if sound is None:
+            self.next = None
+            return
+        self.next.update(sound=sound, decode_s=decode_s, ready_at=time.perf_counter())
+        self._schedule_next()
+
+    def _schedule_next(self):
+        """Queue the decoded next file on the current channel (gapless mode)."""
+        if not self.current or not self.next or self.next["sound"] is None or self.next["scheduled"]:
+            return
+        if self.crossfade_ms <= 0:
+            self.next["sound"].set_volume(self.volume)
+            self.current["channel"].queue(self.next["sound"])
+            self.next["scheduled"] = True
+
+    def _unqueue(self):
+        """Drop a queued next file, keeping the current one playing."""
+        if self.next and self.next["scheduled"] and self.current:
+            # Replaying from the current position is the only way to clear a channel queue
+            self._seek_current(self.position())
+        self.next = None
+
+    def remaining(self) -> float:
+        if not self.current:
+            return 0.0
+        return max(self.current["length"] - self.position(), 0.0)
+
+    def position(self) -> float:
+        """Seconds into the current file."""
+        current = self.current
+        if current is None:
+            return 0.0
+        now = current["paused_at"] or time.perf_counter()
+        return current["offset"] + now - current["started"]
+
+    def duration(self) -> float:
+        return self.current["length"] if self.current else 0.0
+
+    def _poll(self):
+        current = self.current
+        if current is None or current["paused_at"] is not None:
+            return
+        if current["sound"] is None:
+            # Still on mixer.music (decode pending or failed); nothing can be queued after it
+            if not get_mixer().music.get_busy():
+                self.current = None
+                self._timer.stop()
+                self.finished.emit()
+            return
+        channel = current["channel"]
+        upcoming = self.next
+        if (self.crossfade_ms > 0 and upcoming and upcoming["sound"] is not None
+                and self.remaining() * 1000 <= self.crossfade_ms):
+            first, second = self._mixer_channels()
+            other = second if channel is first else first
+            fade = int(self.remaining() * 1000)
+            channel.fadeout(max(fade, 1))
+            self._advance(upcoming, other, fade_ms=fade)
+            return
+        if upcoming and upcoming["scheduled"] and channel.get_sound() is upcoming["sound"]:
+            self._advance(upcoming, channel)
+            return
+        if not channel.get_busy():
+            self.current = None
+            self._timer.stop()
+            self.finished.emit()
+
+    def _advance(self, upcoming: Dict, channel, fade_ms: int = 0):
+        """Make the next file current, recording how the transition went."""
+        now = time.perf_counter()
+        boundary = self.current["started"] + self.duration() - self.current["offset"]
+        if fade_ms:
+            boundary -= fade_ms / 1000
+        record = {
+            "from": self.current["path"], "to": upcoming["path"],
+            "mode": "crossfade" if fade_ms else "gapless",
+            "decode_ms": upcoming["decode_s"] * 1000,
+            "ready_ahead_ms": (boundary - upcoming["ready_at"]) * 1000,
+            "detected_late_ms": max(now - boundary, 0.0) * 1000,
+        }
+        self.next = None
+        if fade_ms:
+            self._start(upcoming["path"], upcoming["sound"], channel, fade_ms=fade_ms)
+        else:
+            # SDL already switched; only the bookkeeping moves over
+            sound = upcoming["sound"]
+            self.current = {"path": upcoming["path"], "sound": sound, "source": sound,
+                            "length": sound.get_length(), "channel": channel, "offset": 0.0,
+                            "started": boundary, "paused_at": None}
+            self.track_started.emit(upcoming["path"])
+            self.needs_next.emit(upcoming["path"])
+        self.transitions.append(record)
+        logger.info("Transition to %s: decoded in %.0f ms, ready %.0f ms ahead",
+                    record["to"], record["decode_ms"], record["ready_ahead_ms"])
+        self.transition.emit(record)
+
+    def pause(self):
+        if self.current and self.current["paused_at"] is None:
+            self.current["paused_at"] = time.perf_counter()
+            if self.current["sound"] is None:
+                get_mixer().music.pause()
+            for channel in self._mixer_channels():
+                channel.pause()
+
+    def resume(self):
+        if self.current and self.current["paused_at"] is not None:
+            self.current["started"] += time.perf_counter() - self.current["paused_at"]
+            self.current["paused_at"] = None
+            if self.current["sound"] is None:
+                get_mixer().music.unpause()
+            for channel in self._mixer_channels():
+                channel.unpause()
+
+    def seek(self, seconds: float):
+        if not self.current:
+            return
+        self._seek_current(min(max(seconds, 0.0), self.duration()))
+        if self.next:
+            self.next["scheduled"] = False
+            self._schedule_next()
+
+    def _seek_current(self, seconds: float):
+        """Restart the current file at ``seconds``.
+
+        Decoded files play a copy of the PCM from ``seconds`` on, cut from a
+        view of the whole file's samples (``source``), so a seek holds at
+        most one extra partial copy. Files still on ``mixer.music`` restart
+        it at ``seconds``.
+        """
+        current = self.current
+        paused = current["paused_at"] is not None
+        if current["sound"] is None:
+            get_mixer().music.play(start=seconds)
+            if paused:
+                get_mixer().music.pause()
+        else:
+            import pygame.sndarray
+
+            frequency = get_mixer().get_init()[0]
+            samples = pygame.sndarray.samples(current["source"])
+            sound = get_mixer().Sound(buffer=samples[int(seconds * frequency):])
+            sound.set_volume(self.volume)
+            current["channel"].play(sound)
+            if paused:
+                current["channel"].pause()
+            current["sound"] = sound
+        # Positions stay relative to the whole file
+        current["offset"] = seconds
+        current["started"] = time.perf_counter()
+        current["paused_at"] = current["started"] if paused else None
+
+    def set_volume(self, volume: float):
+        self.volume = volume
+        if self.current and self.current["sound"] is None:
+            get_mixer().music.set_volume(volume)
+        elif self.current:
+            self.current["sound"].set_volume(volume)
+        if self.next and self.next["sound"] is not None:
+            self.next["sound"].set_volume(volume)
+
+    def stop(self):
+        self._timer.stop()
+        if self.current and self.current["sound"] is None:
+            get_mixer().music.stop()
+        if self._channels is not None:
+            for channel in self._channels:
+                channel.stop()
+        self.current = None
+        self.next = None
+
+    def shutdown(self):
+        self.stop()
+        self._executor.shutdown(wait=False)
+
@@ -0,0 +1,223 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QImage, QPixmap
+
+
+def placeholder_pixmap(width: int, height: int, color: str = "#333") -> QPixmap:
+    """Flat pixmap shown until the real image arrives."""
+    pixmap = QPixmap(width, height)
+    pixmap.fill(QColor(color))
+    return pixmap
+
+
+class PixmapLRU:
+    """Decoded pixmaps kept under a byte budget, least recently used evicted first."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: "OrderedDict[str, Tuple[QPixmap, int]]" = OrderedDict()
+
+    @staticmethod
+    def cost(pixmap: QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def get(self, key: str) -> Optional[QPixmap]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: str, pixmap: QPixmap):
+        cost = self.cost(pixmap)
+        if cost > self.max_bytes:
+            return
+        if key in self._entries:
+            self.total_bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (pixmap, cost)
+        self.total_bytes += cost
+        while self.total_bytes > self.max_bytes:
+            _, (_, evicted_cost) = self._entries.popitem(last=False)
+            self.total_bytes -= evicted_cost
+
+    def clear(self):
+        self._entries.clear()
+        self.total_bytes = 0
+
+
+class DiskImageCache:
+    """Original image bytes stored on disk, keyed by URL.
+
+    Each entry is a ``<sha1>.img`` file plus a ``<sha1>.json`` sidecar holding
+    the ETag/Last-Modified validators and the time the entry was last checked
+    against the server. File mtimes double as the LRU clock.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.total_bytes = sum(p.stat().st_size for p in self.cache_dir.glob("*.img"))
+
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.img", self.cache_dir / f"{key}.json"
+
+    def read(self, url: str) -> Tuple[Optional[bytes], Dict]:
+        """Return the cached bytes and validators for a URL, if present."""
+        data_path, meta_path = self._paths(url)
+        try:
+            data = data_path.read_bytes()
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None, {}
+        os.utime(data_path)
+        return data, meta
+
+    def write(self, url: str, data: bytes, etag: Optional[str] = None,
+              last_modified: Optional[str] = None):
+        data_path, meta_path = self._paths(url)
+        meta = {"url": url, "etag": etag, "last_modified": last_modified,
+                "checked": time.time()}
+        with self._lock:
+            old_size = data_path.stat().st_size if data_path.exists() else 0
+            tmp_path = data_path.with_suffix(".tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, data_path)
+            with open(meta_path, "w") as f:
+                json.dump(meta, f)
+            self.total_bytes += len(data) - old_size
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def mark_checked(self, url: str, meta: Dict):
+        """Record a successful revalidation (HTTP 304) for an entry."""
+        _, meta_path = self._paths(url)
+        meta = dict(meta, checked=time.time())
+        with open(meta_path, "w") as f:
+            json.dump(meta, f)
+
+    def _evict(self):
+        """Drop least recently used entries until the cache is under 90% of its budget."""
+        entries = sorted(self.cache_dir.glob("*.img"), key=lambda p: p.stat().st_mtime)
+        target = self.max_bytes * 0.9
+        for data_path in entries:
+            if self.total_bytes <= target:
+                break
+            try:
+                size = data_path.stat().st_size
+                data_path.unlink()
+                data_path.with_suffix(".json").unlink(missing_ok=True)
+                self.total_bytes -= size
+            except OSError:
+                pass
+
+
+class ImageLoader(QObject):
+    """Loads remote images off the GUI thread.
+
+    ``load`` returns immediately; the callback runs on the GUI thread with a
+    ``QPixmap`` once the image is available. Decoding and scaling happen in
+    worker threads, so the GUI thread only wraps the finished ``QImage``.
+    """
+
+    # Internal: emitted from worker threads, delivered queued on the GUI thread
+    _image_ready = pyqtSignal(str, QImage)
+
+    def __init__(self, cache_dir: str = "cache/images",
+                 memory_bytes: int = 64 * 1024 * 1024,
+                 disk_bytes: int = 256 * 1024 * 1024,
+                 max_workers: int = 4,
+                 revalidate_after: float = 24 * 60 * 60,
+                 parent=None):
+        super().__init__(parent)
+        self.memory_cache = PixmapLRU(memory_bytes)
+        self.disk_cache = DiskImageCache(cache_dir, disk_bytes)
+        self.revalidate_after = revalidate_after
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="image-loader")
+        self._pending: Dict[str, List[Callable[[QPixmap], None]]] = {}
+        self._image_ready.connect(self._on_image_ready)
+
+    def load(self, url: str, callback: Callable[[QPixmap], None],
+             width: int = 0, height: int = 0):
+        """Fetch ``url`` scaled to fit ``width`` x ``height`` (0 keeps the original size)."""
+        if not url:
+            return
+        key = f"{url}@{width}x{height}"
+        pixmap = self.memory_cache.get(key)
+        if pixmap is not None:
+            callback(pixmap)
+            return
+        if key in self._pending:
+            self._pending[key].append(callback)
+            return
+        self._pending[key] = [callback]
+        self._executor.submit(self._fetch, key, url, width, height)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+    def _fetch(self, key: str, url: str, width: int, height: int):
+        image = QImage()
+        try:
+            data = self._get_bytes(url)
+            if data and image.loadFromData(data) and width and height:
+                image = image.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio,
+                                     Qt.TransformationMode.SmoothTransformation)
+        except Exception:
+            image = QImage()
+        self._image_ready.emit(key, image)
+
+    def _get_bytes(self, url: str) -> Optional[bytes]:
+        data, meta = self.disk_cache.read(url)
+        if data is not None and time.time() - meta.get("checked", 0) < self.revalidate_after:
+            return data
+
+        import requests
+
+        headers = {}
+        if data is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        try:
+            response = requests.get(url, headers=headers, timeout=15)
+        except requests.RequestException:
+            return data  # Offline: a stale copy beats no image
+
+        if response.status_code == 304 and data is not None:
+            self.disk_cache.mark_checked(url, meta)
+            return data
+        if response.ok:
+            self.disk_cache.write(url, response.content,
+                                  response.headers.get("ETag"),
+                                  response.headers.get("Last-Modified"))
+            return response.content
+        return data
+
+    def _on_image_ready(self, key: str, image: QImage):
+        callbacks = self._pending.pop(key, [])
+        if image.isNull():
+            return
+        pixmap = QPixmap.fromImage(image)
+        self.memory_cache.put(key, pixmap)
+        for callback in callbacks:
+            try:
+                callback(pixmap)
+            except RuntimeError:
+                # Target widget was deleted while the image was loading
+                pass
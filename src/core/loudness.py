@@ -0,0 +1,219 @@
+import os
+import math
+import time
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+from PyQt6.QtCore import QObject, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+# ITU-R BS.1770-4 / EBU R128 measurement parameters
+BLOCK_STEPS = 4  # 400 ms gating blocks made of 100 ms steps (75% overlap)
+STEP_SECONDS = 0.1
+ABSOLUTE_GATE_LUFS = -70.0
+RELATIVE_GATE_LU = -10.0
+TRUE_PEAK_OVERSAMPLING = 4
+CHUNK_STEPS = 100  # Decode 10 s at a time so long podcasts don't sit in memory
+
+DEFAULT_TARGET_LUFS = -16.0
+PEAK_CEILING_DBTP = -1.0
+
+
+def k_weighting(rate: int) -> np.ndarray:
+    """The BS.1770 K-weighting filter (high shelf, then high-pass) for ``rate``, as second-order sections."""
+    # Pre-filter: +4 dB high shelf modelling the head
+    k = math.tan(math.pi * 1681.974450955533 / rate)
+    q = 0.7071752369554196
+    vh = 10 ** (3.999843853973347 / 20)
+    vb = vh ** 0.4996667741545416
+    a0 = 1 + k / q + k * k
+    shelf = [(vh + vb * k / q + k * k) / a0, 2 * (k * k - vh) / a0, (vh - vb * k / q + k * k) / a0,
+             1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0]
+    # RLB weighting: high-pass at ~38 Hz
+    k = math.tan(math.pi * 38.13547087602444 / rate)
+    q = 0.5003270373238773
+    a0 = 1 + k / q + k * k
+    high_pass = [1.0, -2.0, 1.0, 1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0]
+    return np.array([shelf, high_pass])
+
+
+def channel_weights(channels: int) -> np.ndarray:
+    """Per-channel gains; surround channels of a 5.1 file count +1.5 dB and LFE is ignored."""
+    if channels == 6:
+        return np.array([1.0, 1.0, 1.0, 0.0, 1.41, 1.41])
+    return np.ones(channels)
+
+
+def measure_loudness(path: str) -> Dict:
+    """Integrated loudness (LUFS) and true peak (dBTP) of a file, decoded in chunks.
+
+    Runs in a worker process, so it only returns plain values. Digital
+    silence measures as -inf for both.
+    """
+    import soundfile as sf
+    from scipy import signal
+
+    with sf.SoundFile(path) as f:
+        rate, channels = f.samplerate, f.channels
+        sos = k_weighting(rate)
+        state = np.zeros((len(sos), 2, channels))
+        weights = channel_weights(channels)
+        step = int(round(rate * STEP_SECONDS))
+        energies = []
+        peak = 0.0
+        tail = np.zeros((0, channels), dtype=np.float32)
+        for chunk in f.blocks(blocksize=step * CHUNK_STEPS, dtype="float32", always_2d=True):
+            filtered, state = signal.sosfilt(sos, chunk, axis=0, zi=state)
+            # Only whole 100 ms steps count; a partial one can only be the last
+            whole = len(chunk) // step * step
+            squares = np.square(filtered[:whole]).reshape(-1, step, channels).sum(axis=1)
+            energies.append(squares @ weights)
+            # Inter-sample peaks; the previous chunk's tail gives the resampler context at the seam
+            upsampled = signal.resample_poly(np.concatenate([tail, chunk]), TRUE_PEAK_OVERSAMPLING, 1, axis=0)
+            peak = max(peak, float(np.abs(upsampled).max(initial=0.0)))
+            tail = chunk[-16:]
+
+    steps = np.concatenate(energies) if energies else np.zeros(0)
+    true_peak = 20 * math.log10(peak) if peak > 0 else -math.inf
+    if len(steps) < BLOCK_STEPS:
+        return {"loudness": -math.inf, "true_peak": true_peak}
+    blocks = sum(steps[i:len(steps) - BLOCK_STEPS + 1 + i] for i in range(BLOCK_STEPS))
+    power = blocks / (BLOCK_STEPS * step)
+    with np.errstate(divide="ignore"):
+        block_lufs = -0.691 + 10 * np.log10(power)
+    gated = power[block_lufs > ABSOLUTE_GATE_LUFS]
+    if not len(gated):
+        return {"loudness": -math.inf, "true_peak": true_peak}
+    relative_gate = -0.691 + 10 * math.log10(gated.mean()) + RELATIVE_GATE_LU
+    gated = power[(block_lufs > ABSOLUTE_GATE_LUFS) & (block_lufs > relative_gate)]
+    return {"loudness": -0.691 + 10 * math.log10(gated.mean()), "true_peak": true_peak}
+
+
+def playback_gain(loudness: Optional[float], true_peak: Optional[float],
+                  target: float = DEFAULT_TARGET_LUFS, ceiling: float = PEAK_CEILING_DBTP) -> float:
+    """Linear gain bringing a track to ``target`` LUFS without pushing its true peak over ``ceiling``."""
+    if loudness is None or not math.isfinite(loudness):
+        return 1.0
+    gain_db = target - loudness
+    if true_peak is not None and math.isfinite(true_peak):
+        gain_db = min(gain_db, ceiling - true_peak)
+    return 10 ** (gain_db / 20)
+
+
+def _worker_init():
+    # Analysis is a background job; keep the UI and playback ahead of it
+    try:
+        os.nice(10)
+    except (AttributeError, OSError):
+        pass
+
+
+class LoudnessAnalyzer(QObject):
+    """Measures tracks on every core and stores the results in a ``TrackIndex``.
+
+    Each ``analyze`` call becomes a batch that a coordinator thread fans out
+    to a process pool (decoding and filtering are CPU bound, so threads
+    would serialize on the GIL). Batches run one after another, and each
+    reports its throughput when it finishes.
+    """
+
+    analyzed = pyqtSignal(str, dict)  # Path as requested, updated index entry
+    batch_finished = pyqtSignal(dict)  # tracks, failed, seconds, tracks_per_minute
+
+    def __init__(self, index, workers: Optional[int] = None, parent=None):
+        super().__init__(parent)
+        self.index = index
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="loudness")
+        self._pending = set()
+        self._pool = None
+        self._stopping = False
+
+    def analyze(self, paths: Iterable[str]):
+        """Queue a batch of the given tracks that have no stored loudness yet."""
+        batch = [path for path in dict.fromkeys(paths)
+                 if path not in self._pending and self.index.needs_loudness(path)]
+        if not batch:
+            return
+        self._pending.update(batch)
+        self._executor.submit(self._run, batch)
+
+    def shutdown(self):
+        """Drop queued work and kill the worker processes, so exit doesn't wait on a measurement."""
+        self._stopping = True
+        pool = self._pool
+        if pool is not None:
+            processes = list((pool._processes or {}).values())
+            pool.shutdown(wait=False, cancel_futures=True)
+            for process in processes:
+                process.terminate()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, batch):
+        if self._stopping:
+            return
+        started = time.perf_counter()
+        done = failed = 0
+        # Spawned workers don't inherit the GUI process's Qt and audio threads
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(batch)), mp_context=context,
+                                 initializer=_worker_init) as pool:
+            self._pool = pool
+            futures = {pool.submit(measure_loudness, path): path for path in batch}
+            for future in as_completed(futures):
+                if self._stopping:
+                    break
+                path = futures[future]
+                self._pending.discard(path)
+                try:
+                    result = future.result()
+                    entry = self.index.store_loudness(path, result["loudness"], result["true_peak"])
+                except Exception as e:
+                    logger.warning("Could not measure loudness of %s: %s", path, e)
+                    failed += 1
+                    continue
+                done += 1
+                self.analyzed.emit(path, entry)
+        self._pool = None
+        if self._stopping:
+            return
+        seconds = time.perf_counter() - started
+        stats = {"tracks": done, "failed": failed, "seconds": seconds,
+                 "tracks_per_minute": done * 60 / seconds if seconds else 0.0}
+        logger.info("Loudness: %d tracks in %.1f s on %d processes (%.1f tracks/min, %d failed)",
+                    done, seconds, min(self.workers, len(batch)), stats["tracks_per_minute"], failed)
+        self.batch_finished.emit(stats)
+
+
+if __name__ == "__main__":
+    import sys
+    import argparse
+    from pathlib import Path
+    from PyQt6.QtCore import QCoreApplication
+
+    from .track_index import TrackIndex
+
+    parser = argparse.ArgumentParser(description="Measure loudness of cached tracks into the track index.")
+    parser.add_argument("paths", nargs="*", help="files to measure (default: cache/media and downloads)")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--db", default="cache/track_index.db")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    paths = args.paths or [str(p) for folder in ("cache/media", "downloads") for p in Path(folder).glob("*.mp3")]
+    app = QCoreApplication(sys.argv[:1])
+    analyzer = LoudnessAnalyzer(TrackIndex(args.db), workers=args.workers)
+    analyzer.analyzed.connect(lambda path, entry: print(
+        f"{entry['loudness']:6.1f} LUFS  {entry['true_peak']:5.1f} dBTP  {Path(path).name}"))
+    analyzer.batch_finished.connect(lambda stats: (print(
+        f"{stats['tracks']} tracks in {stats['seconds']:.1f} s: "
+        f"{stats['tracks_per_minute']:.1f} tracks/min ({stats['failed']} failed)"), app.quit()))
+    analyzer.analyze(paths)
+    if analyzer._pending:
+        app.exec()
+    else:
+        print("Nothing to measure")
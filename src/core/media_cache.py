@@ -0,0 +1,177 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+
+class CacheWriter:
+    """Streams one download into the cache, hashing the content as it arrives."""
+
+    def __init__(self, cache: "MediaCache", url: str, part_path: Path):
+        self.cache = cache
+        self.url = url
+        self.part_path = part_path
+        self.bytes_written = 0
+        self._hash = hashlib.sha256()
+        self._file = open(part_path, "wb")
+
+    def write(self, chunk: bytes):
+        self._file.write(chunk)
+        self._hash.update(chunk)
+        self.bytes_written += len(chunk)
+
+    def flush(self):
+        """Make written bytes visible to readers of the part file."""
+        self._file.flush()
+
+    def commit(self) -> str:
+        """Finish the download and return the path of the cached file."""
+        self._file.close()
+        return self.cache._commit(self.url, self.part_path, self._hash.hexdigest())
+
+    def abort(self):
+        self._file.close()
+        self.part_path.unlink(missing_ok=True)
+
+
+class MediaCache:
+    """Persistent, size-capped audio cache.
+
+    Files are stored by content hash (``<sha256>.mp3``) so the same audio
+    reachable from several URLs is kept once. ``index.json`` maps URLs to
+    hashes and records each blob's size and last use for LRU eviction.
+    In-progress downloads live in ``*.part`` files until committed.
+    """
+
+    def __init__(self, cache_dir: str = "cache/media", max_bytes: int = 2 * 1024 ** 3):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.index_file = self.cache_dir / "index.json"
+        self.urls: Dict[str, str] = {}
+        self.blobs: Dict[str, Dict] = {}
+        self._pinned: Set[str] = set()
+        self._lock = threading.RLock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+        self.sweep()
+
+    def _load_index(self):
+        """Load the URL and blob index from disk."""
+        try:
+            with open(self.index_file, "r") as f:
+                index = json.load(f)
+            self.urls = index.get("urls", {})
+            self.blobs = index.get("blobs", {})
+        except (OSError, ValueError):
+            self.urls = {}
+            self.blobs = {}
+
+    def _save_index(self):
+        """Write the index atomically so a crash never leaves it half-written."""
+        tmp_file = self.index_file.with_suffix(".tmp")
+        with open(tmp_file, "w") as f:
+            json.dump({"urls": self.urls, "blobs": self.blobs}, f)
+        os.replace(tmp_file, self.index_file)
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.cache_dir / f"{digest}.mp3"
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(blob["size"] for blob in self.blobs.values())
+
+    def sweep(self):
+        """Remove partial downloads, unindexed files and index entries whose file is gone."""
+        with self._lock:
+            for path in self.cache_dir.iterdir():
+                if path == self.index_file:
+                    continue
+                if path.suffix == ".mp3" and path.stem in self.blobs:
+                    continue
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            self.blobs = {digest: blob for digest, blob in self.blobs.items()
+                          if self._blob_path(digest).exists()}
+            self.urls = {url: digest for url, digest in self.urls.items()
+                         if digest in self.blobs}
+            # The size cap may have been lowered since the last run
+            self._evict()
+            self._save_index()
+
+    def get(self, url: str) -> Optional[str]:
+        """Return the cached file for ``url`` and mark it as recently used."""
+        with self._lock:
+            digest = self.urls.get(url)
+            if digest is None:
+                return None
+            path = self._blob_path(digest)
+            if not path.exists():
+                self.blobs.pop(digest, None)
+                del self.urls[url]
+                return None
+            self.blobs[digest]["last_used"] = time.time()
+            return str(path)
+
+    def peek(self, url: str) -> Optional[str]:
+        """Return the cached file for ``url`` without marking it as used (eviction order is kept)."""
+        with self._lock:
+            digest = self.urls.get(url)
+            if digest is None:
+                return None
+            path = self._blob_path(digest)
+            return str(path) if path.exists() else None
+
+    def cached_files(self) -> List[str]:
+        with self._lock:
+            return [str(self._blob_path(digest)) for digest in self.blobs]
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return url in self.urls
+
+    def open_writer(self, url: str) -> CacheWriter:
+        """Start caching a download of ``url``; call ``commit`` or ``abort`` when done."""
+        name = f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}-{threading.get_ident()}.part"
+        return CacheWriter(self, url, self.cache_dir / name)
+
+    def _commit(self, url: str, part_path: Path, digest: str) -> str:
+        with self._lock:
+            path = self._blob_path(digest)
+            if path.exists():
+                part_path.unlink(missing_ok=True)
+            else:
+                os.replace(part_path, path)
+            self.blobs[digest] = {"size": path.stat().st_size, "last_used": time.time()}
+            self.urls[url] = digest
+            self._evict(protect=digest)
+            self._save_index()
+            return str(path)
+
+    def pin(self, path: Optional[str]):
+        """Protect the file currently being played from eviction (``None`` clears)."""
+        with self._lock:
+            self._pinned = {Path(path).stem} if path else set()
+
+    def _evict(self, protect: Optional[str] = None):
+        """Drop least recently used blobs until the cache fits its budget."""
+        total = self.total_bytes
+        if total <= self.max_bytes:
+            return
+        for digest in sorted(self.blobs, key=lambda d: self.blobs[d]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if digest == protect or digest in self._pinned:
+                continue
+            total -= self.blobs.pop(digest)["size"]
+            self._blob_path(digest).unlink(missing_ok=True)
+        self.urls = {url: digest for url, digest in self.urls.items() if digest in self.blobs}
+
+    def flush(self):
+        """Persist last-used times recorded since the last write."""
+        with self._lock:
+            self._save_index()
@@ -0,0 +1,22 @@
+import threading
+
+_mixer = None
+_lock = threading.Lock()
+
+
+def get_mixer():
+    """Return ``pygame.mixer``, importing pygame and opening the audio device on first use."""
+    global _mixer
+    if _mixer is None:
+        with _lock:
+            if _mixer is None:
+                import pygame
+
+                pygame.mixer.init()
+                _mixer = pygame.mixer
+    return _mixer
+
+
+def mixer_initialized() -> bool:
+    """Whether ``get_mixer`` has run, i.e. anything could be playing."""
+    return _mixer is not None
@@ -0,0 +1,243 @@
+import io
+import os
+import mmap
+import struct
+import bisect
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# MPEG audio Layer III header tables, indexed by the header's version bits
+# (0 = MPEG 2.5, 2 = MPEG 2, 3 = MPEG 1)
+BITRATES_KBPS = {
+    3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+BITRATES_KBPS[0] = BITRATES_KBPS[2]
+SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+# Larger files (about an hour at 128 kbps) use their Xing/VBRI TOC when they
+# have one: a full table costs 4 bytes per frame, ~600 KB per hour, to store
+MAX_SCAN_BYTES = 64 * 1024 * 1024
+
+
+def parse_header(data, pos: int) -> Optional[Tuple[int, int, int]]:
+    """(frame length, sample rate, samples per frame) of a Layer III frame at ``pos``, or None."""
+    if pos + 4 > len(data) or data[pos] != 0xFF or data[pos + 1] & 0xE0 != 0xE0:
+        return None
+    b1, b2 = data[pos + 1], data[pos + 2]
+    version = (b1 >> 3) & 3
+    layer = (b1 >> 1) & 3
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 3
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    bitrate = BITRATES_KBPS[version][bitrate_index] * 1000
+    sample_rate = SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 1
+    if version == 3:
+        return 144 * bitrate // sample_rate + padding, sample_rate, 1152
+    return 72 * bitrate // sample_rate + padding, sample_rate, 576
+
+
+def audio_start(data) -> int:
+    """Byte offset just past any ID3v2 tags."""
+    pos = 0
+    while data[pos:pos + 3] == b"ID3" and pos + 10 <= len(data):
+        size = 0
+        for byte in data[pos + 6:pos + 10]:
+            size = (size << 7) | (byte & 0x7F)
+        footer = 10 if data[pos + 5] & 0x10 else 0
+        pos += 10 + size + footer
+    return pos
+
+
+def _info_tag_offset(data, pos: int) -> int:
+    """Where a Xing/Info tag would sit in the frame at ``pos`` (after the side info)."""
+    mpeg1 = (data[pos + 1] >> 3) & 3 == 3
+    mono = data[pos + 3] >> 6 == 3
+    if mpeg1:
+        return pos + 4 + (17 if mono else 32)
+    return pos + 4 + (9 if mono else 17)
+
+
+def _sync(data, pos: int) -> int:
+    """Next offset holding two consecutive valid frame headers, or -1."""
+    end = len(data) - 4
+    while pos < end:
+        pos = data.find(b"\xff", pos, end)
+        if pos < 0:
+            return -1
+        header = parse_header(data, pos)
+        if header and parse_header(data, pos + header[0]):
+            return pos
+        pos += 1
+    return -1
+
+
+class SeekTable:
+    """Byte offsets of an MP3's audio frames against playback time.
+
+    A scanned table holds every frame, so the frame playing at ``t`` is
+    ``t / frame_duration`` and seeks land on that frame exactly. A table
+    taken from a Xing or VBRI TOC holds 100 or so points; those are found
+    by binary search and are only as precise as the TOC.
+    """
+
+    def __init__(self, sample_rate: int, samples_per_frame: int, offsets: np.ndarray,
+                 times: Optional[np.ndarray] = None, source: str = "scan"):
+        self.sample_rate = sample_rate
+        self.samples_per_frame = samples_per_frame
+        self.offsets = offsets
+        self.times = times
+        self.source = source
+        self.frame_duration = samples_per_frame / sample_rate
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    @property
+    def duration(self) -> float:
+        if self.times is not None:
+            return float(self.times[-1])
+        return len(self.offsets) * self.frame_duration
+
+    def locate(self, seconds: float) -> Tuple[int, float]:
+        """(byte offset, start time) of the frame playing at ``seconds``."""
+        if not len(self.offsets):
+            return 0, 0.0
+        if self.times is None:
+            index = min(max(int(seconds / self.frame_duration), 0), len(self.offsets) - 1)
+            return int(self.offsets[index]), index * self.frame_duration
+        index = max(bisect.bisect_right(self.times, seconds) - 1, 0)
+        return int(self.offsets[index]), float(self.times[index])
+
+    @classmethod
+    def scan(cls, path: str) -> Optional["SeekTable"]:
+        """Walk every frame header of ``path`` (no decoding); None if it isn't MPEG Layer III."""
+        with open(path, "rb") as f:
+            if not f.seek(0, io.SEEK_END):
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return cls._scan(data)
+
+    @classmethod
+    def _scan(cls, data) -> Optional["SeekTable"]:
+        pos = _sync(data, audio_start(data))
+        if pos < 0:
+            return None
+        _, sample_rate, samples_per_frame = parse_header(data, pos)
+        # The first frame of a LAME/Xing file is a silent info frame, not audio
+        tag = _info_tag_offset(data, pos)
+        if data[tag:tag + 4] in (b"Xing", b"Info") or data[pos + 36:pos + 40] == b"VBRI":
+            pos += parse_header(data, pos)[0]
+        offsets: List[int] = []
+        size = len(data)
+        while pos + 4 <= size:
+            header = parse_header(data, pos)
+            if header is None or header[1] != sample_rate:
+                if data[pos:pos + 3] == b"TAG" or data[pos:pos + 8] == b"APETAGEX":
+                    break
+                pos = _sync(data, pos + 1)
+                if pos < 0:
+                    break
+                continue
+            if pos + header[0] > size:
+                break  # Truncated last frame
+            offsets.append(pos)
+            pos += header[0]
+        if not offsets:
+            return None
+        return cls(sample_rate, samples_per_frame, np.array(offsets, dtype=np.uint32))
+
+    @classmethod
+    def from_toc(cls, path: str) -> Optional["SeekTable"]:
+        """Build a coarse table from the Xing or VBRI header, without scanning the file."""
+        with open(path, "rb") as f:
+            head = f.read(64 * 1024)
+            file_size = f.seek(0, io.SEEK_END)
+        pos = _sync(head, audio_start(head))
+        if pos < 0:
+            return None
+        length, sample_rate, samples_per_frame = parse_header(head, pos)
+        frame_duration = samples_per_frame / sample_rate
+        tag = _info_tag_offset(head, pos)
+        if head[tag:tag + 4] in (b"Xing", b"Info"):
+            flags = struct.unpack(">I", head[tag + 4:tag + 8])[0]
+            field = tag + 8
+            frames = audio_bytes = None
+            if flags & 1:
+                frames = struct.unpack(">I", head[field:field + 4])[0]
+                field += 4
+            if flags & 2:
+                audio_bytes = struct.unpack(">I", head[field:field + 4])[0]
+                field += 4
+            if not (flags & 4) or not frames:
+                return None
+            audio_bytes = audio_bytes or file_size - pos
+            duration = frames * frame_duration
+            toc = head[field:field + 100]
+            offsets = [pos + length + toc[i] * audio_bytes // 256 for i in range(100)]
+            times = [duration * i / 100 for i in range(100)] + [duration]
+            offsets.append(pos + audio_bytes)
+        elif head[pos + 36:pos + 40] == b"VBRI":
+            (audio_bytes, frames, entries, scale,
+             entry_size, frames_per_entry) = struct.unpack(">IIHHHH", head[pos + 46:pos + 62])
+            offsets, times = [pos + length], [0.0]
+            field = pos + 62
+            for i in range(entries):
+                raw = head[field + i * entry_size:field + (i + 1) * entry_size]
+                offsets.append(offsets[-1] + int.from_bytes(raw, "big") * scale)
+                times.append((i + 1) * frames_per_entry * frame_duration)
+        else:
+            return None
+        return cls(sample_rate, samples_per_frame, np.array(offsets, dtype=np.uint32),
+                   np.array(times, dtype=np.float64), source="toc")
+
+    @classmethod
+    def build(cls, path: str, max_scan_bytes: int = MAX_SCAN_BYTES) -> Optional["SeekTable"]:
+        """Frame-accurate table from a scan; files over ``max_scan_bytes`` use their TOC if they have one."""
+        if os.path.getsize(path) > max_scan_bytes:
+            table = cls.from_toc(path)
+            if table is not None:
+                return table
+        return cls.scan(path)
+
+
+class FileSlice(io.RawIOBase):
+    """Read-only view of a file from ``start`` on, for handing a decoder a mid-file frame."""
+
+    def __init__(self, path: str, start: int):
+        super().__init__()
+        self._file = open(path, "rb")
+        self.start = start
+        self.size = self._file.seek(0, io.SEEK_END) - start
+        self._file.seek(start)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._file.tell() - self.start
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            target = offset
+        elif whence == io.SEEK_CUR:
+            target = self.tell() + offset
+        else:
+            target = self.size + offset
+        self._file.seek(self.start + max(target, 0))
+        return self.tell()
+
+    def readinto(self, b):
+        data = self._file.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        self._file.close()
+        super().close()
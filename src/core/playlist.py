@@ -1,86 +1,180 @@
 import os
 import json
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional, Union
+
+from .scanner import DirectoryScanner
+from .playlist_store import PlaylistStore, JsonPlaylistStore, SqlitePlaylistStore
 
 class PlaylistManager:
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data",
+                 backend: Union[str, PlaylistStore, None] = None,
+                 flush_delay: Optional[float] = None):
         self.data_dir = Path(data_dir)
         self.playlists_file = self.data_dir / "playlists.json"
-        self.playlists: Dict[str, List[str]] = {}
+        self.db_file = self.data_dir / "playlists.db"
         self._ensure_data_dir()
-        self._load_playlists()
+        self.store = self._open_store(backend or os.getenv('AHOY_PLAYLIST_BACKEND', 'sqlite'))
+        # With a flush_delay, edits are persisted together once that many
+        # seconds pass without another edit
+        self.flush_delay = flush_delay
+        self._flush_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._batches = 0
         
     def _ensure_data_dir(self):
         """Create data directory if it doesn't exist."""
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
-    def _load_playlists(self):
-        """Load playlists from JSON file."""
+    def _open_store(self, backend: Union[str, PlaylistStore]) -> PlaylistStore:
+        """Open the storage backend, importing a legacy playlists.json into SQLite."""
+        if isinstance(backend, PlaylistStore):
+            return backend
+        if backend == 'json':
+            return JsonPlaylistStore(self.playlists_file)
+        if backend != 'sqlite':
+            raise ValueError(f"Unknown playlist backend: {backend}")
+        store = SqlitePlaylistStore(self.db_file)
         if self.playlists_file.exists():
+            self._import_json(store)
+        return store
+        
+    def _import_json(self, store: SqlitePlaylistStore):
+        """Move playlists.json into the database, keeping the file as a backup."""
+        try:
+            with open(self.playlists_file, 'r') as f:
+                playlists = json.load(f)
+        except json.JSONDecodeError:
+            playlists = {}
+        store.import_playlists(playlists)
+        os.replace(self.playlists_file, self.playlists_file.with_suffix('.json.imported'))
+        
+    @contextmanager
+    def _edit(self):
+        """Apply one edit, deferring its write when auto-flush is enabled."""
+        if self.flush_delay is None or self._batches:
+            # An open batch writes or drops its edits itself
+            yield
+            return
+        with self._flush_lock:
+            if self._flush_timer is None:
+                self.store.begin()
+            else:
+                self._flush_timer.cancel()
             try:
-                with open(self.playlists_file, 'r') as f:
-                    self.playlists = json.load(f)
-            except json.JSONDecodeError:
-                self.playlists = {}
-        else:
-            self.playlists = {}
-            
-    def _save_playlists(self):
-        """Save playlists to JSON file."""
-        with open(self.playlists_file, 'w') as f:
-            json.dump(self.playlists, f, indent=2)
+                yield
+            finally:
+                self._flush_timer = threading.Timer(self.flush_delay, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        
+    @contextmanager
+    def batch(self):
+        """Defer writes for every edit inside the block and flush them once at the end.
+
+        If the block raises, its edits are rolled back instead.
+        """
+        # Edits still waiting on auto-flush aren't part of the batch; write
+        # them first so the batch is the outermost level and can be aborted
+        self.flush()
+        self.store.begin()
+        self._batches += 1
+        try:
+            yield self
+        except BaseException:
+            self._batches -= 1
+            self.store.abort()
+            raise
+        self._batches -= 1
+        self.store.end()
+        
+    def flush(self):
+        """Write out edits deferred by auto-flush now."""
+        with self._flush_lock:
+            if self._flush_timer is None:
+                return
+            self._flush_timer.cancel()
+            self._flush_timer = None
+            self.store.end()
+        
+    @property
+    def playlists(self) -> Dict[str, List[str]]:
+        """All playlists as a name -> tracks snapshot."""
+        return self.get_all_playlists()
             
     def create_playlist(self, name: str) -> bool:
         """Create a new playlist."""
-        if name in self.playlists:
-            return False
-        self.playlists[name] = []
-        self._save_playlists()
-        return True
+        with self._edit():
+            return self.store.create(name)
         
     def delete_playlist(self, name: str) -> bool:
         """Delete a playlist."""
-        if name not in self.playlists:
-            return False
-        del self.playlists[name]
-        self._save_playlists()
-        return True
+        with self._edit():
+            return self.store.delete(name)
         
     def add_to_playlist(self, playlist_name: str, track_path: str) -> bool:
         """Add a track to a playlist."""
-        if playlist_name not in self.playlists:
+        if not self.store.has_playlist(playlist_name):
             return False
-        if track_path not in self.playlists[playlist_name]:
-            self.playlists[playlist_name].append(track_path)
-            self._save_playlists()
+        with self._edit():
+            self.store.add(playlist_name, track_path)
         return True
         
     def remove_from_playlist(self, playlist_name: str, track_path: str) -> bool:
         """Remove a track from a playlist."""
-        if playlist_name not in self.playlists:
+        if not self.store.has_playlist(playlist_name):
             return False
-        if track_path in self.playlists[playlist_name]:
-            self.playlists[playlist_name].remove(track_path)
-            self._save_playlists()
+        with self._edit():
+            self.store.remove(playlist_name, track_path)
+        return True
+        
+    def add_many(self, playlist_name: str, track_paths: Iterable[str]) -> bool:
+        """Add several tracks to a playlist in one write."""
+        if not self.store.has_playlist(playlist_name):
+            return False
+        with self._edit():
+            self.store.add_many(playlist_name, track_paths)
+        return True
+        
+    def remove_many(self, playlist_name: str, track_paths: Iterable[str]) -> bool:
+        """Remove several tracks from a playlist in one write."""
+        if not self.store.has_playlist(playlist_name):
+            return False
+        with self._edit():
+            self.store.remove_many(playlist_name, track_paths)
+        return True
+        
+    def move(self, playlist_name: str, from_index: int, to_index: int) -> bool:
+        """Move a track to another position in a playlist."""
+        if not self.store.has_playlist(playlist_name):
+            return False
+        with self._edit():
+            return self.store.move(playlist_name, from_index, to_index)
+        
+    def replace(self, playlist_name: str, track_paths: Iterable[str]) -> bool:
+        """Replace the tracks of a playlist, e.g. after reordering them."""
+        if not self.store.has_playlist(playlist_name):
+            return False
+        with self._edit():
+            self.store.replace(playlist_name, track_paths)
         return True
         
     def get_playlist(self, name: str) -> Optional[List[str]]:
         """Get all tracks in a playlist."""
-        return self.playlists.get(name)
+        return self.store.tracks(name)
         
     def get_all_playlists(self) -> Dict[str, List[str]]:
         """Get all playlists."""
-        return self.playlists.copy()
+        return {name: self.store.tracks(name) for name in self.store.playlist_names()}
+        
+    def close(self):
+        """Flush deferred edits and close the storage backend."""
+        self.flush()
+        self.store.close()
         
     def scan_directory(self, directory: str) -> List[str]:
         """Scan a directory for music files."""
-        music_files = []
-        valid_extensions = {'.mp3', '.wav', '.ogg', '.flac', '.m4a'}
-        
-        for root, _, files in os.walk(directory):
-            for file in files:
-                if Path(file).suffix.lower() in valid_extensions:
-                    music_files.append(os.path.join(root, file))
-                    
-        return music_files 
\ No newline at end of file
+        scanner = DirectoryScanner(self.data_dir / "scan_state.json")
+        return [path for batch in scanner.scan(directory) for path in batch]
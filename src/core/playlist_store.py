@@ -0,0 +1,435 @@
+import os
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+class PlaylistStore(ABC):
+    """Storage backend for ``PlaylistManager``.
+
+    Playlists are ordered, duplicate-free lists of track paths. Each
+    mutating call is applied and persisted as one unit, unless it happens
+    between ``begin`` and ``end``: deferred edits are persisted together by
+    the outermost ``end`` (or an explicit ``flush``), or dropped together by
+    the outermost ``abort``.
+    """
+
+    def __init__(self):
+        self._depth = 0
+
+    def begin(self):
+        """Start deferring persistence; calls nest."""
+        self._depth += 1
+
+    def end(self):
+        """Finish a ``begin``; the outermost one flushes."""
+        self._depth -= 1
+        if self._depth == 0:
+            self.flush()
+
+    def abort(self):
+        """Finish a ``begin`` that failed; the outermost one discards deferred edits."""
+        self._depth -= 1
+        if self._depth == 0:
+            self.discard()
+
+    @abstractmethod
+    def flush(self):
+        """Persist any deferred edits."""
+
+    @abstractmethod
+    def discard(self):
+        """Drop deferred edits, going back to what was last persisted."""
+
+    @abstractmethod
+    def playlist_names(self) -> List[str]:
+        """Names of all playlists."""
+
+    @abstractmethod
+    def has_playlist(self, name: str) -> bool:
+        """True if a playlist called ``name`` exists."""
+
+    @abstractmethod
+    def create(self, name: str) -> bool:
+        """Create an empty playlist; False if it already exists."""
+
+    @abstractmethod
+    def delete(self, name: str) -> bool:
+        """Delete a playlist; False if it doesn't exist."""
+
+    @abstractmethod
+    def tracks(self, name: str) -> Optional[List[str]]:
+        """A playlist's tracks in order, or None if it doesn't exist."""
+
+    @abstractmethod
+    def contains(self, name: str, track_path: str) -> bool:
+        """True if ``track_path`` is in the playlist."""
+
+    @abstractmethod
+    def add(self, name: str, track_path: str) -> bool:
+        """Append a track unless it is already present; True if it was added."""
+
+    @abstractmethod
+    def remove(self, name: str, track_path: str) -> bool:
+        """Remove a track; True if it was present."""
+
+    @abstractmethod
+    def add_many(self, name: str, track_paths: Iterable[str]) -> int:
+        """Append tracks that aren't already present; returns how many were added."""
+
+    @abstractmethod
+    def remove_many(self, name: str, track_paths: Iterable[str]) -> int:
+        """Remove tracks; returns how many were present."""
+
+    @abstractmethod
+    def move(self, name: str, from_index: int, to_index: int) -> bool:
+        """Move the track at ``from_index`` so it ends up at ``to_index``."""
+
+    @abstractmethod
+    def replace(self, name: str, track_paths: Iterable[str]):
+        """Replace a playlist's contents (duplicates after the first are dropped)."""
+
+    def close(self):
+        pass
+
+
+class JsonPlaylistStore(PlaylistStore):
+    """The original format: the whole ``playlists.json`` rewritten on every edit.
+
+    Writes go to a temporary file that replaces the original, so a crash
+    can no longer leave a truncated file behind.
+    """
+
+    def __init__(self, path: Path):
+        super().__init__()
+        self.path = Path(path)
+        self._dirty = False
+        self.playlists: Dict[str, List[str]] = {}
+        self._members: Dict[str, set] = {}
+        self._load()
+
+    def _load(self):
+        self.playlists = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    self.playlists = json.load(f)
+            except json.JSONDecodeError:
+                self.playlists = {}
+        self._members = {name: set(tracks) for name, tracks in self.playlists.items()}
+
+    def _save(self):
+        self._dirty = True
+        if self._depth == 0:
+            self.flush()
+
+    def flush(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.playlists, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def discard(self):
+        if self._dirty:
+            self._dirty = False
+            self._load()
+
+    def playlist_names(self) -> List[str]:
+        return list(self.playlists)
+
+    def has_playlist(self, name: str) -> bool:
+        return name in self.playlists
+
+    def create(self, name: str) -> bool:
+        if name in self.playlists:
+            return False
+        self.playlists[name] = []
+        self._members[name] = set()
+        self._save()
+        return True
+
+    def delete(self, name: str) -> bool:
+        if name not in self.playlists:
+            return False
+        del self.playlists[name]
+        del self._members[name]
+        self._save()
+        return True
+
+    def tracks(self, name: str) -> Optional[List[str]]:
+        tracks = self.playlists.get(name)
+        return list(tracks) if tracks is not None else None
+
+    def contains(self, name: str, track_path: str) -> bool:
+        return track_path in self._members.get(name, ())
+
+    def add(self, name: str, track_path: str) -> bool:
+        if track_path in self._members[name]:
+            return False
+        self.playlists[name].append(track_path)
+        self._members[name].add(track_path)
+        self._save()
+        return True
+
+    def remove(self, name: str, track_path: str) -> bool:
+        if track_path not in self._members[name]:
+            return False
+        self.playlists[name].remove(track_path)
+        self._members[name].discard(track_path)
+        self._save()
+        return True
+
+    def add_many(self, name: str, track_paths: Iterable[str]) -> int:
+        tracks, members = self.playlists[name], self._members[name]
+        added = 0
+        for track_path in track_paths:
+            if track_path not in members:
+                tracks.append(track_path)
+                members.add(track_path)
+                added += 1
+        if added:
+            self._save()
+        return added
+
+    def remove_many(self, name: str, track_paths: Iterable[str]) -> int:
+        members = self._members[name]
+        removed = members.intersection(track_paths)
+        if removed:
+            self.playlists[name] = [t for t in self.playlists[name] if t not in removed]
+            members.difference_update(removed)
+            self._save()
+        return len(removed)
+
+    def move(self, name: str, from_index: int, to_index: int) -> bool:
+        tracks = self.playlists[name]
+        if not (0 <= from_index < len(tracks) and 0 <= to_index < len(tracks)):
+            return False
+        tracks.insert(to_index, tracks.pop(from_index))
+        self._save()
+        return True
+
+    def replace(self, name: str, track_paths: Iterable[str]):
+        tracks = list(dict.fromkeys(track_paths))
+        self.playlists[name] = tracks
+        self._members[name] = set(tracks)
+        self._save()
+
+
+class SqlitePlaylistStore(PlaylistStore):
+    """Playlists in SQLite (WAL mode) with indexed, ordered membership.
+
+    Membership is keyed by ``(playlist_id, track_path)`` and ordered by a
+    separately indexed ``position`` column, so adding, removing and
+    membership checks are index lookups and each edit is a small
+    transaction rather than a rewrite of every playlist.
+    """
+
+    def __init__(self, path: Path):
+        super().__init__()
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS playlists (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL UNIQUE,
+                    created_at TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS playlist_tracks (
+                    playlist_id INTEGER NOT NULL REFERENCES playlists(id) ON DELETE CASCADE,
+                    position INTEGER NOT NULL,
+                    track_path TEXT NOT NULL,
+                    PRIMARY KEY (playlist_id, track_path)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS idx_playlist_tracks_position
+                    ON playlist_tracks(playlist_id, position);
+            """)
+
+    @contextmanager
+    def _write(self):
+        """Hold the lock for one edit; commit it unless edits are being deferred."""
+        with self._lock:
+            try:
+                yield
+            except Exception:
+                if self._depth == 0:
+                    self._conn.rollback()
+                raise
+            if self._depth == 0:
+                self._conn.commit()
+
+    def begin(self):
+        with self._lock:
+            super().begin()
+
+    def end(self):
+        with self._lock:
+            super().end()
+
+    def abort(self):
+        with self._lock:
+            super().abort()
+
+    def flush(self):
+        with self._lock:
+            self._conn.commit()
+
+    def discard(self):
+        with self._lock:
+            self._conn.rollback()
+
+    def _playlist_id(self, name: str) -> Optional[int]:
+        row = self._conn.execute("SELECT id FROM playlists WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _next_position(self, playlist_id: int) -> int:
+        row = self._conn.execute(
+            "SELECT MAX(position) FROM playlist_tracks WHERE playlist_id = ?",
+            (playlist_id,)).fetchone()
+        return 0 if row[0] is None else row[0] + 1
+
+    def playlist_names(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT name FROM playlists ORDER BY id")]
+
+    def has_playlist(self, name: str) -> bool:
+        with self._lock:
+            return self._playlist_id(name) is not None
+
+    def create(self, name: str) -> bool:
+        with self._write():
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO playlists (name, created_at) VALUES (?, ?)",
+                (name, datetime.now().isoformat()))
+            return cursor.rowcount == 1
+
+    def delete(self, name: str) -> bool:
+        with self._write():
+            cursor = self._conn.execute("DELETE FROM playlists WHERE name = ?", (name,))
+            return cursor.rowcount == 1
+
+    def tracks(self, name: str) -> Optional[List[str]]:
+        with self._lock:
+            playlist_id = self._playlist_id(name)
+            if playlist_id is None:
+                return None
+            return [row[0] for row in self._conn.execute(
+                "SELECT track_path FROM playlist_tracks WHERE playlist_id = ? ORDER BY position",
+                (playlist_id,))]
+
+    def contains(self, name: str, track_path: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM playlist_tracks t JOIN playlists p ON p.id = t.playlist_id "
+                "WHERE p.name = ? AND t.track_path = ?", (name, track_path)).fetchone()
+            return row is not None
+
+    def add(self, name: str, track_path: str) -> bool:
+        with self._write():
+            playlist_id = self._playlist_id(name)
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO playlist_tracks (playlist_id, position, track_path) "
+                "VALUES (?, ?, ?)", (playlist_id, self._next_position(playlist_id), track_path))
+            return cursor.rowcount == 1
+
+    def remove(self, name: str, track_path: str) -> bool:
+        with self._write():
+            cursor = self._conn.execute(
+                "DELETE FROM playlist_tracks WHERE playlist_id = "
+                "(SELECT id FROM playlists WHERE name = ?) AND track_path = ?",
+                (name, track_path))
+            return cursor.rowcount == 1
+
+    def add_many(self, name: str, track_paths: Iterable[str]) -> int:
+        with self._write():
+            playlist_id = self._playlist_id(name)
+            start = self._next_position(playlist_id)
+            cursor = self._conn.executemany(
+                "INSERT OR IGNORE INTO playlist_tracks (playlist_id, position, track_path) "
+                "VALUES (?, ?, ?)",
+                ((playlist_id, start + i, track) for i, track in enumerate(track_paths)))
+            return cursor.rowcount
+
+    def remove_many(self, name: str, track_paths: Iterable[str]) -> int:
+        with self._write():
+            playlist_id = self._playlist_id(name)
+            cursor = self._conn.executemany(
+                "DELETE FROM playlist_tracks WHERE playlist_id = ? AND track_path = ?",
+                ((playlist_id, track) for track in track_paths))
+            return cursor.rowcount
+
+    def _position_at(self, playlist_id: int, index: int) -> Optional[int]:
+        if index < 0:
+            return None
+        row = self._conn.execute(
+            "SELECT position FROM playlist_tracks WHERE playlist_id = ? "
+            "ORDER BY position LIMIT 1 OFFSET ?", (playlist_id, index)).fetchone()
+        return row[0] if row else None
+
+    def move(self, name: str, from_index: int, to_index: int) -> bool:
+        with self._write():
+            playlist_id = self._playlist_id(name)
+            source = self._position_at(playlist_id, from_index)
+            target = self._position_at(playlist_id, to_index)
+            if source is None or target is None:
+                return False
+            if source == target:
+                return True
+            moved = self._conn.execute(
+                "SELECT track_path FROM playlist_tracks WHERE playlist_id = ? AND position = ?",
+                (playlist_id, source)).fetchone()[0]
+            # Shift the tracks in between by one slot toward the vacated position
+            if source < target:
+                self._conn.execute(
+                    "UPDATE playlist_tracks SET position = position - 1 "
+                    "WHERE playlist_id = ? AND position > ? AND position <= ?",
+                    (playlist_id, source, target))
+            else:
+                self._conn.execute(
+                    "UPDATE playlist_tracks SET position = position + 1 "
+                    "WHERE playlist_id = ? AND position >= ? AND position < ?",
+                    (playlist_id, target, source))
+            self._conn.execute(
+                "UPDATE playlist_tracks SET position = ? WHERE playlist_id = ? AND track_path = ?",
+                (target, playlist_id, moved))
+            return True
+
+    def replace(self, name: str, track_paths: Iterable[str]):
+        with self._write():
+            playlist_id = self._playlist_id(name)
+            self._conn.execute("DELETE FROM playlist_tracks WHERE playlist_id = ?", (playlist_id,))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO playlist_tracks (playlist_id, position, track_path) "
+                "VALUES (?, ?, ?)",
+                ((playlist_id, i, track) for i, track in enumerate(track_paths)))
+
+    def import_playlists(self, playlists: Dict[str, List[str]]):
+        """Load playlists (e.g. from a legacy JSON file) in a single transaction."""
+        with self._write():
+            for name, tracks in playlists.items():
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO playlists (name, created_at) VALUES (?, ?)",
+                    (name, datetime.now().isoformat()))
+                playlist_id = self._playlist_id(name)
+                start = self._next_position(playlist_id)
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO playlist_tracks (playlist_id, position, track_path) "
+                    "VALUES (?, ?, ?)",
+                    ((playlist_id, start + i, track) for i, track in enumerate(tracks)))
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
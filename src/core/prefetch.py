@@ -0,0 +1,122 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from .media_cache import MediaCache
+
+
+class Prefetcher(QObject):
+    """Downloads the tracks around the current queue position into the media cache.
+
+    The window is the next ``ahead`` tracks plus the ``behind`` previous ones.
+    Moving the position or replacing the queue cancels downloads that fell
+    out of the window. ``budget_bytes`` caps everything prefetched so far,
+    across windows: files it fetched count against it until the media cache
+    evicts them.
+    """
+
+    prefetched = pyqtSignal(str, str)  # URL, cached path
+
+    def __init__(self, media_cache: MediaCache, ahead: int = 2, behind: int = 1,
+                 budget_bytes: int = 512 * 1024 * 1024, max_workers: int = 2,
+                 parent=None):
+        super().__init__(parent)
+        self.media_cache = media_cache
+        self.ahead = ahead
+        self.behind = behind
+        self.budget_bytes = budget_bytes
+        self.queue: List[str] = []
+        self._jobs: Dict[str, threading.Event] = {}
+        self._in_flight_bytes = 0
+        self._fetched: Dict[str, int] = {}  # URL -> bytes of files prefetched into the cache
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="prefetch")
+
+    def set_queue(self, urls: List[str]):
+        """Replace the queue; everything in flight for the old queue is cancelled."""
+        self.queue = list(urls)
+        self._cancel_except(set())
+
+    def set_position(self, index: int):
+        """Prefetch around ``index`` (the track now playing or selected)."""
+        if not 0 <= index < len(self.queue):
+            self._cancel_except(set())
+            return
+        window = list(range(index + 1, min(index + 1 + self.ahead, len(self.queue))))
+        window += list(range(max(index - self.behind, 0), index))
+        wanted = [self.queue[i] for i in window]
+        self._cancel_except(set(wanted))
+        with self._lock:
+            for url in wanted:
+                if url in self._jobs or url in self.media_cache:
+                    continue
+                cancelled = threading.Event()
+                self._jobs[url] = cancelled
+                self._executor.submit(self._fetch, url, cancelled)
+
+    def shutdown(self):
+        self._cancel_except(set())
+        self._executor.shutdown(wait=False)
+
+    def _cancel_except(self, keep):
+        with self._lock:
+            for url, cancelled in list(self._jobs.items()):
+                if url not in keep:
+                    cancelled.set()
+                    del self._jobs[url]
+
+    def _used_bytes(self) -> int:
+        """Bytes prefetched and still cached, plus downloads in progress (call with the lock held)."""
+        for url in [url for url in self._fetched if url not in self.media_cache]:
+            del self._fetched[url]
+        return sum(self._fetched.values()) + self._in_flight_bytes
+
+    def _reserve(self, size: int) -> bool:
+        with self._lock:
+            if self._used_bytes() + size > self.budget_bytes:
+                return False
+            self._in_flight_bytes += size
+            return True
+
+    def _fetch(self, url: str, cancelled: threading.Event):
+        import requests
+
+        if cancelled.is_set():
+            return
+        writer = None
+        reserved = 0
+        path = None
+        try:
+            with requests.get(url, stream=True, timeout=15) as response:
+                response.raise_for_status()
+                expected = int(response.headers.get("content-length", 0))
+                if not self._reserve(expected):
+                    return
+                reserved = expected
+                writer = self.media_cache.open_writer(url)
+                for chunk in response.iter_content(256 * 1024):
+                    if cancelled.is_set():
+                        writer.abort()
+                        return
+                    writer.write(chunk)
+                    if not expected:
+                        if not self._reserve(len(chunk)):
+                            writer.abort()
+                            return
+                        reserved += len(chunk)
+            path = writer.commit()
+        except Exception:
+            if writer is not None:
+                writer.abort()
+            return
+        finally:
+            with self._lock:
+                self._in_flight_bytes -= reserved
+                if path is not None:
+                    self._fetched[url] = reserved
+                if self._jobs.get(url) is cancelled:
+                    del self._jobs[url]
+        self.prefetched.emit(url, path)
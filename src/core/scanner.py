@@ -0,0 +1,138 @@
+import os
+import json
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+AUDIO_EXTENSIONS = {'.mp3', '.wav', '.ogg', '.flac', '.m4a'}
+
+
+class DirectoryScanner:
+    """Finds audio files under a directory, walking subtrees concurrently.
+
+    Results are yielded in batches as directories finish, so callers can
+    show files long before the walk is done. With a ``state_file`` the
+    scanner remembers each directory's mtime and listing; a directory whose
+    mtime hasn't changed is not listed again on the next scan (its
+    subdirectories are still checked, since their changes don't touch the
+    parent's mtime).
+    """
+
+    def __init__(self, state_file: Optional[str] = None, max_workers: int = 8,
+                 batch_size: int = 500, extensions=AUDIO_EXTENSIONS):
+        self.state_file = Path(state_file) if state_file else None
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.extensions = {ext.lower() for ext in extensions}
+        self.state: Dict[str, Dict] = self._load_state()
+        self.listed_dirs = 0
+        self.reused_dirs = 0
+
+    def _load_state(self) -> Dict[str, Dict]:
+        if self.state_file is None or not self.state_file.exists():
+            return {}
+        try:
+            with open(self.state_file, 'r') as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            return {}
+
+    def _save_state(self):
+        if self.state_file is None:
+            return
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(self.state, f)
+        os.replace(tmp_file, self.state_file)
+
+    def _scan_dir(self, directory: str) -> Tuple[List[str], List[str]]:
+        """Return (audio file paths, subdirectory paths) for one directory."""
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return [], []
+        cached = self.state.get(directory)
+        if cached is not None and cached['mtime_ns'] == mtime_ns:
+            self.reused_dirs += 1
+            files, dirs = cached['files'], cached['dirs']
+        else:
+            self.listed_dirs += 1
+            files, dirs = [], []
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                dirs.append(entry.name)
+                            elif os.path.splitext(entry.name)[1].lower() in self.extensions \
+                                    and entry.is_file():
+                                files.append(entry.name)
+                        except OSError:
+                            continue
+            except OSError:
+                return [], []
+            self.state[directory] = {'mtime_ns': mtime_ns, 'files': files, 'dirs': dirs}
+        return ([os.path.join(directory, name) for name in files],
+                [os.path.join(directory, name) for name in dirs])
+
+    def scan(self, root: str) -> Iterator[List[str]]:
+        """Yield lists of audio file paths under ``root`` as they are found."""
+        root = os.path.abspath(root)
+        visited = set()
+        batch: List[str] = []
+        executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                      thread_name_prefix="scanner")
+        try:
+            pending = {executor.submit(self._scan_dir, root)}
+            visited.add(root)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    files, dirs = future.result()
+                    for directory in dirs:
+                        if directory not in visited:
+                            visited.add(directory)
+                            pending.add(executor.submit(self._scan_dir, directory))
+                    batch.extend(files)
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+            # Forget directories under root that no longer exist
+            prefix = root + os.sep
+            for directory in list(self.state):
+                if (directory == root or directory.startswith(prefix)) and directory not in visited:
+                    del self.state[directory]
+            self._save_state()
+        finally:
+            executor.shutdown(wait=False)
+
+
+class ScanWorker(QThread):
+    """Runs a ``DirectoryScanner`` off the GUI thread, emitting each batch."""
+
+    batch_found = pyqtSignal(list)
+    scan_finished = pyqtSignal(int)  # Total number of files found
+    error = pyqtSignal(str)
+
+    def __init__(self, directory: str, state_file: Optional[str] = None, parent=None):
+        super().__init__(parent)
+        self.directory = directory
+        self.scanner = DirectoryScanner(state_file)
+
+    def run(self):
+        total = 0
+        try:
+            for batch in self.scanner.scan(self.directory):
+                if self.isInterruptionRequested():
+                    return
+                total += len(batch)
+                self.batch_found.emit(batch)
+        except Exception as e:
+            self.error.emit(str(e))
+            return
+        self.scan_finished.emit(total)
@@ -0,0 +1,176 @@
+import re
+import bisect
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+WORD_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words with accents stripped, so "Beyoncé" matches "beyonce"."""
+    if text.isascii():
+        return WORD_RE.findall(text.lower())
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return WORD_RE.findall(text)
+
+
+class SearchResults(Sequence):
+    """Documents matching a query, ranked lazily as they are read.
+
+    Matches are known up front (``indices``, in document order), but only
+    the prefix that has been read is ranked. Scores are small integers, so
+    ranking the top ``k`` walks score levels from the best down and takes
+    each level's matches in document order: no sort over every match. Rows
+    of a list model can be backed by this directly, so a broad query costs
+    one page of ranking until the user scrolls.
+    """
+
+    def __init__(self, indices: np.ndarray, scores: np.ndarray, page_size: int = 50):
+        self.indices = indices
+        self.scores = scores
+        self.page_size = page_size
+        self._ranked = np.zeros(0, dtype=np.int64)
+        self._level_counts: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, item: Union[int, slice]):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if stop > start:
+                self._rank(stop)
+            return self.indices[self._ranked[start:stop:step]].tolist()
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError(item)
+        if item >= len(self._ranked):
+            self._rank(item + 1)
+        return int(self.indices[self._ranked[item]])
+
+    def _rank(self, count: int):
+        """Rank at least the top ``count`` matches (at least doubling what is ranked)."""
+        if count <= len(self._ranked):
+            return
+        count = min(max(count, 2 * len(self._ranked), self.page_size), len(self))
+        if self._level_counts is None:
+            self._level_counts = np.bincount(self.scores)
+        parts, taken = [], 0
+        for level in np.flatnonzero(self._level_counts)[::-1]:
+            parts.append(np.flatnonzero(self.scores == level))
+            taken += self._level_counts[level]
+            if taken >= count:
+                break
+        self._ranked = np.concatenate(parts)[:count]
+
+    def restrict(self, mask: np.ndarray) -> "SearchResults":
+        """The matches whose bit is set in the packed bitmap ``mask``, in the same ranking."""
+        keep = np.unpackbits(mask)[self.indices] > 0
+        return SearchResults(self.indices[keep], self.scores[keep], self.page_size)
+
+
+class SearchIndex:
+    """Prefix search over a fixed list of documents, for search-as-you-type.
+
+    Every token is stored once in a sorted vocabulary with its postings
+    laid out contiguously, so all tokens sharing a prefix are one slice
+    found by binary search. A query word is scored into a dense per-document
+    array (best field weight, +1 for an exact token match); words are
+    combined with AND and results ranked by total score, then by document
+    order. Per-word arrays are cached, so each keystroke only scores the
+    word being typed.
+    """
+
+    DEFAULT_FIELDS = {"title": 3, "artist": 2, "tags": 1}
+
+    def __init__(self, fields: Optional[Dict[str, int]] = None, cache_size: int = 16):
+        self.fields = fields or dict(self.DEFAULT_FIELDS)
+        self.cache_size = cache_size
+        self.vocabulary: List[str] = []
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._docs = np.zeros(0, dtype=np.int32)
+        self._levels = np.zeros(0, dtype=np.uint8)
+        self._count = 0
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def build(self, docs: Sequence[Dict[str, Any]]):
+        """Index ``docs``; each maps field names to a string or a list of strings."""
+        postings: Dict[str, Dict[int, int]] = {}
+        for doc_id, doc in enumerate(docs):
+            for field, weight in self.fields.items():
+                value = doc.get(field)
+                if not value:
+                    continue
+                text = value if isinstance(value, str) else " ".join(str(v) for v in value)
+                level = 2 * weight  # Odd levels are reserved for exact matches at query time
+                for token in tokenize(text):
+                    token_docs = postings.setdefault(token, {})
+                    if token_docs.get(doc_id, 0) < level:
+                        token_docs[doc_id] = level
+        self.vocabulary = sorted(postings)
+        sizes = [len(postings[token]) for token in self.vocabulary]
+        self._offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=self._offsets[1:])
+        total = int(self._offsets[-1])
+        self._docs = np.empty(total, dtype=np.int32)
+        self._levels = np.empty(total, dtype=np.uint8)
+        for i, token in enumerate(self.vocabulary):
+            start, end = self._offsets[i], self._offsets[i + 1]
+            token_docs = postings[token]
+            self._docs[start:end] = np.fromiter(token_docs.keys(), dtype=np.int32, count=len(token_docs))
+            self._levels[start:end] = np.fromiter(token_docs.values(), dtype=np.uint8, count=len(token_docs))
+        self._count = len(docs)
+        self._cache.clear()
+
+    def _word_scores(self, word: str) -> np.ndarray:
+        """Per-document score for one query word used as a prefix (0 = no match)."""
+        scores = self._cache.get(word)
+        if scores is not None:
+            self._cache.move_to_end(word)
+            return scores
+        lo = bisect.bisect_left(self.vocabulary, word)
+        hi = bisect.bisect_left(self.vocabulary, word + "\U0010ffff", lo)
+        scores = np.zeros(self._count, dtype=np.uint8)
+        if lo < hi:
+            docs = self._docs[self._offsets[lo]:self._offsets[hi]]
+            levels = self._levels[self._offsets[lo]:self._offsets[hi]]
+            present = np.unique(levels) if hi - lo > 1 else levels[:1]
+            # Assign in ascending order so each document keeps its best field
+            for level in sorted(present):
+                scores[docs[levels == level]] = level
+            if self.vocabulary[lo] == word:
+                exact = self._docs[self._offsets[lo]:self._offsets[lo + 1]]
+                scores[exact] += 1
+        self._cache[word] = scores
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return scores
+
+    def results(self, query: str, page_size: int = 50) -> SearchResults:
+        """Documents matching every word of ``query`` (as prefixes), ranked as they are read."""
+        words = tokenize(query)
+        if not words or not self._count:
+            return SearchResults(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.uint8), page_size)
+        total = self._word_scores(words[0])
+        matched = total > 0
+        if len(words) > 1:
+            total = total.astype(np.int32)
+            for word in words[1:]:
+                scores = self._word_scores(word)
+                total += scores
+                matched &= scores > 0
+        indices = np.flatnonzero(matched)
+        return SearchResults(indices, total[indices], page_size)
+
+    def search(self, query: str, limit: Optional[int] = 50) -> List[int]:
+        """Indices of documents matching every word of ``query`` (as prefixes), best first."""
+        results = self.results(query, page_size=limit or 50)
+        return results[:len(results) if limit is None else limit]
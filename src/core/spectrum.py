@@ -0,0 +1,129 @@
+import os
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from PyQt6.QtCore import QObject, pyqtSignal
+
+# Analysis parameters; bump ANALYSIS_VERSION when changing them so old caches are ignored
+ANALYSIS_VERSION = 1
+SAMPLE_RATE = 22050
+HOP_LENGTH = 512
+N_FFT = 2048
+BANDS = 50
+FRAME_RATE = SAMPLE_RATE / HOP_LENGTH  # ~43 frames per second
+MIN_FREQ = 40.0
+FLOOR_DB = -60.0
+
+
+def analyze_track(path: str, bands: int = BANDS) -> np.ndarray:
+    """Decode a track and return its ``(frames, bands)`` uint8 band-energy matrix.
+
+    Bands are log-spaced from ``MIN_FREQ`` to Nyquist. Energies are in dB
+    relative to the loudest band of the whole track, mapped from
+    ``FLOOR_DB``..0 onto 0..255.
+    """
+    import librosa
+
+    samples, _ = librosa.load(path, sr=SAMPLE_RATE, mono=True)
+    magnitude = np.abs(librosa.stft(samples, n_fft=N_FFT, hop_length=HOP_LENGTH))
+    freqs = librosa.fft_frequencies(sr=SAMPLE_RATE, n_fft=N_FFT)
+    edges = np.geomspace(MIN_FREQ, SAMPLE_RATE / 2, bands + 1)
+    starts = np.searchsorted(freqs, edges[:-1])
+    # Low bands are narrower than an FFT bin; give every band at least one bin
+    for i in range(1, bands):
+        starts[i] = max(starts[i], starts[i - 1] + 1)
+    counts = np.diff(np.append(starts, len(freqs)))
+    energy = np.add.reduceat(magnitude, starts, axis=0) / counts[:, None]
+
+    db = 20 * np.log10(np.maximum(energy, 1e-10) / max(energy.max(), 1e-10))
+    scaled = (np.clip(db, FLOOR_DB, 0) - FLOOR_DB) * (255 / -FLOOR_DB)
+    return np.ascontiguousarray(scaled.T.astype(np.uint8))
+
+
+class SpectrumFrames:
+    """Per-frame band energies for one track, looked up by playback time."""
+
+    def __init__(self, frames: np.ndarray, frame_rate: float = FRAME_RATE):
+        self.frames = frames
+        self.frame_rate = frame_rate
+        self._scale = np.float32(1 / 255)
+
+    def __len__(self):
+        return len(self.frames)
+
+    def frame_at(self, seconds: float) -> np.ndarray:
+        """Band energies (0..1) at ``seconds`` into the track."""
+        index = min(max(int(seconds * self.frame_rate), 0), len(self.frames) - 1)
+        return self.frames[index] * self._scale
+
+
+class SpectrumCache:
+    """Stores analysed tracks as ``.npy`` files and reopens them memory-mapped.
+
+    Entries are keyed by the track's path, size and mtime, so a file that
+    changes on disk is analysed again.
+    """
+
+    def __init__(self, cache_dir: str = "cache/spectrum"):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _cache_path(self, track_path: str) -> Path:
+        stat = os.stat(track_path)
+        key = f"{os.path.abspath(track_path)}:{stat.st_size}:{stat.st_mtime_ns}:{ANALYSIS_VERSION}"
+        return self.cache_dir / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.npy"
+
+    def load(self, track_path: str) -> Optional[SpectrumFrames]:
+        try:
+            frames = np.load(self._cache_path(track_path), mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        return SpectrumFrames(frames) if len(frames) else None
+
+    def store(self, track_path: str, frames: np.ndarray) -> SpectrumFrames:
+        cache_path = self._cache_path(track_path)
+        tmp_path = cache_path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, frames)
+        os.replace(tmp_path, cache_path)
+        return self.load(track_path)
+
+
+class SpectrumAnalyzer(QObject):
+    """Analyses tracks in the background and hands out cached spectrum frames."""
+
+    ready = pyqtSignal(str, object)  # Track path, SpectrumFrames
+
+    def __init__(self, cache_dir: str = "cache/spectrum", parent=None):
+        super().__init__(parent)
+        self.cache = SpectrumCache(cache_dir)
+        # Decoding is CPU and memory heavy, so analyse one track at a time
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="spectrum")
+        self._pending = set()
+
+    def request(self, track_path: str):
+        """Emit ``ready`` for ``track_path``, analysing it first if it isn't cached."""
+        frames = self.cache.load(track_path)
+        if frames is not None:
+            self.ready.emit(track_path, frames)
+            return
+        if track_path in self._pending:
+            return
+        self._pending.add(track_path)
+        self._executor.submit(self._analyze, track_path)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+    def _analyze(self, track_path: str):
+        try:
+            frames = self.cache.store(track_path, analyze_track(track_path))
+        except Exception:
+            frames = None
+        finally:
+            self._pending.discard(track_path)
+        if frames is not None:
+            self.ready.emit(track_path, frames)
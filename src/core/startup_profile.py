@@ -0,0 +1,42 @@
+import json
+import time
+import logging
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StartupProfile:
+    """Durations of consecutive startup phases.
+
+    Each ``mark`` closes the phase that began at the previous mark (or at
+    ``started``), so the phases add up to the total time to first paint.
+    """
+
+    def __init__(self, started: Optional[float] = None):
+        self.started = started if started is not None else time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+        self.finished = False
+        self._last = self.started
+
+    def mark(self, phase: str):
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self._last) * 1000))
+        self._last = now
+
+    def finish(self, phase: str):
+        """Record the last phase and log the breakdown."""
+        self.mark(phase)
+        self.finished = True
+        logger.info("Startup: %s", self.report())
+
+    @property
+    def total_ms(self) -> float:
+        return (self._last - self.started) * 1000
+
+    def report(self) -> str:
+        parts = [f"{phase} {ms:.0f} ms" for phase, ms in self.phases]
+        return ", ".join(parts) + f" (total {self.total_ms:.0f} ms)"
+
+    def to_json(self) -> str:
+        return json.dumps({"phases": dict(self.phases), "total_ms": self.total_ms})
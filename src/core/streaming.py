@@ -0,0 +1,309 @@
+import io
+import time
+import logging
+import threading
+from typing import Dict, Optional
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from .media_cache import MediaCache
+from .mixer import get_mixer
+
+logger = logging.getLogger(__name__)
+
+# Decoders probe the last few KB of a file (ID3v1/APE tags) before playing
+TAIL_BYTES = 8192
+# Assumed MP3 byte rate (128 kbps) until playback gives us a measurement
+DEFAULT_BYTE_RATE = 16000
+
+
+class StreamBuffer:
+    """Background download of one URL into a media cache part file.
+
+    Readers may consume the prefix that has already arrived while the rest
+    is still downloading. The finished file is committed to the cache when
+    the buffer is closed.
+    """
+
+    def __init__(self, url: str, cache: MediaCache, chunk_size: int = 16 * 1024):
+        self.url = url
+        self.chunk_size = chunk_size
+        self.total_bytes: Optional[int] = None
+        self.available = 0
+        self.complete = False
+        self.error: Optional[str] = None
+        self.accepts_ranges = False
+        self._writer = cache.open_writer(url)
+        self._read_file = open(self._writer.part_path, "rb")
+        self._cond = threading.Condition()
+        self._cancelled = False
+        self._tail: Optional[bytes] = None
+        self._thread = threading.Thread(target=self._run, name="stream-buffer", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        import requests
+
+        try:
+            with requests.get(self.url, stream=True, timeout=15) as response:
+                response.raise_for_status()
+                length = response.headers.get("content-length")
+                with self._cond:
+                    self.total_bytes = int(length) if length else None
+                    self.accepts_ranges = response.headers.get("accept-ranges") == "bytes"
+                    self._cond.notify_all()
+                for chunk in response.iter_content(self.chunk_size):
+                    if self._cancelled:
+                        break
+                    self._writer.write(chunk)
+                    self._writer.flush()
+                    with self._cond:
+                        self.available += len(chunk)
+                        self._cond.notify_all()
+        except Exception as e:
+            with self._cond:
+                self.error = str(e)
+                self._cond.notify_all()
+            self._writer.abort()
+            return
+
+        with self._cond:
+            cancelled = self._cancelled
+            if not cancelled:
+                self.complete = True
+                self.total_bytes = self.available
+            self._cond.notify_all()
+        if cancelled:
+            self._writer.abort()
+
+    def wait_for(self, end: int, timeout: float) -> bool:
+        """Block until ``end`` bytes have arrived; False on timeout or failure."""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self.available >= end or self.complete or self.error is not None,
+                timeout)
+            return self.available >= end
+
+    def read_at(self, offset: int, size: int) -> bytes:
+        with self._cond:
+            size = max(0, min(size, self.available - offset))
+        self._read_file.seek(offset)
+        return self._read_file.read(size)
+
+    def read_tail(self, offset: int, size: int) -> bytes:
+        """Serve a read from the end of the file before the download gets there.
+
+        Fetches the last ``TAIL_BYTES`` with an HTTP Range request when the
+        server supports it; otherwise the tail reads as zeros, which decoders
+        treat as "no trailing tags".
+        """
+        tail_start = self.total_bytes - TAIL_BYTES
+        if self._tail is None:
+            self._tail = bytes(min(TAIL_BYTES, self.total_bytes))
+            if self.accepts_ranges:
+                import requests
+
+                try:
+                    response = requests.get(self.url, timeout=15,
+                                            headers={"Range": f"bytes=-{TAIL_BYTES}"})
+                    if response.status_code == 206 and len(response.content) == len(self._tail):
+                        self._tail = response.content
+                except requests.RequestException:
+                    pass
+        start = max(offset - tail_start, 0)
+        return self._tail[start:start + size]
+
+    def close(self) -> Optional[str]:
+        """Stop downloading; returns the cached path if the download had finished."""
+        with self._cond:
+            self._cancelled = True
+            complete = self.complete
+        self._read_file.close()
+        if complete:
+            return self._writer.commit()
+        return None
+
+
+class StreamReader(io.RawIOBase):
+    """Seekable file view over a ``StreamBuffer`` for ``pygame.mixer.music.load``.
+
+    Reads block until the requested bytes have arrived (up to
+    ``stall_timeout``). While ``probing`` is set, reads near the end of the
+    file are answered from the tail instead of waiting for the whole download.
+    """
+
+    def __init__(self, buffer: StreamBuffer, stall_timeout: float = 5.0):
+        super().__init__()
+        self.buffer = buffer
+        self.stall_timeout = stall_timeout
+        self.position = 0
+        self.probing = True
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self.position = offset
+        elif whence == io.SEEK_CUR:
+            self.position += offset
+        else:
+            self.position = self.buffer.total_bytes + offset
+        return self.position
+
+    def readinto(self, b):
+        total = self.buffer.total_bytes
+        end = min(self.position + len(b), total)
+        if self.position >= end:
+            return 0
+        if (self.probing and self.buffer.available < end
+                and self.position >= total - TAIL_BYTES):
+            data = self.buffer.read_tail(self.position, end - self.position)
+        else:
+            self.buffer.wait_for(end, self.stall_timeout)
+            data = self.buffer.read_at(self.position, end - self.position)
+        b[:len(data)] = data
+        self.position += len(data)
+        return len(data)
+
+
+class StreamingPlayback(QObject):
+    """Starts pygame playback once enough of a remote file is buffered.
+
+    Playback begins when ``start_bytes`` have arrived, pauses to rebuffer
+    when fewer than ``low_water_bytes`` remain ahead of the decoder, and
+    resumes once ``start_bytes`` are available again. Time-to-first-audio
+    is measured from ``start`` to the ``play`` call.
+    """
+
+    buffer_health = pyqtSignal(dict)
+    started = pyqtSignal(float)  # Time to first audio in seconds
+    stalled = pyqtSignal()
+    error = pyqtSignal(str)
+
+    def __init__(self, media_cache: MediaCache, start_bytes: int = 256 * 1024,
+                 low_water_bytes: int = 64 * 1024, parent=None):
+        super().__init__(parent)
+        self.media_cache = media_cache
+        self.start_bytes = start_bytes
+        self.low_water_bytes = low_water_bytes
+        self.buffer: Optional[StreamBuffer] = None
+        self.reader: Optional[StreamReader] = None
+        self.last_time_to_first_audio: Optional[float] = None
+        self.user_paused = False
+        self._stalled = False
+        self._requested_at = 0.0
+        self._playing_since = 0.0
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._poll)
+
+    @property
+    def url(self) -> Optional[str]:
+        return self.buffer.url if self.buffer else None
+
+    def is_active(self) -> bool:
+        return self.buffer is not None
+
+    def start(self, url: str):
+        self.stop()
+        self._requested_at = time.perf_counter()
+        self._stalled = False
+        self.user_paused = False
+        self.buffer = StreamBuffer(url, self.media_cache)
+        self.buffer.start()
+        self._timer.start(100)
+
+    def pause(self):
+        self.user_paused = True
+        get_mixer().music.pause()
+
+    def resume(self):
+        self.user_paused = False
+        if not self._stalled:
+            get_mixer().music.unpause()
+
+    def stop(self) -> Optional[str]:
+        """Release the current stream; returns its cached path if it finished downloading."""
+        self._timer.stop()
+        if self.buffer is None:
+            return None
+        if self.reader is not None:
+            get_mixer().music.unload()
+            self.reader = None
+        path = self.buffer.close()
+        self.buffer = None
+        return path
+
+    def health(self) -> Dict:
+        buffer = self.buffer
+        total = buffer.total_bytes or 0
+        position = self.reader.position if self.reader else 0
+        ahead = buffer.available - position
+        byte_rate = DEFAULT_BYTE_RATE
+        played = time.perf_counter() - self._playing_since if self.reader else 0
+        if played > 2 and position:
+            byte_rate = position / played
+        return {
+            "buffered_bytes": buffer.available,
+            "total_bytes": total,
+            "fraction": buffer.available / total if total else 0.0,
+            "ahead_bytes": ahead,
+            "ahead_seconds": ahead / byte_rate,
+            "stalled": self._stalled,
+            "complete": buffer.complete,
+            "time_to_first_audio": self.last_time_to_first_audio if self.reader else None,
+        }
+
+    def _poll(self):
+        buffer = self.buffer
+        if buffer.error is not None:
+            message = buffer.error
+            self.stop()
+            self.error.emit(message)
+            return
+
+        if self.reader is None:
+            # Without a Content-Length the decoder cannot seek to the end, so wait for all of it
+            ready = buffer.complete or (buffer.total_bytes is not None
+                                        and buffer.available >= self.start_bytes)
+            if ready:
+                self._start_playback()
+        elif not buffer.complete:
+            ahead = buffer.available - self.reader.position
+            if not self._stalled and ahead < self.low_water_bytes:
+                self._stalled = True
+                get_mixer().music.pause()
+                self.stalled.emit()
+            elif self._stalled and ahead >= self.start_bytes:
+                self._stalled = False
+                if not self.user_paused:
+                    get_mixer().music.unpause()
+        elif self._stalled:
+            self._stalled = False
+            if not self.user_paused:
+                get_mixer().music.unpause()
+
+        self.buffer_health.emit(self.health())
+        if buffer.complete and self.reader is not None:
+            self._timer.stop()
+
+    def _start_playback(self):
+        self.reader = StreamReader(self.buffer)
+        get_mixer().music.load(self.reader, "mp3")
+        self.reader.probing = False
+        get_mixer().music.play()
+        if self.user_paused:
+            get_mixer().music.pause()
+        self._playing_since = time.perf_counter()
+        self.last_time_to_first_audio = self._playing_since - self._requested_at
+        logger.info("Time to first audio for %s: %.0f ms",
+                    self.buffer.url, self.last_time_to_first_audio * 1000)
+        self.started.emit(self.last_time_to_first_audio)
@@ -0,0 +1,217 @@
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from .mp3_seek import SeekTable
+
+TAG_FIELDS = ("title", "artist", "album", "genre")
+
+
+def read_metadata(path: str) -> Dict:
+    """Read duration, stream info and common tags with mutagen (no decoding)."""
+    import mutagen
+
+    audio = mutagen.File(path, easy=True)
+    if audio is None:
+        raise ValueError(f"Unsupported audio file: {path}")
+    info = audio.info
+    tags = audio.tags or {}
+    metadata = {
+        "duration": getattr(info, "length", None),
+        "bitrate": getattr(info, "bitrate", None),
+        "sample_rate": getattr(info, "sample_rate", None),
+        "channels": getattr(info, "channels", None),
+    }
+    for field in TAG_FIELDS:
+        values = tags.get(field)
+        metadata[field] = values[0] if values else None
+    return metadata
+
+
+class TrackIndex:
+    """Persistent per-file track metadata, keyed by path and validated by size + mtime.
+
+    Every row is mirrored in memory, so ``get`` is a dict lookup plus one
+    ``stat`` call to confirm the file hasn't changed since it was indexed.
+    MP3s also get a frame seek table (see ``mp3_seek.SeekTable``), stored in
+    its own table and only read when a file is played. Loudness is filled in
+    later by ``loudness.LoudnessAnalyzer``.
+    """
+
+    COLUMNS = ("duration", "bitrate", "sample_rate", "channels") + TAG_FIELDS
+    LOUDNESS_COLUMNS = ("loudness", "true_peak")
+
+    def __init__(self, db_path: str = "cache/track_index.db"):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS tracks (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                duration REAL,
+                bitrate INTEGER,
+                sample_rate INTEGER,
+                channels INTEGER,
+                title TEXT,
+                artist TEXT,
+                album TEXT,
+                genre TEXT,
+                indexed_at TEXT NOT NULL,
+                loudness REAL,
+                true_peak REAL
+            )
+        """)
+        existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(tracks)")}
+        for column in self.LOUDNESS_COLUMNS:
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE tracks ADD COLUMN {column} REAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS seek_tables (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                sample_rate INTEGER NOT NULL,
+                samples_per_frame INTEGER NOT NULL,
+                source TEXT NOT NULL,
+                offsets BLOB NOT NULL,
+                times BLOB
+            )
+        """)
+        self._conn.commit()
+        self._entries: Dict[str, Dict] = {
+            row["path"]: dict(row) for row in self._conn.execute("SELECT * FROM tracks")
+        }
+        self._seekable = {row["path"] for row in self._conn.execute("SELECT path FROM seek_tables")}
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.abspath(path)
+
+    def get(self, path: str) -> Optional[Dict]:
+        """Return indexed metadata for ``path`` if it is still current, else None."""
+        entry = self._entries.get(self._key(path))
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if stat.st_size != entry["size"] or stat.st_mtime_ns != entry["mtime_ns"]:
+            return None
+        return entry
+
+    def is_current(self, path: str) -> bool:
+        """True if ``path`` needs no indexing: metadata is current and MP3s have a seek table."""
+        if self.get(path) is None:
+            return False
+        return not path.lower().endswith(".mp3") or self._key(path) in self._seekable
+
+    def needs_loudness(self, path: str) -> bool:
+        """True unless ``path`` is indexed, unchanged and already measured."""
+        entry = self.get(path)
+        return entry is None or entry.get("loudness") is None
+
+    def store_loudness(self, path: str, loudness: float, true_peak: float) -> Dict:
+        """Record a loudness measurement, indexing ``path`` first if needed."""
+        entry = self.get(path) or self.index_file(path)
+        with self._lock:
+            self._conn.execute("UPDATE tracks SET loudness = ?, true_peak = ? WHERE path = ?",
+                               (loudness, true_peak, entry["path"]))
+            self._conn.commit()
+            entry["loudness"], entry["true_peak"] = loudness, true_peak
+        return entry
+
+    def seek_table(self, path: str) -> Optional[SeekTable]:
+        """Return the stored seek table for ``path`` if it is still current, else None."""
+        entry = self.get(path)
+        if entry is None:
+            return None
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM seek_tables WHERE path = ?",
+                                     (entry["path"],)).fetchone()
+        if row is None or row["size"] != entry["size"] or row["mtime_ns"] != entry["mtime_ns"]:
+            return None
+        times = np.frombuffer(row["times"], dtype=np.float64) if row["times"] is not None else None
+        return SeekTable(row["sample_rate"], row["samples_per_frame"],
+                         np.frombuffer(row["offsets"], dtype=np.uint32), times, row["source"])
+
+    def index_file(self, path: str) -> Dict:
+        """Read ``path`` and store its metadata, replacing any stale entry."""
+        stat = os.stat(path)
+        entry = {"path": self._key(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        entry.update(read_metadata(path))
+        entry["indexed_at"] = datetime.now().isoformat()
+        previous = self.get(path)
+        if previous is not None:
+            # Unchanged file being re-indexed (e.g. for its seek table); keep the measurement
+            for column in self.LOUDNESS_COLUMNS:
+                entry[column] = previous.get(column)
+        table = SeekTable.build(path) if path.lower().endswith(".mp3") else None
+        columns = ", ".join(entry)
+        placeholders = ", ".join("?" for _ in entry)
+        with self._lock:
+            self._conn.execute(f"INSERT OR REPLACE INTO tracks ({columns}) VALUES ({placeholders})",
+                               tuple(entry.values()))
+            if table is not None:
+                times = table.times.astype(np.float64).tobytes() if table.times is not None else None
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO seek_tables VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (entry["path"], entry["size"], entry["mtime_ns"], table.sample_rate,
+                     table.samples_per_frame, table.source,
+                     table.offsets.astype(np.uint32).tobytes(), times))
+            self._conn.commit()
+            self._entries[entry["path"]] = entry
+            # Files with no usable frames aren't rescanned again this session
+            self._seekable.add(entry["path"])
+        return entry
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class MetadataWorker(QObject):
+    """Fills a ``TrackIndex`` in the background and reports each indexed file."""
+
+    indexed = pyqtSignal(str, dict)  # Path as requested, metadata
+
+    def __init__(self, index: TrackIndex, parent=None):
+        super().__init__(parent)
+        self.index = index
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="track-index")
+        self._pending = set()
+
+    def request(self, path: str):
+        """Index ``path`` unless it is already current or queued."""
+        if path in self._pending or self.index.is_current(path):
+            return
+        self._pending.add(path)
+        self._executor.submit(self._index, path)
+
+    def request_many(self, paths: Iterable[str]):
+        for path in paths:
+            self.request(path)
+
+    def shutdown(self):
+        """Drop queued files; a file being indexed finishes (or fails once the index is closed)."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _index(self, path: str):
+        try:
+            entry = self.index.index_file(path)
+        except Exception:
+            return
+        finally:
+            self._pending.discard(path)
+        self.indexed.emit(path, entry)
@@ -1,6 +1,7 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QScrollArea, QStackedWidget
 from PyQt6.QtCore import Qt
 from .music_library import MusicLibrary
+from ..core.scanner import ScanWorker
 
 class ContentArea(QWidget):
     def __init__(self, parent=None):
@@ -18,6 +19,8 @@ class ContentArea(QWidget):
         
         # Create music library view
         self.music_library = MusicLibrary(self)
+        self.music_library.scan_requested.connect(self.scan_music_directory)
+        self.scan_worker = None
         self.stacked_widget.addWidget(self.music_library)
         
         # Create welcome view
@@ -69,6 +72,10 @@ class ContentArea(QWidget):
         self.stacked_widget.setCurrentIndex(1)
         
     def scan_music_directory(self, directory: str):
-        """Scan a directory for music files and add them to the library."""
-        # This method will be implemented in the main window
-        pass 
\ No newline at end of file
+        """Scan a directory for music files and add them to the library as they are found."""
+        if self.scan_worker is not None and self.scan_worker.isRunning():
+            self.scan_worker.requestInterruption()
+            self.scan_worker.wait()
+        self.scan_worker = ScanWorker(directory, state_file="data/scan_state.json", parent=self)
+        self.scan_worker.batch_found.connect(self.music_library.add_tracks)
+        self.scan_worker.start() 
\ No newline at end of file
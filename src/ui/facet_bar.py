@@ -0,0 +1,72 @@
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtWidgets import QHBoxLayout, QLabel, QPushButton, QVBoxLayout, QWidget
+
+BUTTON_STYLE = """
+    QPushButton {
+        background: rgba(255,255,255,0.15); color: #e94560;
+        border-radius: 8px; padding: 4px 12px;
+    }
+    QPushButton:checked { background: #e94560; color: white; }
+    QPushButton:disabled { color: rgba(255,255,255,0.3); }
+"""
+
+
+class FacetBar(QWidget):
+    """Rows of toggle buttons, one row per facet, showing live counts.
+
+    Emits ``selection_changed`` with ``{facet: [values]}`` whenever a button
+    is toggled; the owner evaluates the filter and passes the new counts
+    back through ``set_counts``.
+    """
+
+    selection_changed = pyqtSignal(dict)
+
+    def __init__(self, facets: List[Tuple[str, str, List[str]]],
+                 label: Optional[Callable[[str, str], str]] = None, parent=None):
+        """``facets`` lists ``(facet, title, values)``; ``label(facet, value)`` gives button text."""
+        super().__init__(parent)
+        self.label = label or (lambda facet, value: value)
+        self._buttons: Dict[str, Dict[str, QPushButton]] = {}
+        self._selected: Dict[str, Set[str]] = {}
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        for facet, title, values in facets:
+            if not values:
+                continue
+            row = QHBoxLayout()
+            caption = QLabel(title)
+            caption.setStyleSheet("color: #fff;")
+            row.addWidget(caption)
+            self._buttons[facet] = {}
+            self._selected[facet] = set()
+            for value in values:
+                button = QPushButton(self.label(facet, value))
+                button.setCheckable(True)
+                button.setStyleSheet(BUTTON_STYLE)
+                button.toggled.connect(
+                    lambda checked, facet=facet, value=value: self._toggled(facet, value, checked))
+                row.addWidget(button)
+                self._buttons[facet][value] = button
+            row.addStretch()
+            layout.addLayout(row)
+
+    def selections(self) -> Dict[str, List[str]]:
+        return {facet: sorted(values) for facet, values in self._selected.items() if values}
+
+    def set_counts(self, counts: Dict[str, Dict[str, int]]):
+        """Show ``counts`` on the buttons; values with nothing left are disabled unless selected."""
+        for facet, buttons in self._buttons.items():
+            facet_counts = counts.get(facet, {})
+            for value, button in buttons.items():
+                count = facet_counts.get(value, 0)
+                button.setText(f"{self.label(facet, value)} ({count})")
+                button.setEnabled(count > 0 or button.isChecked())
+
+    def _toggled(self, facet: str, value: str, checked: bool):
+        if checked:
+            self._selected[facet].add(value)
+        else:
+            self._selected[facet].discard(value)
+        self.selection_changed.emit(self.selections())
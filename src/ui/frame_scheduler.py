@@ -0,0 +1,70 @@
+import math
+import time
+from typing import Callable
+
+from PyQt6.QtCore import QObject, Qt, QTimer
+
+
+class FrameScheduler(QObject):
+    """Calls ``callback`` once per frame at a rate that follows what's on screen.
+
+    Runs at ``active_interval_ms`` normally, drops to ``idle_interval_ms``
+    when marked idle, and stops completely while paused (e.g. the widget is
+    hidden). A single-shot timer is re-armed after each frame, so a slow
+    frame never lets timer events pile up: deadlines that have already
+    passed are skipped and counted in ``skipped_frames``.
+    """
+
+    def __init__(self, callback: Callable[[], None], active_interval_ms: float = 16,
+                 idle_interval_ms: float = 100, parent=None):
+        super().__init__(parent)
+        self.callback = callback
+        self.active_interval_ms = active_interval_ms
+        self.idle_interval_ms = idle_interval_ms
+        self.skipped_frames = 0
+        self.idle = False
+        self.paused = True
+        self._next_deadline = 0.0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+
+    @property
+    def interval_ms(self) -> float:
+        return self.idle_interval_ms if self.idle else self.active_interval_ms
+
+    def start(self):
+        """Resume ticking (no-op if already running)."""
+        if not self.paused:
+            return
+        self.paused = False
+        self._next_deadline = time.perf_counter()
+        self._timer.start(0)
+
+    def pause(self):
+        self.paused = True
+        self._timer.stop()
+
+    def set_idle(self, idle: bool):
+        if idle == self.idle:
+            return
+        self.idle = idle
+        if not idle and not self.paused:
+            # Leaving idle: don't wait out the rest of a long idle interval
+            self._next_deadline = time.perf_counter()
+            self._timer.start(0)
+
+    def _tick(self):
+        self.callback()
+        if self.paused:
+            return
+        interval = self.interval_ms / 1000
+        now = time.perf_counter()
+        self._next_deadline += interval
+        if self._next_deadline < now:
+            # Overran one or more frame slots: skip them instead of catching up
+            missed = math.ceil((now - self._next_deadline) / interval)
+            self.skipped_frames += missed
+            self._next_deadline += missed * interval
+        self._timer.start(max(0, round((self._next_deadline - now) * 1000)))
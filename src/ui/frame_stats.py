@@ -0,0 +1,70 @@
+import time
+import logging
+from collections import deque
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+
+class FrameStats:
+    """Rolling frame timings for an animated widget.
+
+    Record each simulation step with ``record_update`` and each paint with
+    ``record_paint``. A frame counts as dropped when the gap between two
+    paints is more than 1.5x the frame budget, once per budget it overran.
+    """
+
+    def __init__(self, budget_ms: float = 16.0, window: int = 120,
+                 log_interval: float = 10.0):
+        self.budget_ms = budget_ms
+        self.log_interval = log_interval
+        self.update_ms = deque(maxlen=window)
+        self.paint_ms = deque(maxlen=window)
+        self.frame_gaps_ms = deque(maxlen=window)
+        self.dropped_frames = 0
+        self._last_paint = None
+        self._last_log = time.perf_counter()
+
+    def record_update(self, elapsed_ms: float):
+        self.update_ms.append(elapsed_ms)
+
+    def record_paint(self, started: float, elapsed_ms: float):
+        """Record a paint that began at ``started`` (a ``perf_counter`` value)."""
+        self.paint_ms.append(elapsed_ms)
+        if self._last_paint is not None:
+            gap = (started - self._last_paint) * 1000
+            self.frame_gaps_ms.append(gap)
+            if gap > self.budget_ms * 1.5:
+                self.dropped_frames += int(gap // self.budget_ms) - 1
+        self._last_paint = started
+
+    def reset_clock(self):
+        """Forget the last paint time, e.g. after the animation was paused on purpose."""
+        self._last_paint = None
+
+    def summary(self) -> Dict[str, float]:
+        def avg(values):
+            return sum(values) / len(values) if values else 0.0
+
+        gap = avg(self.frame_gaps_ms)
+        return {
+            "fps": 1000 / gap if gap else 0.0,
+            "update_ms": avg(self.update_ms),
+            "update_max_ms": max(self.update_ms, default=0.0),
+            "paint_ms": avg(self.paint_ms),
+            "paint_max_ms": max(self.paint_ms, default=0.0),
+            "dropped_frames": self.dropped_frames,
+        }
+
+    def overlay_text(self) -> str:
+        s = self.summary()
+        return (f"{s['fps']:.0f} fps  update {s['update_ms']:.2f} ms  "
+                f"paint {s['paint_ms']:.2f} ms (max {s['paint_max_ms']:.1f})  "
+                f"dropped {s['dropped_frames']}")
+
+    def maybe_log(self):
+        """Log a summary at most once per ``log_interval`` seconds."""
+        now = time.perf_counter()
+        if now - self._last_log >= self.log_interval:
+            self._last_log = now
+            logger.info("Visualizer: %s", self.overlay_text())
@@ -0,0 +1,28 @@
+from typing import Callable, Optional
+
+from PyQt6.QtWidgets import QVBoxLayout, QWidget
+
+
+class LazyPage(QWidget):
+    """Placeholder for a stacked page whose real widget is built when first shown.
+
+    Keeps the page's slot (and index) in a ``QStackedWidget`` from startup,
+    while the cost of ``factory`` is only paid on first navigation.
+    """
+
+    def __init__(self, factory: Callable[[], QWidget], parent=None):
+        super().__init__(parent)
+        self.factory = factory
+        self.page: Optional[QWidget] = None
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+    def ensure_built(self) -> QWidget:
+        if self.page is None:
+            self.page = self.factory()
+            self.layout().addWidget(self.page)
+        return self.page
+
+    def showEvent(self, event):
+        self.ensure_built()
+        super().showEvent(event)
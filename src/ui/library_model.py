@@ -0,0 +1,166 @@
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Sequence
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, QSize, Qt, pyqtSignal
+from PyQt6.QtGui import QIcon
+from PyQt6.QtWidgets import QListView
+
+from ..core.image_loader import placeholder_pixmap
+
+
+class TrackListModel(QAbstractListModel):
+    """A list model over a plain Python list of tracks.
+
+    Nothing is created per row: labels and icons are produced in ``data``
+    only for rows the view actually paints. Rows are exposed a page at a
+    time through ``canFetchMore``/``fetchMore``, so attaching a list of
+    500k tracks costs one page of layout, not 500k. ``set_filter`` narrows
+    the rows to a sequence of track indices without copying the tracks; a
+    lazy sequence such as ``SearchResults`` is only read as pages are
+    fetched.
+    """
+
+    TrackRole = Qt.ItemDataRole.UserRole
+
+    def __init__(self, display: Callable[[Any], str] = str,
+                 thumbnail: Optional[Callable[[Any], Optional[str]]] = None,
+                 image_loader=None, icon_size: int = 60, page_size: int = 1000,
+                 max_icons: int = 512, parent=None):
+        super().__init__(parent)
+        self.display = display
+        self.thumbnail = thumbnail
+        self.image_loader = image_loader
+        self.icon_size = icon_size
+        self.page_size = page_size
+        self.max_icons = max_icons
+        self._tracks: List[Any] = []
+        self._rows: Optional[Sequence[int]] = None  # Filtered track indices, or None for all
+        self._loaded = 0
+        self._icons: "OrderedDict[str, QIcon]" = OrderedDict()
+        self._icon_requests = {}  # url -> rows waiting for it
+        self._placeholder = None
+
+    def set_tracks(self, tracks: List[Any]):
+        """Show a copy of ``tracks``; later appends don't touch the caller's list."""
+        self.beginResetModel()
+        self._tracks = list(tracks)
+        self._rows = None
+        self._loaded = min(len(tracks), self.page_size)
+        self._icon_requests.clear()
+        self.endResetModel()
+
+    def set_filter(self, rows: Optional[Sequence[int]]):
+        """Show only the tracks at indices ``rows``, in that order; None shows all."""
+        self.beginResetModel()
+        self._rows = rows
+        self._loaded = min(self.track_count(), self.page_size)
+        self._icon_requests.clear()
+        self.endResetModel()
+
+    def append_tracks(self, tracks: List[Any]):
+        was_complete = self._loaded == self.track_count()
+        self._tracks.extend(tracks)
+        if self._rows is None and was_complete:
+            # Views stop asking for more once everything was fetched; insert the next page for them
+            self.fetchMore(QModelIndex())
+
+    def track_count(self) -> int:
+        """Number of rows, including rows not fetched into the view yet."""
+        return len(self._tracks) if self._rows is None else len(self._rows)
+
+    def track_at(self, row: int) -> Any:
+        return self._tracks[row if self._rows is None else self._rows[row]]
+
+    def ensure_loaded(self, row: int):
+        """Fetch pages until ``row`` is exposed to views."""
+        row = min(row, self.track_count() - 1)
+        if row >= self._loaded:
+            self.beginInsertRows(QModelIndex(), self._loaded, row)
+            self._loaded = row + 1
+            self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._loaded
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._loaded < self.track_count()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.page_size, self.track_count() - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self._loaded:
+            return None
+        track = self.track_at(index.row())
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.display(track)
+        if role == self.TrackRole:
+            return track
+        if role == Qt.ItemDataRole.DecorationRole and self.thumbnail is not None:
+            return self._icon(index.row(), self.thumbnail(track))
+        return None
+
+    def _icon(self, row: int, url: Optional[str]) -> Optional[QIcon]:
+        if not url or self.image_loader is None:
+            return None
+        icon = self._icons.get(url)
+        if icon is not None:
+            self._icons.move_to_end(url)
+            return icon
+        if url not in self._icon_requests:
+            self._icon_requests[url] = {row}
+            self.image_loader.load(url, lambda pixmap, url=url: self._icon_loaded(url, pixmap),
+                                   self.icon_size, self.icon_size)
+        else:
+            self._icon_requests[url].add(row)
+        if self._placeholder is None:
+            self._placeholder = QIcon(placeholder_pixmap(self.icon_size, self.icon_size))
+        return self._placeholder
+
+    def _icon_loaded(self, url: str, pixmap):
+        self._icons[url] = QIcon(pixmap)
+        while len(self._icons) > self.max_icons:
+            self._icons.popitem(last=False)
+        for row in self._icon_requests.pop(url, ()):
+            if row < self._loaded:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+
+class TrackListView(QListView):
+    """A ``QListView`` over a ``TrackListModel`` with the row helpers of ``QListWidget``."""
+
+    currentRowChanged = pyqtSignal(int)
+
+    def __init__(self, model: TrackListModel, parent=None):
+        super().__init__(parent)
+        # Uniform rows let the view lay out huge lists without measuring each one
+        self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(200)
+        if model.thumbnail is not None:
+            self.setIconSize(QSize(model.icon_size, model.icon_size))
+        self.setModel(model)
+        self.selectionModel().currentRowChanged.connect(
+            lambda current, previous: self.currentRowChanged.emit(current.row()))
+
+    def currentRow(self) -> int:
+        return self.currentIndex().row()
+
+    def setCurrentRow(self, row: int):
+        self.model().ensure_loaded(row)
+        self.setCurrentIndex(self.model().index(row))
+
+    def count(self) -> int:
+        return self.model().track_count()
+
+    def current_track(self) -> Any:
+        row = self.currentRow()
+        return self.model().track_at(row) if row >= 0 else None
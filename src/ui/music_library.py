@@ -1,10 +1,15 @@
+import os
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-                             QListWidget, QListWidgetItem, QLabel, QFileDialog)
-from PyQt6.QtCore import Qt, pyqtSignal
+                             QLabel, QFileDialog)
+from PyQt6.QtCore import QModelIndex, pyqtSignal
 from pathlib import Path
+from typing import List
+
+from .library_model import TrackListModel, TrackListView
 
 class MusicLibrary(QWidget):
     track_selected = pyqtSignal(str)  # Emitted when a track is selected
+    scan_requested = pyqtSignal(str)  # Emitted with a directory the user wants added
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -27,8 +32,9 @@ class MusicLibrary(QWidget):
         header_layout.addWidget(add_button)
         
         # Library view
-        self.library_list = QListWidget()
-        self.library_list.itemDoubleClicked.connect(self._on_track_selected)
+        self.library_model = TrackListModel(display=os.path.basename, parent=self)
+        self.library_list = TrackListView(self.library_model)
+        self.library_list.doubleClicked.connect(self._on_track_selected)
         
         layout.addLayout(header_layout)
         layout.addWidget(self.library_list)
@@ -50,32 +56,34 @@ class MusicLibrary(QWidget):
             QPushButton:hover {
                 background-color: #505050;
             }
-            QListWidget {
+            QListView {
                 background-color: #252525;
                 border: none;
                 color: #ffffff;
             }
-            QListWidget::item {
+            QListView::item {
                 padding: 5px;
                 border-bottom: 1px solid #333333;
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: #404040;
             }
-            QListWidget::item:hover {
+            QListView::item:hover {
                 background-color: #333333;
             }
         """)
         
     def add_track(self, track_path: str):
         """Add a track to the library view."""
-        item = QListWidgetItem(Path(track_path).name)
-        item.setData(Qt.ItemDataRole.UserRole, track_path)
-        self.library_list.addItem(item)
+        self.library_model.append_tracks([track_path])
+        
+    def add_tracks(self, track_paths: List[str]):
+        """Add a batch of tracks; rows are only built as they scroll into view."""
+        self.library_model.append_tracks(track_paths)
         
     def clear(self):
         """Clear the library view."""
-        self.library_list.clear()
+        self.library_model.set_tracks([])
         
     def _on_add_music(self):
         """Handle add music button click."""
@@ -86,10 +94,10 @@ class MusicLibrary(QWidget):
             QFileDialog.Option.ShowDirsOnly
         )
         if directory:
-            # Emit signal to notify parent to scan directory
-            self.parent().scan_music_directory(directory)
+            # Emit signal to notify the owner to scan the directory
+            self.scan_requested.emit(directory)
             
-    def _on_track_selected(self, item: QListWidgetItem):
+    def _on_track_selected(self, index: QModelIndex):
         """Handle track selection."""
-        track_path = item.data(Qt.ItemDataRole.UserRole)
+        track_path = self.library_model.track_at(index.row())
         self.track_selected.emit(track_path) 
\ No newline at end of file
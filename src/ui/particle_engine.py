@@ -0,0 +1,108 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class ParticleEngine:
+    """Particle state kept as contiguous NumPy arrays and stepped in batch.
+
+    ``pos`` and ``vel`` are ``(2, n)`` float32 arrays (row 0 is x, row 1
+    is y, each contiguous); ``size`` and ``audio_force`` are ``(n,)``.
+    ``step`` applies the audio, mouse, wave and surfer forces plus the edge
+    bounce to every particle at once, with the same constants the
+    per-particle ``Particle`` objects used.
+    """
+
+    def __init__(self, count: int = 100, width: float = 1.0, height: float = 1.0,
+                 seed: Optional[int] = None):
+        self.rng = np.random.default_rng(seed)
+        self.reset(count, width, height)
+
+    @property
+    def count(self) -> int:
+        return self.pos.shape[1]
+
+    def reset(self, count: int, width: float, height: float):
+        """Scatter ``count`` particles uniformly over a ``width`` x ``height`` area."""
+        self.pos = np.empty((2, count), dtype=np.float32)
+        self.pos[0] = self.rng.uniform(0, width, count)
+        self.pos[1] = self.rng.uniform(0, height, count)
+        self.vel = np.zeros((2, count), dtype=np.float32)
+        self.size = self.rng.uniform(2, 5, count).astype(np.float32)
+        self.audio_force = np.zeros(count, dtype=np.float32)
+        # Scratch buffers reused every frame to avoid per-step allocations
+        self._acc = np.zeros((2, count), dtype=np.float32)
+        self._delta = np.zeros((2, count), dtype=np.float32)
+        self._delta_abs = np.zeros((2, count), dtype=np.float32)
+        self._dist = np.zeros(count, dtype=np.float32)
+        self._scalar = np.zeros(count, dtype=np.float32)
+
+    def step(self, width: float, height: float,
+             spectrum: Optional[np.ndarray] = None,
+             mouse: Optional[Tuple[float, float]] = None,
+             surfer: Optional[Tuple[float, float]] = None,
+             phase: float = 0.0):
+        """Advance one frame.
+
+        ``spectrum`` pushes particles up by the band under them (pass None
+        when nothing is playing), ``mouse`` attracts within 100px while the
+        button is held, ``surfer`` attracts within 50px and ``phase`` shifts
+        the background wave field.
+        """
+        if self.count == 0:
+            return
+        acc = self._acc
+        acc.fill(0)
+        x, y = self.pos
+
+        if spectrum is not None and len(spectrum):
+            idx = (x * (len(spectrum) / max(width, 1))).astype(np.intp)
+            np.clip(idx, 0, len(spectrum) - 1, out=idx)
+            np.multiply(spectrum[idx], 0.5, out=self.audio_force, casting="unsafe")
+            acc[1] -= self.audio_force * 2
+
+        if mouse is not None:
+            self._attract(mouse, 100.0, 0.5)
+
+        # Wave field: sin/cos evaluated for the whole array
+        np.multiply(y, 0.02, out=self._scalar)
+        self._scalar += phase
+        np.sin(self._scalar, out=self._scalar)
+        acc[0] += self._scalar * 0.1
+        np.multiply(x, 0.02, out=self._scalar)
+        self._scalar += phase
+        np.cos(self._scalar, out=self._scalar)
+        acc[1] += self._scalar * 0.1
+
+        if surfer is not None:
+            self._attract(surfer, 50.0, 0.3)
+
+        self.vel += acc
+        self.vel *= 0.95  # Damping
+        self.pos += self.vel
+        self.audio_force *= 0.95  # Decay audio force
+        self._bounce(0, width)
+        self._bounce(1, height)
+
+    def _attract(self, point: Tuple[float, float], radius: float, strength: float):
+        """Pull particles within ``radius`` (Manhattan distance) towards ``point``."""
+        delta = self._delta
+        np.subtract(np.asarray(point, dtype=np.float32)[:, None], self.pos, out=delta)
+        np.abs(delta, out=self._delta_abs)
+        np.add(self._delta_abs[0], self._delta_abs[1], out=self._dist)
+        # Strength falls off linearly to zero at the radius
+        np.divide(self._dist, radius, out=self._scalar)
+        np.subtract(1.0, self._scalar, out=self._scalar)
+        np.maximum(self._scalar, 0, out=self._scalar)
+        self._scalar *= strength
+        delta *= self._scalar
+        self._acc += delta
+
+    def _bounce(self, axis: int, limit: float):
+        """Clamp one axis to [0, limit] and reflect velocity with 20% loss."""
+        coord = self.pos[axis]
+        vel = self.vel[axis]
+        out = (coord < 0) | (coord > limit)
+        if out.any():
+            np.clip(coord, 0, limit, out=coord)
+            vel[out] *= -0.8
@@ -0,0 +1,98 @@
+from typing import Sequence
+
+import numpy as np
+from PyQt6 import sip
+from PyQt6.QtCore import QPointF, Qt
+from PyQt6.QtGui import QColor, QPainter, QPixmap
+
+# Sprites are drawn at this radius and scaled down per particle
+SPRITE_RADIUS = 32
+
+
+def make_disc_sprite(color: QColor, glow_color: QColor = None) -> QPixmap:
+    """Antialiased disc of ``SPRITE_RADIUS``, optionally a half-size core over a glow."""
+    size = SPRITE_RADIUS * 2
+    pixmap = QPixmap(size, size)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setPen(Qt.PenStyle.NoPen)
+    center = QPointF(SPRITE_RADIUS, SPRITE_RADIUS)
+    if glow_color is not None:
+        painter.setBrush(glow_color)
+        painter.drawEllipse(center, SPRITE_RADIUS, SPRITE_RADIUS)
+        painter.setBrush(color)
+        painter.drawEllipse(center, SPRITE_RADIUS / 2, SPRITE_RADIUS / 2)
+    else:
+        painter.setBrush(color)
+        painter.drawEllipse(center, SPRITE_RADIUS, SPRITE_RADIUS)
+    painter.end()
+    return pixmap
+
+
+class SpriteBatch:
+    """A ``QPainter.PixmapFragment`` array filled from NumPy and drawn in one call.
+
+    The sip array exposes the fragments' memory as a buffer, so each field
+    (x, y, source rect, scale, rotation, opacity) is written as a whole
+    column instead of building one fragment object per sprite.
+    """
+
+    X, Y, SOURCE_LEFT, SOURCE_TOP, WIDTH, HEIGHT, SCALE_X, SCALE_Y, ROTATION, OPACITY = range(10)
+
+    def __init__(self, pixmap: QPixmap):
+        self.pixmap = pixmap
+        self._array = None
+        self._fields = None
+
+    def fields(self, count: int) -> np.ndarray:
+        """Return a ``(count, 10)`` view over the fragment array, reallocating if needed."""
+        if self._fields is None or len(self._fields) != count:
+            self._array = sip.array(QPainter.PixmapFragment, count)
+            buffer = memoryview(self._array)
+            # qreal is double on desktop builds but float on some embedded ones
+            dtype = np.float64 if buffer.nbytes // count == 80 else np.float32
+            self._fields = np.frombuffer(buffer, dtype=dtype).reshape(count, 10)
+            self._fields[:, self.SOURCE_LEFT:self.SOURCE_TOP + 1] = 0
+            self._fields[:, self.WIDTH:self.HEIGHT + 1] = self.pixmap.width()
+            self._fields[:, self.ROTATION] = 0
+            self._fields[:, self.OPACITY] = 1
+        return self._fields
+
+    def draw(self, painter: QPainter):
+        if self._fields is not None:
+            painter.drawPixmapFragments(self._array, self.pixmap)
+
+
+class ParticleRenderer:
+    """Batched drawing for the visualizer: one fragment call for particles, one for the trail."""
+
+    def __init__(self, particle_color: QColor, trail_color: QColor):
+        glow_color = QColor(particle_color)
+        glow_color.setAlpha(50)
+        self.particles = SpriteBatch(make_disc_sprite(particle_color, glow_color))
+        self.trail = SpriteBatch(make_disc_sprite(trail_color))
+
+    def draw_particles(self, painter: QPainter, pos: np.ndarray, sizes: np.ndarray):
+        """Glow of radius ``2 * size`` with a core of radius ``size`` at each position."""
+        if not len(sizes):
+            return
+        fields = self.particles.fields(len(sizes))
+        fields[:, SpriteBatch.X] = pos[0]
+        fields[:, SpriteBatch.Y] = pos[1]
+        np.multiply(sizes, 2 / SPRITE_RADIUS, out=fields[:, SpriteBatch.SCALE_X])
+        fields[:, SpriteBatch.SCALE_Y] = fields[:, SpriteBatch.SCALE_X]
+        self.particles.draw(painter)
+
+    def draw_trail(self, painter: QPainter, points: Sequence[QPointF], max_size: float):
+        """Discs growing in size and opacity from the oldest point to the newest."""
+        if not points:
+            return
+        fields = self.trail.fields(len(points))
+        fade = np.arange(len(points)) / len(points)
+        fields[:, SpriteBatch.X] = [p.x() for p in points]
+        fields[:, SpriteBatch.Y] = [p.y() for p in points]
+        fields[:, SpriteBatch.SCALE_X] = fade * (max_size / SPRITE_RADIUS)
+        fields[:, SpriteBatch.SCALE_Y] = fields[:, SpriteBatch.SCALE_X]
+        fields[:, SpriteBatch.OPACITY] = fade
+        self.trail.draw(painter)
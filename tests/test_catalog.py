@@ -0,0 +1,59 @@
+import json
+
+from src.core.catalog import SOURCES, Catalog
+
+
+def open_catalog(tmp_path, music=None, podcasts=None):
+    for name, data in (("music_library.json", music), ("podcasts_library.json", podcasts)):
+        if data is not None:
+            (tmp_path / name).write_text(json.dumps(data))
+    sources = {name: SOURCES[name] for name in ("music_library", "podcasts_library")}
+    catalog = Catalog(str(tmp_path / "catalog.db"), str(tmp_path), sources)
+    catalog.refresh()
+    return catalog
+
+
+def test_entries_without_an_id_are_kept(tmp_path):
+    catalog = open_catalog(tmp_path, music={
+        "music_library": [{"id": 1, "songTitle": "a"}, {"songTitle": "b"}],
+        "playlists": [{"title": "p"}],
+    })
+    assert [song["songTitle"] for song in catalog.items("music_library", "song")] == ["a", "b"]
+    assert catalog.items("music_library", "playlist") == [{"title": "p"}]
+    catalog.close()
+
+
+def test_a_malformed_source_does_not_stop_the_others(tmp_path):
+    catalog = open_catalog(tmp_path, music={"music_library": [{"id": 1}]},
+                           podcasts={"podcasts": ["not an object"]})
+    assert catalog.items("music_library", "song") == [{"id": 1}]
+    assert catalog.items("podcasts_library") == []
+    catalog.close()
+
+
+def test_entries_sharing_an_id_are_all_kept(tmp_path):
+    songs = [{"id": 1, "songTitle": "a"}, {"id": 1, "songTitle": "b"}, {"id": 2, "songTitle": "c"}]
+    catalog = open_catalog(tmp_path, music={"music_library": songs})
+    assert catalog.items("music_library", "song") == songs
+    assert catalog.get("music_library", "song", 1) == songs[0]
+    catalog.close()
+
+
+def test_tables_keyed_on_item_id_are_rebuilt(tmp_path):
+    import sqlite3
+
+    conn = sqlite3.connect(tmp_path / "catalog.db")
+    conn.executescript("""
+        CREATE TABLE catalog_sources (source TEXT PRIMARY KEY, path TEXT NOT NULL, size INTEGER NOT NULL,
+                                      mtime_ns INTEGER NOT NULL, item_count INTEGER NOT NULL,
+                                      ingested_at TEXT NOT NULL);
+        CREATE TABLE catalog_items (id INTEGER PRIMARY KEY, source TEXT NOT NULL, kind TEXT NOT NULL,
+                                    item_id TEXT NOT NULL, position INTEGER NOT NULL, title TEXT,
+                                    artist TEXT, genre TEXT, description TEXT, media_url TEXT,
+                                    image TEXT, data TEXT NOT NULL, UNIQUE(source, kind, item_id));
+    """)
+    conn.close()
+    songs = [{"id": 1, "songTitle": "a"}, {"id": 1, "songTitle": "b"}]
+    catalog = open_catalog(tmp_path, music={"music_library": songs})
+    assert catalog.items("music_library", "song") == songs
+    catalog.close()
@@ -0,0 +1,109 @@
+import struct
+
+import pytest
+
+from src.core.mp3_seek import SeekTable
+
+# MPEG 1 Layer III, 128 kbps, 44.1 kHz, stereo: 417-byte frames of 1152 samples
+HEADER = b"\xff\xfb\x90\x00"
+FRAME_LENGTH = 417
+FRAME_SECONDS = 1152 / 44100
+
+
+def frame(body: bytes = b"") -> bytes:
+    return HEADER + body + bytes(FRAME_LENGTH - len(HEADER) - len(body))
+
+
+def id3(size: int) -> bytes:
+    syncsafe = bytes((size >> shift) & 0x7F for shift in (21, 14, 7, 0))
+    return b"ID3\x04\x00\x00" + syncsafe + bytes(size)
+
+
+def xing_frame(frames: int, audio_bytes: int, toc) -> bytes:
+    # Stereo MPEG 1: the tag follows 32 bytes of side info
+    return frame(bytes(32) + b"Xing" + struct.pack(">III", 7, frames, audio_bytes) + bytes(toc))
+
+
+def vbri_frame(frames: int, entry_bytes) -> bytes:
+    header = b"VBRI" + struct.pack(">HHH", 1, 0, 75)
+    header += struct.pack(">IIHHHH", sum(entry_bytes), frames, len(entry_bytes), 1, 2,
+                          frames // len(entry_bytes))
+    return frame(bytes(32) + header + struct.pack(f">{len(entry_bytes)}H", *entry_bytes))
+
+
+def write(tmp_path, data: bytes) -> str:
+    path = tmp_path / "track.mp3"
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_scan_finds_every_frame_after_the_tags(tmp_path):
+    path = write(tmp_path, id3(100) + frame() * 10 + b"TAG" + bytes(125))
+    table = SeekTable.scan(path)
+    assert table.source == "scan"
+    assert len(table) == 10
+    assert table.offsets[0] == 110
+    assert list(table.offsets[1:3]) == [110 + FRAME_LENGTH, 110 + 2 * FRAME_LENGTH]
+    assert table.duration == pytest.approx(10 * FRAME_SECONDS)
+
+
+def test_scan_skips_the_info_frame_and_resyncs_after_garbage(tmp_path):
+    audio = frame() * 3 + b"\x00\xff\x12" * 20 + frame() * 3
+    path = write(tmp_path, xing_frame(6, len(audio), range(100)) + audio)
+    table = SeekTable.scan(path)
+    assert len(table) == 6
+    assert table.offsets[0] == FRAME_LENGTH
+    assert table.offsets[3] == FRAME_LENGTH * 4 + 60
+
+
+def test_scan_rejects_files_without_frames(tmp_path):
+    assert SeekTable.scan(write(tmp_path, b"not an mp3" * 100)) is None
+    assert SeekTable.scan(write(tmp_path, b"")) is None
+
+
+def test_locate_lands_on_the_frame_playing(tmp_path):
+    table = SeekTable.scan(write(tmp_path, frame() * 10))
+    assert table.locate(0) == (0, 0.0)
+    offset, start = table.locate(3.5 * FRAME_SECONDS)
+    assert offset == 3 * FRAME_LENGTH
+    assert start == pytest.approx(3 * FRAME_SECONDS)
+    # Past the end clamps to the last frame
+    assert table.locate(60)[0] == 9 * FRAME_LENGTH
+
+
+def test_xing_toc(tmp_path):
+    audio_bytes = 100 * FRAME_LENGTH
+    toc = [i * 256 // 100 for i in range(100)]
+    path = write(tmp_path, xing_frame(100, audio_bytes, toc) + frame() * 100)
+    table = SeekTable.from_toc(path)
+    assert table.source == "toc"
+    assert len(table) == 101
+    assert table.duration == pytest.approx(100 * FRAME_SECONDS)
+    offset, start = table.locate(table.duration / 2)
+    assert start == pytest.approx(table.duration / 2)
+    assert offset == FRAME_LENGTH + toc[50] * audio_bytes // 256
+
+
+def test_vbri_toc(tmp_path):
+    path = write(tmp_path, vbri_frame(10, [2 * FRAME_LENGTH] * 5) + frame() * 10)
+    table = SeekTable.from_toc(path)
+    assert table.source == "toc"
+    assert list(table.offsets) == [FRAME_LENGTH * (1 + 2 * i) for i in range(6)]
+    assert table.duration == pytest.approx(10 * FRAME_SECONDS)
+    offset, start = table.locate(5 * FRAME_SECONDS)
+    assert offset == FRAME_LENGTH * 5
+    assert start == pytest.approx(4 * FRAME_SECONDS)
+
+
+def test_from_toc_needs_a_toc(tmp_path):
+    assert SeekTable.from_toc(write(tmp_path, frame() * 10)) is None
+
+
+def test_build_uses_the_toc_only_for_large_files(tmp_path):
+    toc = [i * 256 // 100 for i in range(100)]
+    path = write(tmp_path, xing_frame(100, 100 * FRAME_LENGTH, toc) + frame() * 100)
+    assert SeekTable.build(path).source == "scan"
+    assert SeekTable.build(path, max_scan_bytes=1000).source == "toc"
+    # Without a TOC a large file is still scanned
+    plain = write(tmp_path, frame() * 10)
+    assert SeekTable.build(plain, max_scan_bytes=1000).source == "scan"
@@ -0,0 +1,36 @@
+import time
+
+import pytest
+
+from src.core.playlist import PlaylistManager
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "json"])
+def test_raising_batch_is_rolled_back_with_auto_flush(tmp_path, backend):
+    manager = PlaylistManager(tmp_path, backend=backend, flush_delay=0.05)
+    manager.create_playlist("a")
+    with pytest.raises(RuntimeError):
+        with manager.batch():
+            manager.add_many("a", ["x", "y"])
+            raise RuntimeError
+    time.sleep(0.2)
+    assert manager.get_playlist("a") == []
+    manager.close()
+
+    reopened = PlaylistManager(tmp_path, backend=backend)
+    assert reopened.get_playlist("a") == []
+    reopened.close()
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "json"])
+def test_batch_keeps_earlier_auto_flushed_edits(tmp_path, backend):
+    manager = PlaylistManager(tmp_path, backend=backend, flush_delay=10)
+    manager.create_playlist("a")
+    manager.add_to_playlist("a", "w")
+    with manager.batch():
+        manager.add_many("a", ["x", "y"])
+    manager.close()
+
+    reopened = PlaylistManager(tmp_path, backend=backend)
+    assert reopened.get_playlist("a") == ["w", "x", "y"]
+    reopened.close()
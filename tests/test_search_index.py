@@ -0,0 +1,39 @@
+import numpy as np
+
+from src.core.search_index import SearchIndex
+
+
+def build(titles):
+    index = SearchIndex()
+    index.build([{"title": title} for title in titles])
+    return index
+
+
+def test_every_query_word_must_match():
+    index = build(["blue moon", "red sun", "moon river"])
+    assert index.search("red moon") == []
+    assert index.search("moon") == [0, 2]
+    assert index.search("moon riv") == [2]
+
+
+def test_a_later_word_does_not_bring_back_earlier_misses():
+    index = build(["abc x", "abc dog", "dog", "door"])
+    assert index.search("abc d") == [1]
+
+
+def test_ranking_is_by_score_then_document_order():
+    index = SearchIndex(fields={"title": 3, "tags": 1})
+    index.build([{"tags": "moon"}, {"title": "moonlight"}, {"title": "moon"}, {"title": "moon"}])
+    # Exact title matches first, then the prefix match, then the weaker field
+    assert index.search("moon") == [2, 3, 1, 0]
+    assert index.search("moon", limit=2) == [2, 3]
+
+
+def test_results_rank_lazily_and_agree_with_a_full_sort():
+    rng = np.random.default_rng(0)
+    words = ["alpha", "alpine", "beta", "alps"]
+    index = build([" ".join(rng.choice(words, 3)) for _ in range(2000)])
+    results = index.results("al", page_size=10)
+    full = index.search("al", limit=None)
+    assert [results[i] for i in range(25)] == full[:25]
+    assert results[:len(results)] == full